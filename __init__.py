@@ -16,11 +16,13 @@ __version__ = "1.1.22"
 
 NODE_CLASS_MAPPINGS = {
     "VrchAnyOSCControlNode": VrchAnyOSCControlNode,
+    "VrchAudioBeatGridNode": VrchAudioBeatGridNode,
     "VrchAudioChannelLoaderNode": VrchAudioChannelLoaderNode,
     "VrchAudioConcatNode": VrchAudioConcatNode,
     "VrchAudioEmotionVisualizerNode": VrchAudioEmotionVisualizerNode,
     "VrchAudioFrequencyBandAnalyzerNode": VrchAudioFrequencyBandAnalyzerNode,
     "VrchAudioGenresNode": VrchAudioGenresNode,
+    "VrchAudioMultiBandAnalyzerNode": VrchAudioMultiBandAnalyzerNode,
     "VrchAudioMusic2EmotionNode": VrchAudioMusic2EmotionNode,
     "VrchAudioRecorderNode": VrchAudioRecorderNode,
     "VrchAudioSaverNode": VrchAudioSaverNode,
@@ -88,11 +90,13 @@ NODE_CLASS_MAPPINGS = {
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "VrchAnyOSCControlNode": "ANY Value OSC Control @ vrch.ai",
+    "VrchAudioBeatGridNode": "AUDIO Beat Grid @ vrch.ai",
     "VrchAudioChannelLoaderNode": "AUDIO Web Viewer Channel Loader @ vrch.ai",
     "VrchAudioConcatNode": "AUDIO Concat @ vrch.ai",
     "VrchAudioEmotionVisualizerNode": "AUDIO Emotion Visualizer @ vrch.ai",
     "VrchAudioFrequencyBandAnalyzerNode": "AUDIO Frequency Band Analyzer @ vrch.ai",
     "VrchAudioGenresNode": "AUDIO Get Genres @ vrch.ai",
+    "VrchAudioMultiBandAnalyzerNode": "AUDIO Multi-Band Analyzer @ vrch.ai",
     "VrchAudioMusic2EmotionNode": "AUDIO Music to Emotion Detector @ vrch.ai",
     "VrchAudioRecorderNode": "AUDIO Recorder @ vrch.ai",
     "VrchAudioSaverNode": "AUDIO Saver @ vrch.ai",
@@ -1,15 +1,23 @@
 import hashlib
 import os
-import io
-import base64
 import json
-import ffmpeg
-import tempfile
 from pathlib import Path
 import torch
 import torchaudio
 import folder_paths # type: ignore
 from .utils.music_genres_classifier import *
+from .utils import json_codec
+from .utils.audio_decoder import base64_digest, decode_base64_audio
+from .websocket_nodes import DEFAULT_SERVER_IP, DEFAULT_SERVER_PORT, get_websocket_client, mic_frame_handler
+from .utils.beat_tracking import SpectralFrameRing, TempoEstimator, analyze_beat_grid
+from .utils.band_analysis import (
+    BAND_LAYOUTS,
+    band_edges,
+    band_means,
+    edge_band_table,
+    range_band_table,
+    split_band_table,
+)
 import time
 import numpy as np
 from collections import deque
@@ -22,6 +30,8 @@ UTILS_DIR = os.path.join(Path(__file__).parent, "utils")
 
 CATEGORY = "vrch.ai/audio"
 
+TEMPO_ENGINES = ["autocorrelation", "beat_intervals"]
+
 class VrchAudioSaverNode:
     def __init__(self):
         self.output_dir = folder_paths.get_output_directory()
@@ -134,67 +144,16 @@ class VrchAudioRecorderNode:
         if not base64_data or not isinstance(base64_data, str) or not base64_data.strip():
             return (_silent_audio(),)
 
+        # Decoded recordings are cached by the same digest IS_CHANGED returns,
+        # so re-running the graph with an unchanged recording skips decoding.
         try:
-            base64_str = base64_data.strip()
-            if "," in base64_str:
-                base64_str = base64_str.split(",", 1)[1]
-            base64_str += "=" * (-len(base64_str) % 4)
-            audio_data = base64.b64decode(base64_str)
-        except Exception:
-            # Bad/partial base64 -> return silence
-            return (_silent_audio(),)
-
-        if not audio_data:
-            return (_silent_audio(),)
-
-        # Prefer ComfyUI's native loader for browser WebM recordings.
-        try:
-            from comfy_extras.nodes_audio import load as comfy_load_audio
-
-            temp_path = None
-            try:
-                with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as temp_file:
-                    temp_file.write(audio_data)
-                    temp_path = temp_file.name
-
-                waveform, sample_rate = comfy_load_audio(temp_path)
-            finally:
-                if temp_path and os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                    except OSError:
-                        pass
-
-            return (_audio_from_waveform(waveform, sample_rate),)
+            waveform, sample_rate = decode_base64_audio(base64_data)
         except Exception as e:
+            # Bad/partial base64 or undecodable audio -> return silence
             if debug:
-                print(f"[VrchAudioRecorderNode] ComfyUI audio loader failed: {str(e)}")
-
-        input_buffer = io.BytesIO(audio_data)
-
-        # Decode webm -> wav via ffmpeg with error handling
-        try:
-            output_buffer = io.BytesIO()
-            process = (
-                ffmpeg
-                .input('pipe:0', format='webm')
-                .output('pipe:1', format='wav')
-                .run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
-            )
-            output, _ = process.communicate(input=input_buffer.read())
-            if not output:
-                return (_silent_audio(),)
-            output_buffer.write(output)
-            output_buffer.seek(0)
-        except Exception:
+                print(f"[VrchAudioRecorderNode] Audio decode failed: {str(e)}")
             return (_silent_audio(),)
 
-        # Load wav bytes with torchaudio
-        try:
-            waveform, sample_rate = torchaudio.load(output_buffer)
-        except Exception:
-            return (_silent_audio(),)
-        
         return (_audio_from_waveform(waveform, sample_rate),)
     
     @classmethod
@@ -202,14 +161,8 @@ class VrchAudioRecorderNode:
                    loop, loop_interval, shortcut, shortcut_key, 
                    new_generation_after_recording, device_id="", device_name="", debug=False):
         
-        # Create a new SHA-256 hash object
-        m = hashlib.sha256()
-        
-        # Update the hash object with the encoded base64 data
-        m.update(base64_data.encode())
-        
-        # Return the hexadecimal digest of the hash
-        return m.hexdigest()
+        # SHA-256 of the base64 data; also the decoded-audio cache key
+        return base64_digest(base64_data)
 
 class VrchAudioGenresNode:
     
@@ -270,6 +223,8 @@ class VrchAudioGenresNode:
 
         return (audio, result,)
 
+MIC_SOURCES = ["widget", "websocket"]
+
 class VrchMicLoaderNode:
     """
     Node for capturing and processing microphone input in real-time.
@@ -289,6 +244,11 @@ class VrchMicLoaderNode:
                 "debug": ("BOOLEAN", {"default": False}),
                 "raw_data": ("STRING", {"default": "", "multiline": True, "dynamicPrompts": False}),
             },
+            "optional": {
+                "source": (MIC_SOURCES, {"default": "widget"}),
+                "channel": (["1", "2", "3", "4", "5", "6", "7", "8"], {"default": "1"}),
+                "server": ("STRING", {"default": f"{DEFAULT_SERVER_IP}:{DEFAULT_SERVER_PORT}", "multiline": False}),
+            },
         }
     
     RETURN_TYPES = (
@@ -332,7 +292,7 @@ class VrchMicLoaderNode:
         Analyze spectrum data to extract low/mid/high frequency volume values.
         
         Args:
-            spectrum: FFT spectrum data (list or array)
+            spectrum: FFT spectrum data (list or numpy array)
             sample_rate: Audio sample rate in Hz
             low_freq_max: Maximum frequency for low band (Hz)
             mid_freq_max: Maximum frequency for mid band (Hz)
@@ -341,32 +301,12 @@ class VrchMicLoaderNode:
             list: [low_volume, mid_volume, high_volume]
         """
         try:
-            if not spectrum or len(spectrum) == 0:
+            if spectrum is None or len(spectrum) == 0:
                 return [0.0, 0.0, 0.0]
             
-            # Convert to float list if needed
-            if not isinstance(spectrum, list):
-                spectrum = list(spectrum)
-            
-            # Calculate frequency resolution
-            nyquist = sample_rate / 2
-            freq_bins = len(spectrum)
-            freq_per_bin = nyquist / freq_bins
-            
-            # Calculate frequency band boundaries in bins
-            low_end = max(1, int(low_freq_max / freq_per_bin))
-            mid_end = max(low_end + 1, int(mid_freq_max / freq_per_bin))
-            
-            # Ensure boundaries don't exceed spectrum length
-            low_end = min(low_end, freq_bins)
-            mid_end = min(mid_end, freq_bins)
-            
-            # Calculate average volume for each frequency band
-            low_volume = sum(spectrum[:low_end]) / low_end if low_end > 0 else 0.0
-            mid_volume = sum(spectrum[low_end:mid_end]) / (mid_end - low_end) if mid_end > low_end else 0.0
-            high_volume = sum(spectrum[mid_end:]) / (freq_bins - mid_end) if freq_bins > mid_end else 0.0
-            
-            return [float(low_volume), float(mid_volume), float(high_volume)]
+            # Bin boundaries are cached per (sample_rate, length, split)
+            table = split_band_table(int(sample_rate), len(spectrum), (int(low_freq_max), int(mid_freq_max)))
+            return band_means(spectrum, table).tolist()
             
         except Exception as e:
             print(f"[VrchMicLoaderNode] Error analyzing frequency bands: {str(e)}")
@@ -382,9 +322,15 @@ class VrchMicLoaderNode:
                         mid_freq_max: int = 5000,
                         enable_preview: bool = True,
                         debug: bool = False, 
-                        raw_data: str = ""):
+                        raw_data: str = "",
+                        source: str = "widget",
+                        channel: str = "1",
+                        server: str = ""):
         """
         Load and process microphone data with frequency band analysis.
+        
+        With source="websocket" the latest binary frame on /mic is read
+        instead of the raw_data widget JSON.
         """
         try:
             # Initialize default values
@@ -402,8 +348,29 @@ class VrchMicLoaderNode:
                 "name": name
             }
             
+            websocket_key = None
+            if source == "websocket":
+                frame, sequence = self._read_websocket_frame(server, channel, debug)
+                if frame is not None:
+                    # The lists and JSON only change with the frame; reuse them
+                    # while the same /mic frame is read again.
+                    websocket_key = (server, channel, sequence, device_id, name,
+                                     int(sample_rate), low_freq_max, mid_freq_max)
+                    cached = getattr(self, "_websocket_result", None)
+                    if cached is not None and cached[0] == websocket_key:
+                        return cached[1]
+                    mic_data.update(frame.to_dict())
+                    # Arrays stay numpy until the outputs are built below.
+                    waveform = frame.waveform
+                    spectrum = frame.spectrum
+                    volume = frame.volume
+                    is_active = frame.is_active
+                    mic_data["waveform"] = waveform
+                elif debug:
+                    print(f"[VrchMicLoaderNode] No /mic frame received yet on channel {channel}")
+            
             # Parse raw_data if available
-            if raw_data:
+            elif raw_data:
                 try:
                     parsed_data = json.loads(raw_data)
                     
@@ -434,7 +401,7 @@ class VrchMicLoaderNode:
                         print(f"[VrchMicLoaderNode] Error processing microphone data: {str(e)}")
             
             # Perform frequency analysis if spectrum data is available
-            if spectrum:
+            if len(spectrum):
                 freq_volumes = self.analyze_frequency_bands(
                     spectrum, 
                     int(sample_rate), 
@@ -461,9 +428,19 @@ class VrchMicLoaderNode:
                 print(f"[VrchMicLoaderNode] Spectrum length: {len(spectrum)}")
                 print(f"[VrchMicLoaderNode] Frequency volumes - Low: {low_freq_volume:.4f}, Mid: {mid_freq_volume:.4f}, High: {high_freq_volume:.4f}")
             
+            if isinstance(spectrum, np.ndarray):
+                # /mic frame: the codec serializes the arrays directly; lists
+                # are built only for the WAVEFORM / SPECTRUM list outputs.
+                mic_data["spectrum"] = spectrum
+                raw_json = json_codec.dumps(mic_data)
+                waveform = waveform.tolist()
+                spectrum = spectrum.tolist()
+            else:
+                raw_json = json.dumps(mic_data)
+            
             # Return processed data
-            return (
-                json.dumps(mic_data),   # RAW_DATA - complete mic data as JSON
+            result = (
+                raw_json,               # RAW_DATA - complete mic data as JSON
                 waveform,               # WAVEFORM
                 spectrum,               # SPECTRUM
                 volume,                 # VOLUME
@@ -472,6 +449,9 @@ class VrchMicLoaderNode:
                 high_freq_volume,       # HIGH_FREQ_VOLUME
                 is_active,              # IS_ACTIVE
             )
+            if websocket_key is not None:
+                self._websocket_result = (websocket_key, result)
+            return result
             
         except Exception as e:
             print(f"[VrchMicLoaderNode] Error loading microphone data: {str(e)}")
@@ -492,8 +472,19 @@ class VrchMicLoaderNode:
                 False,                         # IS_ACTIVE
             )
     
+    @staticmethod
+    def _read_websocket_frame(server, channel, debug=False):
+        host, port = (server or f"{DEFAULT_SERVER_IP}:{DEFAULT_SERVER_PORT}").split(":")
+        client = get_websocket_client(
+            host, port, "/mic", channel, data_handler=mic_frame_handler, debug=debug, latest_only=True,
+        )
+        return client.get_latest_data_with_sequence()
+    
     @classmethod
     def IS_CHANGED(cls, **kwargs):
+        if kwargs.get("source") == "websocket":
+            # Always re-read the latest /mic frame
+            return float("NaN")
         raw_data = kwargs.get("raw_data", "")
         debug = kwargs.get("debug", False)
         if not raw_data:
@@ -609,7 +600,7 @@ class VrchAudioFrequencyBandAnalyzerNode:
         Calculate the average volume for a specific frequency band.
         
         Args:
-            spectrum: FFT spectrum data (list)
+            spectrum: FFT spectrum data (list or numpy array)
             sample_rate: Audio sample rate in Hz
             freq_min: Minimum frequency of the band (Hz)
             freq_max: Maximum frequency of the band (Hz)
@@ -618,31 +609,12 @@ class VrchAudioFrequencyBandAnalyzerNode:
             float: Average volume in the specified frequency band
         """
         try:
-            if not spectrum or len(spectrum) == 0:
-                return 0.0
-            
-            # Ensure freq_min <= freq_max
-            if freq_min > freq_max:
-                freq_min, freq_max = freq_max, freq_min
-            
-            # Calculate frequency resolution
-            nyquist = sample_rate / 2
-            freq_bins = len(spectrum)
-            freq_per_bin = nyquist / freq_bins
-            
-            # Calculate frequency band boundaries in bins
-            bin_min = max(0, int(freq_min / freq_per_bin))
-            bin_max = min(freq_bins - 1, int(freq_max / freq_per_bin))
-            
-            # Ensure we have a valid range
-            if bin_min >= bin_max:
+            if spectrum is None or len(spectrum) == 0:
                 return 0.0
             
-            # Calculate average volume for the frequency band
-            band_spectrum = spectrum[bin_min:bin_max + 1]
-            band_volume = sum(band_spectrum) / len(band_spectrum) if band_spectrum else 0.0
-            
-            return float(band_volume)
+            # Bin boundaries are cached per (sample_rate, length, band)
+            table = range_band_table(int(sample_rate), len(spectrum), ((freq_min, freq_max),))
+            return float(band_means(spectrum, table)[0])
             
         except Exception as e:
             print(f"[VrchAudioFrequencyBandAnalyzerNode] Error calculating band volume: {str(e)}")
@@ -663,6 +635,92 @@ class VrchAudioFrequencyBandAnalyzerNode:
             m.update(json.dumps(raw_data, sort_keys=True).encode("utf-8"))
         return m.hexdigest()
 
+class VrchAudioMultiBandAnalyzerNode:
+    """
+    Node for analyzing many frequency band volumes from audio raw data in one pass.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "raw_data": ("JSON",),
+                "band_layout": (BAND_LAYOUTS, {"default": "log"}),
+                "band_count": ("INT", {"default": 16, "min": 1, "max": 128, "step": 1}),
+                "freq_min": ("INT", {"default": 20, "min": 0, "max": 24000, "step": 10}),
+                "freq_max": ("INT", {"default": 20000, "min": 20, "max": 24000, "step": 10}),
+                "sample_rate": (["16000", "24000", "48000"], {"default": "48000"}),
+                "debug": ("BOOLEAN", {"default": False}),
+            },
+            "optional": {
+                "custom_edges": ("STRING", {"default": "20, 60, 250, 500, 2000, 4000, 6000, 20000", "multiline": False}),
+            }
+        }
+    
+    RETURN_TYPES = ("JSON", "FLOAT")
+    RETURN_NAMES = ("ANALYSIS_DATA", "BAND_VOLUMES")
+    OUTPUT_IS_LIST = (False, True)
+    FUNCTION = "analyze_bands"
+    CATEGORY = CATEGORY
+    
+    def analyze_bands(self, raw_data, band_layout, band_count, freq_min, freq_max,
+                      sample_rate="48000", debug=False, custom_edges=""):
+        """
+        Analyze the volumes of all bands of a layout from audio raw data.
+        
+        The raw data is parsed once and all bands are reduced together, so one
+        node replaces a chain of single-band analyzers.
+        
+        Returns:
+            tuple: (analysis_data, band_volumes)
+        """
+        sample_rate = int(sample_rate)
+        try:
+            edges = band_edges(band_layout, band_count, freq_min, freq_max, custom_edges)
+            spectrum = None
+            
+            if raw_data:
+                try:
+                    parsed_data = json.loads(raw_data) if isinstance(raw_data, str) else raw_data
+                    if isinstance(parsed_data.get("spectrum"), list):
+                        spectrum = parsed_data["spectrum"]
+                except (json.JSONDecodeError, TypeError, AttributeError):
+                    if debug:
+                        print("[VrchAudioMultiBandAnalyzerNode] Failed to parse raw_data as JSON")
+            
+            if spectrum:
+                table = edge_band_table(sample_rate, len(spectrum), edges)
+                band_volumes = band_means(spectrum, table).tolist()
+            else:
+                band_volumes = [0.0] * (len(edges) - 1)
+            
+            analysis_data = {
+                "band_volumes": band_volumes,
+                "band_edges": list(edges),
+                "band_layout": band_layout,
+                "band_count": len(band_volumes),
+                "sample_rate": sample_rate,
+                "spectrum_length": len(spectrum) if spectrum else 0,
+                "has_spectrum_data": bool(spectrum),
+            }
+            
+            if debug:
+                print(f"[VrchAudioMultiBandAnalyzerNode] {band_layout} layout, {len(band_volumes)} bands: "
+                      f"{', '.join(f'{volume:.4f}' for volume in band_volumes)}")
+            
+            return (analysis_data, band_volumes)
+            
+        except Exception as e:
+            if debug:
+                print(f"[VrchAudioMultiBandAnalyzerNode] Error: {str(e)}")
+            
+            error_data = {
+                "band_volumes": [],
+                "band_layout": band_layout,
+                "sample_rate": sample_rate,
+                "error": str(e)
+            }
+            return (error_data, [])
+
 class VrchAudioConcatNode:
     """
     Node for concatenating two audio inputs into a single audio output.
@@ -790,9 +848,11 @@ class VrchBPMDetectorNode:
     """
     
     def __init__(self):
-        # Initialize buffers for temporal analysis
-        self.waveform_buffer = deque(maxlen=500)  # Reduced buffer size for better performance
-        self.spectrum_buffer = deque(maxlen=500)
+        # Preallocated spectrum ring with per-frame energy, flux and RMS
+        self.spectral_ring = SpectralFrameRing(capacity=500)
+        # Onset-strength envelope for the autocorrelation tempo engine
+        self.tempo_estimator = TempoEstimator(history_seconds=10.0)
+        self.last_onset = 0.0
         self.beat_times = deque(maxlen=30)  # Increased for better BPM calculation
         self.last_update_time = 0
         self.bpm_history = deque(maxlen=8)  # Increased for better smoothing
@@ -827,6 +887,18 @@ class VrchBPMDetectorNode:
         # In the future, we could implement time-based cleanup here
         pass
     
+    def recent_beats(self, current_time, window):
+        """
+        Beat times within the last ``window`` seconds as a numpy array.
+        
+        Args:
+            current_time: Current timestamp
+            window: Window length in seconds
+        """
+        times = np.fromiter(self.beat_times, dtype=np.float64, count=len(self.beat_times))
+        # beat_times is appended in time order, so the recent beats are a suffix
+        return times[np.searchsorted(times, current_time - window, side="left"):]
+    
     def get_adaptive_min_interval(self):
         """
         Calculate adaptive minimum interval between beats based on recent BPM history.
@@ -856,6 +928,9 @@ class VrchBPMDetectorNode:
                 "bpm_range_max": ("INT", {"default": 200, "min": 60, "max": 300, "step": 1}),
                 "debug": ("BOOLEAN", {"default": False}),
             },
+            "optional": {
+                "tempo_engine": (TEMPO_ENGINES, {"default": "autocorrelation"}),
+            },
         }
     
     RETURN_TYPES = (
@@ -864,6 +939,7 @@ class VrchBPMDetectorNode:
         "FLOAT",    # BPM_CONFIDENCE
         "BOOLEAN",  # BEAT_DETECTED
         "FLOAT",    # RHYTHM_STRENGTH
+        "FLOAT",    # BEAT_PHASE
     )
     
     RETURN_NAMES = (
@@ -872,6 +948,7 @@ class VrchBPMDetectorNode:
         "BPM_CONFIDENCE",
         "BEAT_DETECTED",
         "RHYTHM_STRENGTH",
+        "BEAT_PHASE",
     )
     
     CATEGORY = CATEGORY
@@ -891,132 +968,108 @@ class VrchBPMDetectorNode:
             tuple: (beat_detected, beat_strength)
         """
         try:
-            if not waveform or not spectrum:
-                return False, 0.0
-                
-            # Convert to numpy arrays for analysis
-            waveform_np = np.array(waveform) if isinstance(waveform, list) else waveform
-            spectrum_np = np.array(spectrum) if isinstance(spectrum, list) else spectrum
-            
-            # Validate input arrays
-            if len(waveform_np) == 0 or len(spectrum_np) == 0:
+            self.last_onset = 0.0
+            if len(waveform) == 0 or len(spectrum) == 0:
+                self.spectral_ring.mark_gap()
                 return False, 0.0
             
             # Focus on low-frequency content for beat detection (20-250 Hz)
-            freq_per_bin = (sample_rate / 2) / len(spectrum_np)
-            low_freq_end = min(int(250 / freq_per_bin), len(spectrum_np))
+            freq_per_bin = (sample_rate / 2) / len(spectrum)
+            low_freq_end = min(int(250 / freq_per_bin), len(spectrum))
             # Ensure we have at least 10 bins for low frequency analysis
-            low_freq_end = max(low_freq_end, min(10, len(spectrum_np)))
-            beat_spectrum = spectrum_np[:low_freq_end]
+            low_freq_end = max(low_freq_end, min(10, len(spectrum)))
+            
+            # Store the frame; energy, flux and RMS are computed against the previous row
+            features = self.spectral_ring.push(spectrum, waveform, low_freq_end)
+            self.last_onset = features.flux
             
             # Calculate energy in beat-relevant frequencies
-            beat_energy = np.sum(np.abs(beat_spectrum))  # Use absolute values for energy
+            beat_energy = features.low_energy
+            current_rms = features.rms
+            spectrum_variation = features.spectral_std
             
             # Initialize debug counter if not exists
             if not hasattr(self, 'debug_counter'):
                 self.debug_counter = 0
             
             # Simple onset detection using energy increase
-            if len(self.spectrum_buffer) > 0:
-                prev_spectrum = np.array(self.spectrum_buffer[-1])
-                if len(prev_spectrum) >= low_freq_end:
-                    prev_beat_energy = np.sum(np.abs(prev_spectrum[:low_freq_end]))
-                    energy_increase = beat_energy - prev_beat_energy
+            if features.has_previous:
+                prev_beat_energy = features.prev_low_energy
+                energy_increase = beat_energy - prev_beat_energy
+                
+                # Debug: Print energy analysis (controlled by debug parameter)
+                if debug:
+                    self.debug_counter += 1
+                    if self.debug_counter % 10 == 0:
+                        spectrum_np = self.spectral_ring.latest()
+                        total_energy = np.sum(np.abs(spectrum_np))
+                        max_spectrum_val = np.max(spectrum_np)
+                        mean_spectrum_val = np.mean(spectrum_np)
+                        print(f"[DEBUG] Beat Energy: {beat_energy:.6f}, Prev: {prev_beat_energy:.6f}")
+                        print(f"[DEBUG] Energy Increase: {energy_increase:.6f}")
+                        print(f"[DEBUG] Total Spectrum Energy: {total_energy:.6f}")
+                        print(f"[DEBUG] Max Spectrum: {max_spectrum_val:.6f}, Mean: {mean_spectrum_val:.6f}")
+                        print(f"[DEBUG] Low freq bins: {low_freq_end}/{len(spectrum_np)}")
+                
+                # Normalize by previous energy to get relative increase
+                if prev_beat_energy > 0:
+                    energy_ratio = energy_increase / prev_beat_energy
                     
-                    # Debug: Print energy analysis (controlled by debug parameter)
-                    if debug:
-                        self.debug_counter += 1
-                        if self.debug_counter % 10 == 0:
-                            total_energy = np.sum(np.abs(spectrum_np))
-                            max_spectrum_val = np.max(spectrum_np)
-                            mean_spectrum_val = np.mean(spectrum_np)
-                            print(f"[DEBUG] Beat Energy: {beat_energy:.6f}, Prev: {prev_beat_energy:.6f}")
-                            print(f"[DEBUG] Energy Increase: {energy_increase:.6f}")
-                            print(f"[DEBUG] Total Spectrum Energy: {total_energy:.6f}")
-                            print(f"[DEBUG] Max Spectrum: {max_spectrum_val:.6f}, Mean: {mean_spectrum_val:.6f}")
-                            print(f"[DEBUG] Low freq bins: {low_freq_end}/{len(spectrum_np)}")
+                    # Compare RMS with the previous frame
+                    rms_based_beat = False
+                    rms_ratio = 0.0
+                    if features.prev_rms > 0:
+                        rms_ratio = (current_rms - features.prev_rms) / features.prev_rms
+                        rms_based_beat = abs(rms_ratio) > 0.15  # Lower threshold for RMS change
                     
-                    # Check if we have enough variation in the spectrum
-                    spectrum_variation = np.std(spectrum_np)
+                    # Alternative detection: Use spectral flux (positive differences) for onset detection
+                    spectral_flux = features.flux
                     
-                    # Normalize by previous energy to get relative increase
-                    if prev_beat_energy > 0:
-                        energy_ratio = energy_increase / prev_beat_energy
-                        
-                        # Calculate RMS energy variation
-                        current_rms = np.sqrt(np.mean(waveform_np**2))
-                        
-                        # Check if we have previous waveform for RMS comparison
-                        rms_based_beat = False
-                        rms_ratio = 0.0
-                        if len(self.waveform_buffer) > 0:
-                            prev_waveform = np.array(self.waveform_buffer[-1])
-                            if len(prev_waveform) > 0:
-                                prev_rms = np.sqrt(np.mean(prev_waveform**2))
-                                if prev_rms > 0:
-                                    rms_ratio = (current_rms - prev_rms) / prev_rms
-                                    rms_based_beat = abs(rms_ratio) > 0.15  # Lower threshold for RMS change
-                        
-                        # Alternative detection: Use spectral flux for onset detection
-                        spectral_flux = 0.0
-                        if len(self.spectrum_buffer) >= 2:
-                            prev2_spectrum = np.array(self.spectrum_buffer[-2]) if len(self.spectrum_buffer) >= 2 else prev_spectrum
-                            if len(prev2_spectrum) >= low_freq_end:
-                                # Calculate spectral flux (positive differences)
-                                flux_diff = beat_spectrum - prev2_spectrum[:low_freq_end]
-                                spectral_flux = np.sum(np.maximum(flux_diff, 0))
-                        
-                        # Improved beat detection logic with multiple criteria
-                        energy_threshold = 0.03  # Lowered threshold
-                        absolute_energy_threshold = 0.015  # Lowered threshold
-                        flux_threshold = 0.1  # Spectral flux threshold
-                        
-                        # Multiple detection criteria
-                        energy_beat = energy_ratio > energy_threshold and beat_energy > absolute_energy_threshold
-                        flux_beat = spectral_flux > flux_threshold
-                        variation_beat = spectrum_variation > 0.1 and current_rms > 0.05  # Minimum activity
-                        
-                        beat_detected = energy_beat or rms_based_beat or flux_beat or variation_beat
-                        
-                        # Calculate strength based on multiple factors
-                        energy_strength = min(1.0, max(0.0, energy_ratio * 6))
-                        rms_strength = min(1.0, abs(rms_ratio) * 3) if rms_based_beat else 0.0
-                        flux_strength = min(1.0, spectral_flux * 2) if flux_beat else 0.0
-                        variation_strength = min(1.0, spectrum_variation * 2) if variation_beat else 0.0
-                        
-                        beat_strength = max(energy_strength, rms_strength, flux_strength, variation_strength)
+                    # Improved beat detection logic with multiple criteria
+                    energy_threshold = 0.03  # Lowered threshold
+                    absolute_energy_threshold = 0.015  # Lowered threshold
+                    flux_threshold = 0.1  # Spectral flux threshold
+                    
+                    # Multiple detection criteria
+                    energy_beat = energy_ratio > energy_threshold and beat_energy > absolute_energy_threshold
+                    flux_beat = spectral_flux > flux_threshold
+                    variation_beat = spectrum_variation > 0.1 and current_rms > 0.05  # Minimum activity
+                    
+                    beat_detected = energy_beat or rms_based_beat or flux_beat or variation_beat
+                    
+                    # Calculate strength based on multiple factors
+                    energy_strength = min(1.0, max(0.0, energy_ratio * 6))
+                    rms_strength = min(1.0, abs(rms_ratio) * 3) if rms_based_beat else 0.0
+                    flux_strength = min(1.0, spectral_flux * 2) if flux_beat else 0.0
+                    variation_strength = min(1.0, spectrum_variation * 2) if variation_beat else 0.0
+                    
+                    beat_strength = max(energy_strength, rms_strength, flux_strength, variation_strength)
+                    
+                    # Debug: Print beat detection details
+                    if debug and self.debug_counter % 10 == 0:
+                        print(f"[DEBUG] Energy Ratio: {energy_ratio:.6f}, RMS: {current_rms:.6f}")
+                        print(f"[DEBUG] RMS Ratio: {rms_ratio:.6f}, Spectral Flux: {spectral_flux:.6f}")
+                        print(f"[DEBUG] Spectrum Variation: {spectrum_variation:.6f}")
+                        print(f"[DEBUG] Beat Detected: {beat_detected} (energy: {energy_beat}, rms: {rms_based_beat}, flux: {flux_beat}, variation: {variation_beat})")
+                        print(f"[DEBUG] Beat Strength: {beat_strength:.6f}")
                         
-                        # Debug: Print beat detection details
+                    return beat_detected, beat_strength
+                else:
+                    # If previous energy is 0, use alternative detection methods
+                    # Detect based on absolute thresholds
+                    if beat_energy > 0.02 or current_rms > 0.05 or spectrum_variation > 0.1:
                         if debug and self.debug_counter % 10 == 0:
-                            print(f"[DEBUG] Energy Ratio: {energy_ratio:.6f}, RMS: {current_rms:.6f}")
-                            print(f"[DEBUG] RMS Ratio: {rms_ratio:.6f}, Spectral Flux: {spectral_flux:.6f}")
-                            print(f"[DEBUG] Spectrum Variation: {spectrum_variation:.6f}")
-                            print(f"[DEBUG] Beat Detected: {beat_detected} (energy: {energy_beat}, rms: {rms_based_beat}, flux: {flux_beat}, variation: {variation_beat})")
-                            print(f"[DEBUG] Beat Strength: {beat_strength:.6f}")
-                            
-                        return beat_detected, beat_strength
-                    else:
-                        # If previous energy is 0, use alternative detection methods
-                        current_rms = np.sqrt(np.mean(waveform_np**2))
-                        spectrum_variation = np.std(spectrum_np)
+                            print(f"[DEBUG] Previous energy was 0, using alternative detection")
+                            print(f"[DEBUG] Current energy: {beat_energy:.6f}, RMS: {current_rms:.6f}, Variation: {spectrum_variation:.6f}")
                         
-                        # Detect based on absolute thresholds
-                        if beat_energy > 0.02 or current_rms > 0.05 or spectrum_variation > 0.1:
-                            if debug and self.debug_counter % 10 == 0:
-                                print(f"[DEBUG] Previous energy was 0, using alternative detection")
-                                print(f"[DEBUG] Current energy: {beat_energy:.6f}, RMS: {current_rms:.6f}, Variation: {spectrum_variation:.6f}")
-                            
-                            strength = max(
-                                min(1.0, beat_energy * 25),
-                                min(1.0, current_rms * 10),
-                                min(1.0, spectrum_variation * 5)
-                            )
-                            return True, strength
+                        strength = max(
+                            min(1.0, beat_energy * 25),
+                            min(1.0, current_rms * 10),
+                            min(1.0, spectrum_variation * 5)
+                        )
+                        return True, strength
             
             # If no previous spectrum, check for significant activity in current frame
-            current_rms = np.sqrt(np.mean(waveform_np**2))
-            spectrum_variation = np.std(spectrum_np)
-            
             if beat_energy > 0.03 or current_rms > 0.05 or spectrum_variation > 0.1:
                 strength = max(
                     min(1.0, beat_energy * 20),
@@ -1043,16 +1096,14 @@ class VrchBPMDetectorNode:
             tuple: (bpm_value, confidence)
         """
         try:
+            beat_times = np.asarray(beat_times, dtype=np.float64)
             if len(beat_times) < 2:  # Need at least 2 beats for one interval
                 return 0.0, 0.0
                 
             # Calculate intervals between beats
-            intervals = []
-            for i in range(1, len(beat_times)):
-                interval = beat_times[i] - beat_times[i-1]
-                # Filter intervals to reasonable BPM range (24-300 BPM)
-                if 0.2 < interval < 2.5:  # 24-300 BPM range
-                    intervals.append(interval)
+            intervals = np.diff(beat_times)
+            # Filter intervals to reasonable BPM range (24-300 BPM)
+            intervals = intervals[(intervals > 0.2) & (intervals < 2.5)]
             
             if len(intervals) < 1:
                 return 0.0, 0.0
@@ -1061,10 +1112,7 @@ class VrchBPMDetectorNode:
             if len(intervals) >= 3:
                 median_interval = np.median(intervals)
                 # Keep intervals within 30% of median
-                filtered_intervals = [
-                    interval for interval in intervals 
-                    if abs(interval - median_interval) < 0.3 * median_interval
-                ]
+                filtered_intervals = intervals[np.abs(intervals - median_interval) < 0.3 * median_interval]
                 if len(filtered_intervals) >= 2:
                     intervals = filtered_intervals
             
@@ -1097,7 +1145,8 @@ class VrchBPMDetectorNode:
                    confidence_threshold=0.3,
                    bpm_range_min=60,
                    bpm_range_max=200,
-                   debug=False):
+                   debug=False,
+                   tempo_engine="autocorrelation"):
         """
         Detect BPM from audio raw data containing waveform and spectrum.
         """
@@ -1152,10 +1201,6 @@ class VrchBPMDetectorNode:
                     waveform = []
                     spectrum = []
             
-            # Add current data to buffers
-            self.waveform_buffer.append(waveform)
-            self.spectrum_buffer.append(spectrum)
-            
             # Clean old beat times
             self.clean_old_beats(current_time)
             
@@ -1182,15 +1227,29 @@ class VrchBPMDetectorNode:
                         print(f"[VrchBPMDetectorNode] Beat too soon, reduced strength: {current_time:.3f}")
                         print(f"[VrchBPMDetectorNode] Min interval: {min_interval:.3f}s")
                 
+            # Feed the frame's spectral flux into the onset envelope
+            self.tempo_estimator.push(self.last_onset, current_time)
+            
+            # Beats inside the analysis window, shared by the BPM and rhythm calculations
+            recent_beats = self.recent_beats(current_time, analysis_window)
+            
             # Update BPM calculation periodically
             if current_time - self.last_update_time >= update_interval:
                 self.last_update_time = current_time
                 
-                # Calculate BPM from recent beats
-                recent_beats = [t for t in self.beat_times if current_time - t <= analysis_window]
-                if len(recent_beats) >= 2:  # Need at least 2 beats for BPM calculation
-                    calculated_bpm, calculated_confidence = self.calculate_bpm(recent_beats)
-                    
+                if tempo_engine == "autocorrelation":
+                    # Autocorrelate the onset envelope over the analysis window
+                    calculated_bpm, calculated_confidence, _ = self.tempo_estimator.estimate(
+                        analysis_window, bpm_range_min, bpm_range_max, timestamp=current_time
+                    )
+                    has_estimate = calculated_bpm > 0
+                else:
+                    # Calculate BPM from recent beat intervals
+                    has_estimate = len(recent_beats) >= 2  # Need at least 2 beats for BPM calculation
+                    if has_estimate:
+                        calculated_bpm, calculated_confidence = self.calculate_bpm(recent_beats)
+                
+                if has_estimate:
                     # Filter BPM to valid range
                     if bpm_range_min <= calculated_bpm <= bpm_range_max:
                         # Apply confidence threshold with adaptive scaling
@@ -1228,22 +1287,26 @@ class VrchBPMDetectorNode:
                     bpm_confidence = max(0.1, bpm_confidence * 0.95)  # Slowly decay confidence
             
             # Calculate rhythm strength based on beat consistency
-            if len(self.beat_times) >= 2:
-                recent_beats = [t for t in self.beat_times if current_time - t <= analysis_window]
-                if len(recent_beats) >= 3:
-                    intervals = [recent_beats[i] - recent_beats[i-1] for i in range(1, len(recent_beats))]
-                    if intervals:
-                        rhythm_strength = max(0.0, 1.0 - (np.std(intervals) / np.mean(intervals)))
+            if len(recent_beats) >= 3:
+                intervals = np.diff(recent_beats)
+                rhythm_strength = max(0.0, 1.0 - (np.std(intervals) / np.mean(intervals)))
             
             # Enhance rhythm strength with current beat
             if beat_detected:
                 rhythm_strength = max(rhythm_strength, beat_strength)
             
+            # Beat phase: 0.0 on the beat, rising to 1.0 just before the next one
+            beat_phase = 0.0
+            if tempo_engine == "autocorrelation":
+                beat_phase = self.tempo_estimator.phase_at(current_time)
+            elif bpm_value > 0 and self.beat_times:
+                beat_phase = ((current_time - self.beat_times[-1]) * bpm_value / 60.0) % 1.0
+            
             if debug:
                 print(f"[VrchBPMDetectorNode] BPM: {bpm_value:.1f}, Confidence: {bpm_confidence:.3f}")
                 print(f"[VrchBPMDetectorNode] Beat detected: {beat_detected}, Strength: {beat_strength:.3f}")
-                print(f"[VrchBPMDetectorNode] Rhythm strength: {rhythm_strength:.3f}")
-                print(f"[VrchBPMDetectorNode] Recent beats: {len([t for t in self.beat_times if current_time - t <= analysis_window])}")
+                print(f"[VrchBPMDetectorNode] Rhythm strength: {rhythm_strength:.3f}, Beat phase: {beat_phase:.3f}")
+                print(f"[VrchBPMDetectorNode] Recent beats: {len(recent_beats)}")
             
             # Update persistent BPM state
             if bpm_value > 0:
@@ -1263,6 +1326,8 @@ class VrchBPMDetectorNode:
                 "bpm_confidence": float(bpm_confidence),
                 "beat_detected": bool(beat_detected),
                 "rhythm_strength": float(rhythm_strength),
+                "beat_phase": float(beat_phase),
+                "tempo_engine": tempo_engine,
                 "analysis_window": analysis_window,
                 "update_interval": update_interval,
                 "confidence_threshold": confidence_threshold,
@@ -1277,6 +1342,7 @@ class VrchBPMDetectorNode:
                 float(bpm_confidence),
                 bool(beat_detected),
                 float(rhythm_strength),
+                float(beat_phase),
             )
             
         except Exception as e:
@@ -1289,6 +1355,7 @@ class VrchBPMDetectorNode:
                 "bpm_confidence": 0.0,
                 "beat_detected": False,
                 "rhythm_strength": 0.0,
+                "beat_phase": 0.0,
                 "error": str(e)
             }
             return (
@@ -1297,6 +1364,7 @@ class VrchBPMDetectorNode:
                 0.0,
                 False,
                 0.0,
+                0.0,
             )
     
     @classmethod
@@ -1304,6 +1372,91 @@ class VrchBPMDetectorNode:
         # Always update for real-time BPM detection
         return float("NaN")
 
+class VrchAudioBeatGridNode:
+    """
+    Node for analyzing the tempo and beat grid of a whole AUDIO input in one pass.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "audio": ("AUDIO",),
+                "fps": ("FLOAT", {"default": 24.0, "min": 1.0, "max": 120.0, "step": 0.01}),
+                "bpm_range_min": ("INT", {"default": 60, "min": 30, "max": 200, "step": 1}),
+                "bpm_range_max": ("INT", {"default": 200, "min": 60, "max": 300, "step": 1}),
+                "debug": ("BOOLEAN", {"default": False}),
+            },
+        }
+    
+    RETURN_TYPES = ("JSON", "FLOAT", "FLOAT", "INT", "FLOAT")
+    RETURN_NAMES = ("BEAT_DATA", "BPM_VALUE", "BEAT_TIMES", "BEAT_FRAMES", "BEAT_SCHEDULE")
+    OUTPUT_IS_LIST = (False, False, True, True, True)
+    FUNCTION = "analyze_beats"
+    CATEGORY = CATEGORY
+    
+    def analyze_beats(self, audio, fps=24.0, bpm_range_min=60, bpm_range_max=200, debug=False):
+        """
+        Analyze tempo and beat timestamps of an AUDIO input and map them to video frames.
+        
+        The channels of the first batch item are mixed to mono and analyzed
+        offline (STFT onset envelope, autocorrelation tempo, beat grid).
+        
+        Returns:
+            tuple: (beat_data, bpm_value, beat_times, beat_frames, beat_schedule)
+        """
+        try:
+            waveform = audio["waveform"]
+            sample_rate = int(audio["sample_rate"])
+            if waveform.dim() == 3:
+                waveform = waveform[0]
+            if waveform.dim() == 2:
+                waveform = waveform.mean(dim=0)
+            samples = waveform.detach().to("cpu", torch.float32).numpy()
+            
+            start_time = time.perf_counter()
+            grid = analyze_beat_grid(samples, sample_rate, bpm_range_min, bpm_range_max)
+            elapsed = time.perf_counter() - start_time
+            
+            # One schedule entry per video frame: 1.0 on frames that start a beat
+            total_frames = int(np.ceil(grid.duration * fps))
+            beat_frames = np.unique(np.rint(grid.beat_times * fps).astype(np.int64))
+            beat_frames = beat_frames[beat_frames < total_frames]
+            beat_schedule = np.zeros(total_frames, dtype=np.float64)
+            beat_schedule[beat_frames] = 1.0
+            
+            beat_times = grid.beat_times.tolist()
+            beat_frames = beat_frames.tolist()
+            beat_data = {
+                "bpm_value": grid.bpm,
+                "bpm_confidence": grid.confidence,
+                "beat_count": len(beat_times),
+                "beat_times": beat_times,
+                "beat_frames": beat_frames,
+                "fps": fps,
+                "total_frames": total_frames,
+                "duration": grid.duration,
+                "sample_rate": sample_rate,
+                "bpm_range": [bpm_range_min, bpm_range_max],
+            }
+            
+            if debug:
+                print(f"[VrchAudioBeatGridNode] {grid.duration:.1f}s analyzed in {elapsed * 1000:.1f} ms: "
+                      f"BPM {grid.bpm:.2f} (confidence {grid.confidence:.3f}), {len(beat_times)} beats")
+            
+            return (beat_data, float(grid.bpm), beat_times, beat_frames, beat_schedule.tolist())
+            
+        except Exception as e:
+            if debug:
+                print(f"[VrchAudioBeatGridNode] Error: {str(e)}")
+            
+            error_data = {
+                "bpm_value": 0.0,
+                "beat_times": [],
+                "beat_frames": [],
+                "error": str(e)
+            }
+            return (error_data, 0.0, [], [], [])
+
 class VrchAudioVisualizerNode:
     """
     Node for generating visualization images from audio waveform and spectrum data.
@@ -0,0 +1,292 @@
+"""VRCH audio WebSocket binary protocol helpers.
+
+Binary frames on ``/audio`` start with ``magic "VAUD" | version u8 |
+frame_type u8`` followed by a header that depends on the version.
+
+Stream packets (``FRAME_STREAM``, version 1)::
+
+    magic | version | frame_type | codec u8 | flags u8 | channels u8 |
+    sample_rate u32 | stream_id u32 | seq u32 | timestamp_us u64
+
+carry consecutive slices of one stream; ``timestamp_us`` is the media time
+of the first sample.
+
+Clip frames (``FRAME_CLIP``, version 2)::
+
+    magic | version | frame_type | codec u8 | flags u8 | channels u8 |
+    sample_rate u32 | clip_id u32 | duration_us u64
+
+carry one complete encoded file (e.g. WebM/Opus) as raw bytes. Clips use
+their own version so a version-1 decoder rejects them instead of reading
+the clip id and duration as stream fields. JSON text frames keep their
+existing meaning.
+"""
+
+from __future__ import annotations
+
+import struct
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+
+MAGIC = b"VAUD"
+VERSION = 1
+CLIP_VERSION = 2
+FRAME_STREAM = 1
+FRAME_CLIP = 2
+
+CODEC_PCM16 = 1
+CODEC_WEBM_OPUS = 2
+CODEC_NAMES = {
+    CODEC_PCM16: "pcm16",
+    CODEC_WEBM_OPUS: "webm-opus",
+}
+# ffmpeg demuxer names for clip codecs.
+CODEC_CONTAINERS = {
+    CODEC_WEBM_OPUS: "webm",
+}
+
+FLAG_STREAM_START = 1
+FLAG_STREAM_END = 2
+
+# Oldest stream chunks are dropped past this many PCM bytes (~5.8 min of
+# 48 kHz stereo), so live streams without FLAG_STREAM_END stay bounded.
+STREAM_BUFFER_MAX_BYTES = 64 * 1024 * 1024
+
+HEADER_FORMAT = ">4sBBBBBIIIQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+CLIP_HEADER_FORMAT = ">4sBBBBBIIQ"
+CLIP_HEADER_SIZE = struct.calcsize(CLIP_HEADER_FORMAT)
+
+
+class AudioProtocolError(ValueError):
+    """Raised when an audio frame cannot be encoded or decoded."""
+
+
+@dataclass
+class AudioFrameHeader:
+    frame_type: int
+    codec: int
+    flags: int
+    channels: int
+    sample_rate: int
+    stream_id: int
+    seq: int
+    timestamp_us: int
+    clip_id: int = 0
+    duration_us: int = 0
+
+
+def is_audio_frame(data) -> bool:
+    return (
+        isinstance(data, (bytes, bytearray, memoryview))
+        and len(data) >= min(HEADER_SIZE, CLIP_HEADER_SIZE)
+        and bytes(data[:4]) == MAGIC
+    )
+
+
+def encode_frame(
+    frame_type: int,
+    payload: bytes,
+    codec: int,
+    sample_rate: int,
+    channels: int,
+    stream_id: int = 0,
+    seq: int = 0,
+    timestamp_us: int = 0,
+    flags: int = 0,
+) -> bytes:
+    if int(frame_type) == FRAME_CLIP:
+        raise AudioProtocolError("clip frames use encode_clip_frame")
+    if not 0 < int(channels) <= 255:
+        raise AudioProtocolError(f"channels out of range: {channels}")
+    header = struct.pack(
+        HEADER_FORMAT,
+        MAGIC,
+        VERSION,
+        int(frame_type) & 0xFF,
+        int(codec) & 0xFF,
+        int(flags) & 0xFF,
+        int(channels),
+        int(sample_rate) & 0xFFFFFFFF,
+        int(stream_id) & 0xFFFFFFFF,
+        int(seq) & 0xFFFFFFFF,
+        int(timestamp_us) & 0xFFFFFFFFFFFFFFFF,
+    )
+    return header + bytes(payload)
+
+
+def encode_stream_packet(stream_id, seq, timestamp_us, sample_rate, channels, payload, codec=CODEC_PCM16, flags=0):
+    return encode_frame(FRAME_STREAM, payload, codec, sample_rate, channels, stream_id, seq, timestamp_us, flags)
+
+
+def encode_clip_frame(clip_id, sample_rate, channels, duration_us, data, codec=CODEC_WEBM_OPUS):
+    if codec not in CODEC_CONTAINERS:
+        raise AudioProtocolError(f"unsupported clip codec: {codec}")
+    if not 0 < int(channels) <= 255:
+        raise AudioProtocolError(f"channels out of range: {channels}")
+    header = struct.pack(
+        CLIP_HEADER_FORMAT,
+        MAGIC,
+        CLIP_VERSION,
+        FRAME_CLIP,
+        int(codec) & 0xFF,
+        0,
+        int(channels),
+        int(sample_rate) & 0xFFFFFFFF,
+        int(clip_id) & 0xFFFFFFFF,
+        int(duration_us) & 0xFFFFFFFFFFFFFFFF,
+    )
+    return header + bytes(data)
+
+
+def decode_frame(data) -> tuple[AudioFrameHeader, memoryview]:
+    """Split a binary frame into its header and a zero-copy payload view."""
+    if len(data) < 6 or bytes(data[:4]) != MAGIC:
+        raise AudioProtocolError("bad audio frame magic")
+    version, frame_type = data[4], data[5]
+    if version == VERSION and frame_type == FRAME_STREAM:
+        if len(data) < HEADER_SIZE:
+            raise AudioProtocolError("short audio frame")
+        _, _, _, codec, flags, channels, sample_rate, stream_id, seq, timestamp_us = struct.unpack_from(
+            HEADER_FORMAT, data, 0
+        )
+        if not channels:
+            raise AudioProtocolError("audio stream frame has no channels")
+        header = AudioFrameHeader(frame_type, codec, flags, channels, sample_rate, stream_id, seq, timestamp_us)
+        return header, memoryview(data)[HEADER_SIZE:]
+    if version == CLIP_VERSION and frame_type == FRAME_CLIP:
+        if len(data) < CLIP_HEADER_SIZE:
+            raise AudioProtocolError("short audio clip frame")
+        _, _, _, codec, flags, channels, sample_rate, clip_id, duration_us = struct.unpack_from(
+            CLIP_HEADER_FORMAT, data, 0
+        )
+        header = AudioFrameHeader(
+            frame_type, codec, flags, channels, sample_rate, 0, 0, 0, clip_id=clip_id, duration_us=duration_us
+        )
+        return header, memoryview(data)[CLIP_HEADER_SIZE:]
+    raise AudioProtocolError(f"unsupported audio frame version/type: {version}/{frame_type}")
+
+
+@dataclass
+class AudioClip:
+    """One complete encoded audio file received as a version-2 ``FRAME_CLIP`` frame."""
+
+    clip_id: int
+    codec: int
+    sample_rate: int
+    channels: int
+    duration_us: int
+    data: bytes
+
+    @classmethod
+    def from_frame(cls, header: AudioFrameHeader, payload) -> "AudioClip":
+        if header.frame_type != FRAME_CLIP:
+            raise AudioProtocolError(f"not a clip frame: {header.frame_type}")
+        if header.codec not in CODEC_CONTAINERS:
+            raise AudioProtocolError(f"unsupported clip codec: {header.codec}")
+        if not len(payload):
+            raise AudioProtocolError("empty audio clip")
+        return cls(header.clip_id, header.codec, header.sample_rate, header.channels, header.duration_us, bytes(payload))
+
+    @property
+    def container(self) -> str:
+        return CODEC_CONTAINERS[self.codec]
+
+
+class AudioStreamBuffer:
+    """Accumulates PCM16 stream packets of the current stream.
+
+    A new stream_id (or a START flag) resets the buffer, so readers always see
+    the audio received so far for the latest stream. Past ``max_bytes`` the
+    oldest chunks are dropped. Stale packets and sequence gaps are counted in
+    ``dropped_packets``.
+    """
+
+    def __init__(self, max_bytes: int = STREAM_BUFFER_MAX_BYTES):
+        self._lock = threading.Lock()
+        self.max_bytes = max_bytes
+        self.stream_id = None
+        self.sample_rate = 0
+        self.channels = 0
+        self.ended = False
+        self.next_seq = 0
+        self.dropped_packets = 0
+        self.trimmed_frames = 0
+        self._chunks: deque[bytes] = deque()
+        self._bytes = 0
+        self._frames = 0
+        # Bumped on every change; the cached waveform is valid for one revision.
+        self._revision = 0
+        self._cached_waveform = None
+        self._cached_revision = 0
+
+    def append(self, header: AudioFrameHeader, payload) -> bool:
+        if header.codec != CODEC_PCM16:
+            raise AudioProtocolError(f"unsupported stream codec: {header.codec}")
+        if not header.channels:
+            raise AudioProtocolError("audio stream frame has no channels")
+        with self._lock:
+            if header.stream_id != self.stream_id or header.flags & FLAG_STREAM_START:
+                self.stream_id = header.stream_id
+                self.sample_rate = header.sample_rate
+                self.channels = header.channels
+                self.ended = False
+                self.next_seq = header.seq
+                self._chunks = deque()
+                self._bytes = 0
+                self._frames = 0
+                self._revision += 1
+            if header.seq < self.next_seq:
+                # Duplicate or stale packet of the current stream.
+                self.dropped_packets += 1
+                return False
+            if header.seq > self.next_seq:
+                # Packets lost in between; the audio around the gap is joined.
+                self.dropped_packets += header.seq - self.next_seq
+            self.next_seq = header.seq + 1
+            chunk = bytes(payload)
+            frame_bytes = 2 * self.channels
+            usable = len(chunk) - (len(chunk) % frame_bytes)
+            if usable:
+                self._chunks.append(chunk[:usable] if usable != len(chunk) else chunk)
+                self._bytes += usable
+                self._frames += usable // frame_bytes
+                self._revision += 1
+                while self._bytes > self.max_bytes and len(self._chunks) > 1:
+                    oldest = self._chunks.popleft()
+                    self._bytes -= len(oldest)
+                    self._frames -= len(oldest) // frame_bytes
+                    self.trimmed_frames += len(oldest) // frame_bytes
+            if header.flags & FLAG_STREAM_END:
+                self.ended = True
+            return True
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    def to_waveform(self) -> np.ndarray | None:
+        """Return the received audio as float32 [channels, samples], or None.
+
+        The conversion is cached per revision; each call returns a copy the
+        caller owns, so tensors built on it never alias the cache.
+        """
+        with self._lock:
+            if not self._frames:
+                return None
+            if self._cached_revision == self._revision:
+                return self._cached_waveform.copy()
+            revision = self._revision
+            data = b"".join(self._chunks)
+            channels = self.channels
+        pcm = np.frombuffer(data, dtype="<i2").reshape(-1, channels)
+        waveform = pcm.T.astype(np.float32) / 32767.0
+        with self._lock:
+            if self._cached_revision < revision:
+                self._cached_waveform = waveform
+                self._cached_revision = revision
+        return waveform.copy()
@@ -0,0 +1,144 @@
+"""VRCH microphone WebSocket binary protocol helpers.
+
+Binary frames on ``/mic`` start with a fixed big-endian header::
+
+    magic "VMIC" | version u8 | dtype u8 | flags u8 | reserved u8 |
+    sample_rate u32 | waveform_len u16 | spectrum_len u16 |
+    volume f32 | rms f32 | zcr f32 | peak f32
+
+followed by ``waveform_len`` waveform values and ``spectrum_len`` spectrum
+values. With ``DTYPE_FLOAT32`` the values are little-endian float32 in
+[-1, 1] / [0, 1]; with ``DTYPE_UINT8`` they are Web Audio analyser bytes
+(waveform centred on 128, spectrum 0-255).
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+
+MAGIC = b"VMIC"
+VERSION = 1
+
+DTYPE_FLOAT32 = 1
+DTYPE_UINT8 = 2
+DTYPE_NAMES = {
+    DTYPE_FLOAT32: "float32",
+    DTYPE_UINT8: "uint8",
+}
+_DTYPES = {
+    DTYPE_FLOAT32: np.dtype("<f4"),
+    DTYPE_UINT8: np.dtype(np.uint8),
+}
+
+FLAG_ACTIVE = 1
+
+HEADER_FORMAT = ">4sBBBBIHHffff"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+class MicProtocolError(ValueError):
+    """Raised when a microphone frame cannot be encoded or decoded."""
+
+
+@dataclass
+class MicFrame:
+    sample_rate: int
+    volume: float
+    rms: float
+    zcr: float
+    peak: float
+    is_active: bool
+    waveform: np.ndarray
+    spectrum: np.ndarray
+    dtype: int = DTYPE_FLOAT32
+
+    def to_dict(self) -> dict:
+        """Scalar fields in the same keys as the ``raw_data`` widget JSON."""
+        return {
+            "sr": self.sample_rate,
+            "ch": 1,
+            "volume": self.volume,
+            "is_active": self.is_active,
+            "rms": self.rms,
+            "zcr": self.zcr,
+            "peak": self.peak,
+        }
+
+
+def is_mic_frame(data) -> bool:
+    return isinstance(data, (bytes, bytearray, memoryview)) and len(data) >= HEADER_SIZE and bytes(data[:4]) == MAGIC
+
+
+def encode_mic_frame(
+    waveform,
+    spectrum,
+    sample_rate: int,
+    volume: float = 0.0,
+    is_active: bool = False,
+    rms: float = 0.0,
+    zcr: float = 0.0,
+    peak: float = 0.0,
+    dtype: int = DTYPE_FLOAT32,
+) -> bytes:
+    if dtype not in _DTYPES:
+        raise MicProtocolError(f"unsupported mic dtype: {dtype}")
+    waveform = np.ascontiguousarray(waveform, dtype=_DTYPES[dtype])
+    spectrum = np.ascontiguousarray(spectrum, dtype=_DTYPES[dtype])
+    if len(waveform) > 0xFFFF or len(spectrum) > 0xFFFF:
+        raise MicProtocolError("mic frame arrays are limited to 65535 values")
+    header = struct.pack(
+        HEADER_FORMAT,
+        MAGIC,
+        VERSION,
+        dtype,
+        FLAG_ACTIVE if is_active else 0,
+        0,
+        int(sample_rate) & 0xFFFFFFFF,
+        len(waveform),
+        len(spectrum),
+        float(volume),
+        float(rms),
+        float(zcr),
+        float(peak),
+    )
+    return header + waveform.tobytes() + spectrum.tobytes()
+
+
+def decode_mic_frame(data) -> MicFrame:
+    """Decode a binary mic frame.
+
+    float32 arrays are read-only ``np.frombuffer`` views of ``data`` (no
+    copy). uint8 frames are a copying path: the bytes are scaled into new
+    float32 arrays in the float ranges of the JSON widget format.
+    """
+    if len(data) < HEADER_SIZE:
+        raise MicProtocolError("short mic frame")
+    (magic, version, dtype, flags, _, sample_rate, waveform_len, spectrum_len,
+     volume, rms, zcr, peak) = struct.unpack_from(HEADER_FORMAT, data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise MicProtocolError("bad mic frame magic/version")
+    if dtype not in _DTYPES:
+        raise MicProtocolError(f"unsupported mic dtype: {dtype}")
+    item = _DTYPES[dtype]
+    if len(data) < HEADER_SIZE + (waveform_len + spectrum_len) * item.itemsize:
+        raise MicProtocolError("truncated mic frame payload")
+    waveform = np.frombuffer(data, dtype=item, count=waveform_len, offset=HEADER_SIZE)
+    spectrum = np.frombuffer(data, dtype=item, count=spectrum_len, offset=HEADER_SIZE + waveform_len * item.itemsize)
+    if dtype == DTYPE_UINT8:
+        waveform = (waveform.astype(np.float32) - 128.0) / 128.0
+        spectrum = spectrum.astype(np.float32) / 255.0
+    return MicFrame(
+        sample_rate=sample_rate,
+        volume=volume,
+        rms=rms,
+        zcr=zcr,
+        peak=peak,
+        is_active=bool(flags & FLAG_ACTIVE),
+        waveform=waveform,
+        spectrum=spectrum,
+        dtype=dtype,
+    )
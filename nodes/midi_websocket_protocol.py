@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import struct
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any
 
+from .utils.readonly import freeze
+
 
 MAGIC = b"VMID"
 VERSION = 1
@@ -225,31 +228,39 @@ class MidiStateStore:
         self.packet_age_ms = None
 
     def snapshot(self) -> dict[str, Any]:
-        return {
+        """Return a read-only copy of the state (nested maps included)."""
+        return freeze({
             "_vrch_type": "midi_state_v1",
             "definition_ready": bool(self.definition_ready),
             "definition_seq": self.definition_seq,
-            "definitions_by_index": dict(self.definitions_by_index),
-            "index_by_key": dict(self.index_by_key),
-            "index_by_cc": dict(self.index_by_cc),
-            "values_by_index": dict(self.values_by_index),
-            "cc_values": {ch: dict(values) for ch, values in self.cc_values.items()},
-            "notes": {ch: {num: dict(value) for num, value in notes.items()} for ch, notes in self.notes.items()},
+            "definitions_by_index": self.definitions_by_index,
+            "index_by_key": self.index_by_key,
+            "index_by_cc": self.index_by_cc,
+            "values_by_index": self.values_by_index,
+            "cc_values": self.cc_values,
+            "notes": self.notes,
             "seq": self.seq,
             "timestamp_ms_low": self.timestamp_ms_low,
             "received_at": self.received_at,
             "packet_age_ms": self.packet_age_ms,
-        }
+        })
 
-    def _set_packet_meta(self, header: MidiFrameHeader):
-        now = time.time()
+    def _set_packet_meta(self, header: MidiFrameHeader, received_at: float | None = None):
+        now = time.time() if received_at is None else received_at
         self.seq = header.seq
         self.timestamp_ms_low = header.timestamp_ms_low
         self.received_at = now
         now_ms_low = int(now * 1000) & 0xFFFFFFFF
         self.packet_age_ms = float((now_ms_low - header.timestamp_ms_low) & 0xFFFFFFFF)
 
-    def apply_definition(self, header: MidiFrameHeader, data: bytes, offset: int):
+    def apply_definition(
+        self,
+        header: MidiFrameHeader,
+        data: bytes,
+        offset: int,
+        received_at: float | None = None,
+        emit_snapshot: bool = True,
+    ):
         definition_seq, offset = _read_u32(data, offset)
         control_count, offset = _read_u8(data, offset)
         definitions_by_index: dict[int, dict[str, Any]] = {}
@@ -299,10 +310,17 @@ class MidiStateStore:
         self.index_by_key = index_by_key
         self.index_by_cc = index_by_cc
         self.values_by_index = {idx: value for idx, value in self.values_by_index.items() if idx in definitions_by_index}
-        self._set_packet_meta(header)
-        return self.snapshot()
-
-    def apply_state(self, header: MidiFrameHeader, data: bytes, offset: int):
+        self._set_packet_meta(header, received_at)
+        return self.snapshot() if emit_snapshot else None
+
+    def apply_state(
+        self,
+        header: MidiFrameHeader,
+        data: bytes,
+        offset: int,
+        received_at: float | None = None,
+        emit_snapshot: bool = True,
+    ):
         frame_definition_seq, offset = _read_u32(data, offset)
         raw_cc_count, offset = _read_u8(data, offset)
         for _ in range(raw_cc_count):
@@ -349,14 +367,16 @@ class MidiStateStore:
                 f"frame={frame_definition_seq}, current={self.definition_seq}"
             )
 
-        self._set_packet_meta(header)
-        return self.snapshot()
+        self._set_packet_meta(header, received_at)
+        return self.snapshot() if emit_snapshot else None
 
 
 class MidiStateParser:
     def __init__(self, debug: bool = False):
         self.debug = debug
         self.store = MidiStateStore(debug=debug)
+        self._lock = threading.Lock()
+        self._snapshot = None
 
     def __call__(self, message: bytes | bytearray | memoryview | str):
         return self.parse(message)
@@ -364,37 +384,53 @@ class MidiStateParser:
     def empty_state(self) -> dict[str, Any]:
         return self.store.snapshot()
 
-    def parse(self, message: bytes | bytearray | memoryview | str):
+    def parse(self, message: bytes | bytearray | memoryview | str, received_at: float | None = None):
+        self.apply(message, received_at=received_at)
+        return self.snapshot()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the read-only state, built once per applied frame and shared by every reader."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self.store.snapshot()
+            return self._snapshot
+
+    def apply(self, message: bytes | bytearray | memoryview | str, received_at: float | None = None) -> bool:
+        """Apply one frame to the store without building a snapshot; True if applied."""
         start = time.perf_counter()
         try:
             if isinstance(message, str):
                 if self.debug:
                     print("[MidiStateParser] ignoring text frame on /midi")
-                return self.store.snapshot()
+                return False
             data = bytes(message)
             if len(data) < HEADER_SIZE:
                 if self.debug:
                     print("[MidiStateParser] ignoring short frame")
-                return self.store.snapshot()
+                return False
             magic, version, frame_type, flags, device_index, seq, timestamp_ms_low = struct.unpack_from(">4sBBBBII", data, 0)
             if magic != MAGIC or version != VERSION:
                 if self.debug:
                     print("[MidiStateParser] ignoring frame with bad magic/version")
-                return self.store.snapshot()
+                return False
             header = MidiFrameHeader(frame_type, flags, device_index, seq, timestamp_ms_low)
-            if frame_type == FRAME_DEFINITION:
-                snapshot = self.store.apply_definition(header, data, HEADER_SIZE)
-            elif frame_type == FRAME_STATE:
-                snapshot = self.store.apply_state(header, data, HEADER_SIZE)
-            else:
-                if self.debug:
-                    print(f"[MidiStateParser] ignoring unknown frame type: {frame_type}")
-                return self.store.snapshot()
+            with self._lock:
+                # Invalidate before touching the store: a truncated frame can
+                # raise after updating part of it.
+                self._snapshot = None
+                if frame_type == FRAME_DEFINITION:
+                    self.store.apply_definition(header, data, HEADER_SIZE, received_at, emit_snapshot=False)
+                elif frame_type == FRAME_STATE:
+                    self.store.apply_state(header, data, HEADER_SIZE, received_at, emit_snapshot=False)
+                else:
+                    if self.debug:
+                        print(f"[MidiStateParser] ignoring unknown frame type: {frame_type}")
+                    return False
             if self.debug:
                 elapsed_ms = (time.perf_counter() - start) * 1000.0
                 print(f"[MidiStateParser] parsed frame_type={frame_type} seq={seq} in {elapsed_ms:.3f} ms")
-            return snapshot
+            return True
         except Exception as exc:
             if self.debug:
                 print(f"[MidiStateParser] parse error: {exc}")
-            return self.store.snapshot()
+            return False
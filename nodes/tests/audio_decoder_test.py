@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Tests for the shared audio decoder service."""
+
+import base64
+import hashlib
+import shutil
+import struct
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import torch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nodes.utils.audio_decoder import (  # noqa: E402
+    AudioDecodeError,
+    AudioDecoder,
+    DecodedAudioCache,
+    base64_digest,
+    parse_float_wav,
+)
+
+
+def _float_wav(samples, sample_rate, data_size=None, extra_chunk=b""):
+    samples = np.asarray(samples, dtype="<f4")
+    channels = samples.shape[1]
+    data = samples.tobytes()
+    fmt = struct.pack("<HHIIHH", 3, channels, sample_rate, sample_rate * channels * 4, channels * 4, 32)
+    size = len(data) if data_size is None else data_size
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + extra_chunk + b"data" + struct.pack("<I", size) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+class TestAudioDecoder(unittest.TestCase):
+    def test_parse_float_wav(self):
+        samples = [[0.25, -0.25], [0.5, -0.5], [1.0, 0.0]]
+        waveform, sample_rate = parse_float_wav(_float_wav(samples, 16000))
+        self.assertEqual((tuple(waveform.shape), waveform.dtype, sample_rate), ((2, 3), torch.float32, 16000))
+        np.testing.assert_allclose(waveform.numpy(), np.asarray(samples).T)
+
+        # Piped ffmpeg output leaves placeholder sizes and may add a LIST chunk.
+        piped = _float_wav(samples, 8000, data_size=0xFFFFFFFF, extra_chunk=b"LIST" + struct.pack("<I", 3) + b"abc\x00")
+        waveform, sample_rate = parse_float_wav(piped)
+        self.assertEqual((tuple(waveform.shape), sample_rate), ((2, 3), 8000))
+
+        with self.assertRaises(AudioDecodeError):
+            parse_float_wav(b"OggS" + b"\x00" * 40)
+
+    def test_decoder_caches_by_payload_hash(self):
+        decoder = AudioDecoder()
+        decoder._comfy_loader = None
+        with mock.patch.object(decoder, "_run_ffmpeg", return_value=_float_wav([[0.0, 0.0]] * 4, 48000)) as run:
+            first = decoder.decode(b"clip-a")
+            second = decoder.decode(b"clip-a")
+            # Hits are copies: mutating one result does not reach the cache or other callers.
+            self.assertIsNot(second[0], first[0])
+            first[0].fill_(1.0)
+            torch.testing.assert_close(second[0], torch.zeros(2, 4))
+            torch.testing.assert_close(decoder.decode(b"clip-a")[0], torch.zeros(2, 4))
+            decoder.decode(b"clip-b")
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual((decoder.cache.hits, decoder.cache.misses), (2, 2))
+        self.assertEqual((tuple(first[0].shape), first[1]), ((2, 4), 48000))
+
+        with self.assertRaises(AudioDecodeError):
+            decoder.decode(b"")
+
+    def test_cache_is_bounded_by_total_samples(self):
+        cache = DecodedAudioCache(max_samples=10)
+        cache.put("a", (torch.zeros(2, 3), 8000))
+        cache.put("b", (torch.zeros(1, 4), 8000))
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", (torch.zeros(1, 3), 8000))
+        # "b" is least recently used once "a" was read.
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((len(cache), cache.total_samples), (2, 9))
+        cache.put("huge", (torch.zeros(2, 6), 8000))
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual(cache.total_samples, 9)
+
+    def test_base64_hits_skip_decoding_and_match_recorder_digest(self):
+        decoder = AudioDecoder(cache=DecodedAudioCache())
+        decoder._comfy_loader = None
+        payload = "data:audio/webm;base64," + base64.b64encode(b"recording").decode("ascii").rstrip("=")
+        with mock.patch.object(decoder, "_run_ffmpeg", return_value=_float_wav([[0.5]] * 3, 16000)) as run:
+            first = decoder.decode_base64(payload)
+            with mock.patch("nodes.utils.audio_decoder.decode_base64_payload") as b64:
+                again = decoder.decode_base64(payload)
+                self.assertEqual(again[1], first[1])
+                torch.testing.assert_close(again[0], first[0])
+                b64.assert_not_called()
+        self.assertEqual(run.call_args[0][0], b"recording")
+        self.assertEqual(run.call_count, 1)
+        self.assertIsNotNone(decoder.cache.get(("base64", "webm", hashlib.sha256(payload.encode()).hexdigest())))
+        self.assertEqual(base64_digest(payload), hashlib.sha256(payload.encode()).hexdigest())
+
+        with self.assertRaises(AudioDecodeError):
+            decoder.decode_base64("@@not-base64@@")
+
+    def test_decoder_prefers_in_process_loader(self):
+        decoder = AudioDecoder()
+        loader = mock.Mock(return_value=(torch.ones(1, 3, dtype=torch.float64), 22050))
+        decoder._comfy_loader = loader
+        with mock.patch.object(decoder, "_run_ffmpeg") as run:
+            waveform, sample_rate = decoder.decode(b"webm-bytes")
+        run.assert_not_called()
+        self.assertEqual((waveform.dtype, sample_rate), (torch.float32, 22050))
+        self.assertEqual(loader.call_args[0][0].read(), b"webm-bytes")
+
+        loader.side_effect = RuntimeError("no demuxer")
+        with mock.patch.object(decoder, "_run_ffmpeg", side_effect=AudioDecodeError("missing")):
+            with self.assertRaises(AudioDecodeError) as ctx:
+                decoder.decode(b"other-bytes")
+        self.assertIn("no demuxer", str(ctx.exception))
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg binary not available")
+    def test_ffmpeg_round_trip(self):
+        import ffmpeg
+
+        pcm = (np.sin(np.linspace(0, 20, 4800)) * 0.5).astype("<f4").tobytes()
+        encoded, _ = (
+            ffmpeg.input("pipe:0", format="f32le", ar=48000, ac=1)
+            .output("pipe:1", format="ogg", acodec="libopus")
+            .run(input=pcm, capture_stdout=True, capture_stderr=True)
+        )
+        decoder = AudioDecoder()
+        decoder._comfy_loader = None
+        waveform, sample_rate = decoder.decode(encoded, container="ogg")
+        self.assertEqual((waveform.shape[0], sample_rate), (1, 48000))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Tests for VRCH audio WebSocket binary protocol."""
+
+import struct
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nodes.audio_websocket_protocol import (  # noqa: E402
+    CLIP_HEADER_SIZE,
+    CODEC_PCM16,
+    CODEC_WEBM_OPUS,
+    FLAG_STREAM_END,
+    FLAG_STREAM_START,
+    FRAME_CLIP,
+    FRAME_STREAM,
+    HEADER_FORMAT,
+    HEADER_SIZE,
+    MAGIC,
+    VERSION,
+    AudioClip,
+    AudioProtocolError,
+    AudioStreamBuffer,
+    decode_frame,
+    encode_clip_frame,
+    encode_frame,
+    encode_stream_packet,
+    is_audio_frame,
+)
+
+
+def _pcm(values, channels=1):
+    return (np.asarray(values, dtype=np.float32).reshape(-1, channels) * 32767.0).astype("<i2").tobytes()
+
+
+class TestAudioWebSocketProtocol(unittest.TestCase):
+    def test_stream_packet_roundtrip(self):
+        packet = encode_stream_packet(7, 3, 250_000, 48000, 2, b"\x01\x00\x02\x00", flags=FLAG_STREAM_START)
+        self.assertTrue(is_audio_frame(packet))
+        self.assertFalse(is_audio_frame(b'{"base64_data": "x"}'))
+        header, payload = decode_frame(packet)
+        self.assertEqual(
+            (header.frame_type, header.stream_id, header.seq, header.timestamp_us, header.sample_rate, header.channels),
+            (FRAME_STREAM, 7, 3, 250_000, 48000, 2),
+        )
+        self.assertEqual(header.flags, FLAG_STREAM_START)
+        self.assertEqual(bytes(payload), b"\x01\x00\x02\x00")
+        self.assertEqual(len(packet), HEADER_SIZE + 4)
+
+        with self.assertRaises(AudioProtocolError):
+            decode_frame(b"VAUD")
+        with self.assertRaises(AudioProtocolError):
+            decode_frame(b"XXXX" + packet[4:])
+
+    def test_stream_buffer_accumulates_and_resets(self):
+        buffer = AudioStreamBuffer()
+        self.assertIsNone(buffer.to_waveform())
+
+        first = encode_stream_packet(1, 0, 0, 16000, 1, _pcm([0.5, -0.5]), flags=FLAG_STREAM_START)
+        second = encode_stream_packet(1, 1, 125, 16000, 1, _pcm([0.25]), flags=FLAG_STREAM_END)
+        self.assertTrue(buffer.append(*decode_frame(first)))
+        np.testing.assert_allclose(buffer.to_waveform(), [[0.5, -0.5]], atol=1e-4)
+        self.assertTrue(buffer.append(*decode_frame(second)))
+        self.assertFalse(buffer.append(*decode_frame(second)))
+        self.assertTrue(buffer.ended)
+        self.assertEqual(buffer.to_waveform().shape, (1, 3))
+        # Reads are cached but each caller gets its own array.
+        shared = buffer.to_waveform()
+        self.assertIsNot(shared, buffer.to_waveform())
+        shared[:] = 0.0
+        np.testing.assert_allclose(buffer.to_waveform(), [[0.5, -0.5, 0.25]], atol=1e-4)
+
+        other = encode_stream_packet(2, 0, 0, 8000, 2, _pcm([0.1, 0.2], channels=2), flags=FLAG_STREAM_START)
+        buffer.append(*decode_frame(other))
+        self.assertEqual((buffer.stream_id, buffer.sample_rate, buffer.to_waveform().shape), (2, 8000, (2, 1)))
+
+    def test_stream_rejects_zero_channels(self):
+        packet = bytearray(encode_stream_packet(1, 0, 0, 16000, 1, _pcm([0.5])))
+        packet[struct.calcsize(">4sBBBB")] = 0
+        with self.assertRaises(AudioProtocolError):
+            decode_frame(bytes(packet))
+        header, payload = decode_frame(encode_stream_packet(1, 0, 0, 16000, 1, _pcm([0.5])))
+        header.channels = 0
+        with self.assertRaises(AudioProtocolError):
+            AudioStreamBuffer().append(header, payload)
+
+    def test_stream_buffer_counts_gaps_and_caps_bytes(self):
+        buffer = AudioStreamBuffer(max_bytes=8)
+        buffer.append(*decode_frame(encode_stream_packet(1, 0, 0, 16000, 1, _pcm([0.1, 0.2]), flags=FLAG_STREAM_START)))
+        # seq 1 and 2 never arrive.
+        buffer.append(*decode_frame(encode_stream_packet(1, 3, 0, 16000, 1, _pcm([0.3, 0.4]))))
+        self.assertEqual(buffer.dropped_packets, 2)
+        self.assertEqual(buffer.frames, 4)
+
+        # A third 4-byte chunk exceeds the 8-byte cap, so the oldest is dropped.
+        buffer.append(*decode_frame(encode_stream_packet(1, 4, 0, 16000, 1, _pcm([0.5, 0.6]))))
+        self.assertEqual((buffer.frames, buffer.trimmed_frames), (4, 2))
+        np.testing.assert_allclose(buffer.to_waveform(), [[0.3, 0.4, 0.5, 0.6]], atol=1e-4)
+
+        # A single chunk larger than the cap is still kept.
+        buffer.append(*decode_frame(encode_stream_packet(1, 5, 0, 16000, 1, _pcm([0.0] * 8))))
+        self.assertEqual(buffer.frames, 8)
+        self.assertEqual(buffer.to_waveform().shape, (1, 8))
+
+
+    def test_clip_frame_roundtrip(self):
+        data = b"\x1aE\xdf\xa3" + bytes(range(64))
+        frame = encode_clip_frame(42, 48000, 2, 1_250_000, data)
+        self.assertTrue(is_audio_frame(frame))
+        self.assertEqual(len(frame), CLIP_HEADER_SIZE + len(data))
+        header, payload = decode_frame(frame)
+        self.assertEqual(header.frame_type, FRAME_CLIP)
+        clip = AudioClip.from_frame(header, payload)
+        self.assertEqual(
+            (clip.clip_id, clip.sample_rate, clip.channels, clip.duration_us, clip.data, clip.container),
+            (42, 48000, 2, 1_250_000, data, "webm"),
+        )
+
+        with self.assertRaises(AudioProtocolError):
+            encode_clip_frame(1, 48000, 2, 0, data, codec=CODEC_PCM16)
+        with self.assertRaises(AudioProtocolError):
+            AudioClip.from_frame(*decode_frame(encode_clip_frame(1, 48000, 2, 0, b"")))
+        with self.assertRaises(AudioProtocolError):
+            encode_frame(FRAME_CLIP, data, CODEC_WEBM_OPUS, 48000, 2)
+        with self.assertRaises(AudioProtocolError):
+            AudioClip.from_frame(*decode_frame(encode_stream_packet(1, 0, 0, 48000, 1, b"\x00\x00")))
+
+    def test_clip_frames_are_not_misread_as_version_one(self):
+        frame = encode_clip_frame(42, 48000, 2, 1_250_000, b"webm")
+        # A version-1 decoder checks the version byte and rejects clip frames.
+        magic, version = struct.unpack_from(">4sB", frame, 0)
+        self.assertEqual(magic, MAGIC)
+        self.assertNotEqual(version, VERSION)
+
+        # An old-style clip (version 1, ids in the stream fields) is rejected too.
+        legacy = struct.pack(HEADER_FORMAT, MAGIC, VERSION, FRAME_CLIP, CODEC_WEBM_OPUS, 0, 2, 48000, 42, 0, 1_250_000)
+        with self.assertRaises(AudioProtocolError):
+            decode_frame(legacy + b"webm")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for the vectorized frequency-band analysis engine."""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nodes.utils.band_analysis import (  # noqa: E402
+    band_edges,
+    band_means,
+    edge_band_table,
+    range_band_table,
+    split_band_table,
+)
+
+
+def _reference_split(spectrum, sample_rate, low_freq_max, mid_freq_max):
+    freq_bins = len(spectrum)
+    freq_per_bin = (sample_rate / 2) / freq_bins
+    low_end = min(max(1, int(low_freq_max / freq_per_bin)), freq_bins)
+    mid_end = min(max(low_end + 1, int(mid_freq_max / freq_per_bin)), freq_bins)
+    low = sum(spectrum[:low_end]) / low_end
+    mid = sum(spectrum[low_end:mid_end]) / (mid_end - low_end) if mid_end > low_end else 0.0
+    high = sum(spectrum[mid_end:]) / (freq_bins - mid_end) if freq_bins > mid_end else 0.0
+    return [low, mid, high]
+
+
+def _reference_range(spectrum, sample_rate, freq_min, freq_max):
+    if freq_min > freq_max:
+        freq_min, freq_max = freq_max, freq_min
+    freq_per_bin = (sample_rate / 2) / len(spectrum)
+    bin_min = max(0, int(freq_min / freq_per_bin))
+    bin_max = min(len(spectrum) - 1, int(freq_max / freq_per_bin))
+    if bin_min >= bin_max:
+        return 0.0
+    band = spectrum[bin_min:bin_max + 1]
+    return sum(band) / len(band)
+
+
+class TestBandAnalysis(unittest.TestCase):
+    def test_split_bands_match_reference(self):
+        rng = np.random.default_rng(0)
+        for n_bins in (1, 2, 16, 128, 1024):
+            spectrum = rng.random(n_bins).tolist()
+            for sample_rate, low, mid in ((48000, 200, 5000), (16000, 1000, 10000), (24000, 50, 1000)):
+                table = split_band_table(sample_rate, n_bins, (low, mid))
+                np.testing.assert_allclose(
+                    band_means(spectrum, table), _reference_split(spectrum, sample_rate, low, mid), rtol=1e-12
+                )
+
+    def test_range_bands_match_reference(self):
+        spectrum = np.linspace(0.0, 1.0, 256)
+        ranges = ((200, 500), (500, 200), (20, 30), (10000, 20000), (0, 24000))
+        table = range_band_table(48000, 256, ranges)
+        expected = [_reference_range(spectrum.tolist(), 48000, lo, hi) for lo, hi in ranges]
+        np.testing.assert_allclose(band_means(spectrum, table), expected, rtol=1e-12)
+        self.assertEqual(band_means(spectrum, table)[2], 0.0)
+
+    def test_tables_are_cached_and_read_only(self):
+        table = split_band_table(48000, 512, (200, 5000))
+        self.assertIs(split_band_table(48000, 512, (200, 5000)), table)
+        self.assertIsNot(split_band_table(48000, 256, (200, 5000)), table)
+        with self.assertRaises(ValueError):
+            table.starts[0] = 3
+        with self.assertRaises(ValueError):
+            band_means(np.zeros(256), table)
+
+    def test_band_layout_edges(self):
+        for layout in ("linear", "log", "mel", "bark"):
+            edges = band_edges(layout, 8, 20, 20000)
+            self.assertEqual(len(edges), 9)
+            self.assertAlmostEqual(edges[0], 20.0, places=6)
+            self.assertAlmostEqual(edges[-1], 20000.0, places=6)
+            self.assertTrue(all(b > a for a, b in zip(edges, edges[1:])), layout)
+        self.assertAlmostEqual(band_edges("log", 3, 10, 10000)[1], 100.0)
+        self.assertEqual(band_edges("custom", 0, 0, 0, "500, 60 250,60"), (60.0, 250.0, 500.0))
+        with self.assertRaises(ValueError):
+            band_edges("custom", 0, 0, 0, "100")
+
+    def test_edge_bands_reduce_every_band_in_one_pass(self):
+        spectrum = np.arange(512, dtype=np.float64)
+        edges = band_edges("log", 32, 20, 20000)
+        table = edge_band_table(48000, 512, edges)
+        self.assertIs(edge_band_table(48000, 512, edges), table)
+        volumes = band_means(spectrum, table)
+        self.assertEqual(len(volumes), 32)
+        # Narrow low bands reuse their nearest bin rather than dropping to 0.
+        self.assertTrue(np.all(table.counts >= 1))
+        self.assertTrue(np.all(np.diff(volumes) >= 0))
+        freq_per_bin = 24000 / 512
+        start, end = int(edges[20] / freq_per_bin), int(edges[21] / freq_per_bin)
+        self.assertAlmostEqual(volumes[20], spectrum[start:end].mean())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Tests for the beat tracking helpers."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nodes.utils.beat_tracking import (  # noqa: E402
+    SpectralFrameRing,
+    TempoEstimator,
+    analyze_beat_grid,
+    onset_envelope,
+    tempo_from_envelope,
+)
+
+
+def _pulse_onsets(bpm, seconds, fps=30.0, offset=0.13, seed=0):
+    """Onsets of a click track sampled by frames arriving at ``fps`` with timing jitter."""
+    rng = np.random.default_rng(seed)
+    period = 60.0 / bpm
+    for i in range(int(seconds * fps)):
+        t = i / fps + rng.normal(0.0, 0.002)
+        on_beat = ((t - offset) / period) % 1.0 < 1.0 / (fps * period)
+        yield (1.0 if on_beat else 0.0) + rng.random() * 0.1, t
+
+
+def _drum_track(bpm, seconds, sample_rate=44100, first_beat=0.37, seed=0):
+    """Kicks (with a click) on the beat and quiet high-passed hats on the off-beat."""
+    rng = np.random.default_rng(seed)
+    signal = (rng.standard_normal(int(seconds * sample_rate)) * 0.02).astype(np.float32)
+    beats = np.arange(first_beat, seconds, 60.0 / bpm)
+    kick_t = np.arange(int(0.15 * sample_rate)) / sample_rate
+    kick = (np.sin(2 * np.pi * 60 * kick_t) * np.exp(-kick_t * 30) * 0.8).astype(np.float32)
+    kick[:int(0.005 * sample_rate)] += (rng.standard_normal(int(0.005 * sample_rate)) * 0.4).astype(np.float32)
+    hat_length = int(0.03 * sample_rate)
+    for beat in beats:
+        start = int(beat * sample_rate)
+        segment = signal[start:start + len(kick)]
+        segment += kick[:len(segment)]
+        start = int((beat + 30.0 / bpm) * sample_rate)
+        segment = signal[start:start + hat_length]
+        segment += (np.diff(rng.standard_normal(len(segment) + 1)) * 0.08).astype(np.float32)
+    return signal, beats
+
+
+class TestSpectralFrameRing(unittest.TestCase):
+    def test_features_match_reference(self):
+        rng = np.random.default_rng(1)
+        ring = SpectralFrameRing(capacity=4)
+        previous = None
+        for _ in range(10):
+            spectrum = rng.random(64).tolist()
+            waveform = rng.standard_normal(32).tolist()
+            features = ring.push(spectrum, waveform, 12)
+            low = np.asarray(spectrum[:12])
+            self.assertAlmostEqual(features.low_energy, np.abs(low).sum())
+            self.assertAlmostEqual(features.spectral_std, np.std(spectrum))
+            self.assertAlmostEqual(features.rms, np.sqrt(np.mean(np.square(waveform))))
+            if previous is None:
+                self.assertFalse(features.has_previous)
+                self.assertEqual(features.flux, 0.0)
+            else:
+                self.assertTrue(features.has_previous)
+                self.assertAlmostEqual(features.flux, np.maximum(low - previous[0][:12], 0).sum())
+                self.assertAlmostEqual(features.prev_low_energy, np.abs(previous[0][:12]).sum())
+                self.assertAlmostEqual(features.prev_rms, previous[1])
+            previous = (np.asarray(spectrum), features.rms)
+        self.assertEqual(len(ring), 4)
+        np.testing.assert_array_equal(ring.latest(), spectrum)
+
+    def test_push_reuses_preallocated_rows(self):
+        ring = SpectralFrameRing(capacity=3)
+        ring.push(np.ones(16), np.ones(8), 4)
+        frames = ring._frames
+        for _ in range(7):
+            ring.push(np.ones(16), np.ones(8), 4)
+        self.assertIs(ring._frames, frames)
+        with self.assertRaises(ValueError):
+            ring.latest()[0] = 2.0
+
+    def test_gaps_and_shape_changes_drop_the_previous_row(self):
+        ring = SpectralFrameRing()
+        ring.push(np.ones(16), np.ones(8), 4)
+        ring.mark_gap()
+        self.assertFalse(ring.push(np.ones(16), np.ones(8), 4).has_previous)
+        self.assertTrue(ring.push(np.ones(16), np.ones(8), 4).has_previous)
+        self.assertFalse(ring.push(np.ones(32), np.ones(8), 4).has_previous)
+        self.assertFalse(ring.push(np.ones(32), np.ones(8), 6).has_previous)
+        self.assertEqual(len(ring), 1)
+
+
+class TestTempoEstimator(unittest.TestCase):
+    def test_tempo_and_phase_of_jittered_click_tracks(self):
+        for bpm in (70, 96, 120, 145, 160):
+            estimator = TempoEstimator()
+            for onset, t in _pulse_onsets(bpm, 8.0):
+                estimator.push(onset, 100.0 + t)
+            estimate = estimator.estimate(6.0, 60, 200, timestamp=100.0 + t)
+            self.assertAlmostEqual(estimate.bpm, bpm, delta=bpm * 0.02)
+            self.assertGreater(estimate.confidence, 0.3)
+            expected_phase = ((t - 0.13) * bpm / 60.0) % 1.0
+            error = abs(estimate.phase - expected_phase)
+            self.assertLess(min(error, 1.0 - error), 0.1, bpm)
+            half_beat = 30.0 / estimate.bpm
+            self.assertAlmostEqual(estimator.phase_at(100.0 + t + half_beat), (estimate.phase + 0.5) % 1.0)
+
+    def test_bpm_range_selects_the_metrical_level(self):
+        estimator = TempoEstimator()
+        for onset, t in _pulse_onsets(174, 8.0):
+            estimator.push(onset, t)
+        # The tempo prior prefers half time for fast tempos unless the range excludes it.
+        self.assertAlmostEqual(estimator.estimate(6.0, 60, 200).bpm, 87, delta=2.0)
+        self.assertAlmostEqual(estimator.estimate(6.0, 120, 200).bpm, 174, delta=3.5)
+
+    def test_envelope_ring_bins_onsets_on_a_fixed_grid(self):
+        estimator = TempoEstimator(frame_rate=8.0, history_seconds=1.0)
+        estimator.push(1.0, 0.0)
+        estimator.push(0.5, 0.5 / 8)
+        estimator.push(2.0, 3.25 / 8)
+        # Onsets are split linearly between the two cells around their timestamp.
+        np.testing.assert_array_equal(estimator.window(1.0), [1.25, 0.25, 0.0, 1.5])
+        for step in range(12):
+            estimator.push(float(step), (4 + step) / 8)
+        np.testing.assert_array_equal(estimator.window(0.5), [8.0, 9.0, 10.0, 11.0])
+        self.assertEqual(len(estimator), 8)
+        estimator.push(5.0, 100.0)
+        np.testing.assert_array_equal(estimator.window(1.0), [0.0] * 7 + [5.0])
+
+    def test_silence_and_short_windows_give_no_tempo(self):
+        self.assertEqual(tempo_from_envelope(np.zeros(400), 50.0, 60, 200).bpm, 0.0)
+        self.assertEqual(tempo_from_envelope(np.ones(20), 50.0, 60, 200).bpm, 0.0)
+        self.assertEqual(TempoEstimator().estimate(4.0, 60, 200).bpm, 0.0)
+
+    def test_estimate_runs_well_under_a_millisecond(self):
+        estimator = TempoEstimator()
+        for onset, t in _pulse_onsets(128, 10.0):
+            estimator.push(onset, t)
+        start = time.perf_counter()
+        for step in range(200):
+            estimator.push(0.0, 10.0 + step / 30.0)
+            estimator.estimate(10.0, 30, 300)
+        self.assertLess((time.perf_counter() - start) / 200, 1e-3)
+
+
+class TestBeatGrid(unittest.TestCase):
+    def test_beat_grid_follows_the_kicks(self):
+        for bpm in (95, 128.5, 174):
+            signal, beats = _drum_track(bpm, 60.0)
+            grid = analyze_beat_grid(signal, 44100, 60, 200)
+            self.assertAlmostEqual(grid.bpm, bpm, delta=bpm * 0.005)
+            self.assertGreater(grid.confidence, 0.5)
+            self.assertAlmostEqual(grid.duration, 60.0, places=3)
+            # The grid spans the whole track; between the first and last kick
+            # every beat is within one envelope frame (~12 ms) of a kick.
+            half_beat = 30.0 / bpm
+            inside = (grid.beat_times > beats[0] - half_beat) & (grid.beat_times < beats[-1] + half_beat)
+            detected = grid.beat_times[inside]
+            errors = np.abs(detected[:, None] - beats[None, :]).min(axis=1)
+            self.assertLess(errors.max(), 0.025, bpm)
+            self.assertEqual(len(detected), len(beats))
+
+    def test_silence_has_no_beats(self):
+        grid = analyze_beat_grid(np.zeros(44100 * 5, dtype=np.float32), 44100, 60, 200)
+        self.assertEqual((grid.bpm, len(grid.beat_times)), (0.0, 0))
+        envelope, frame_rate = onset_envelope(np.zeros(0), 22050)
+        self.assertEqual((len(envelope), frame_rate), (0, 22050 / 512))
+
+    def test_three_minute_track_is_analyzed_well_under_a_second(self):
+        signal, _ = _drum_track(122, 180.0)
+        start = time.perf_counter()
+        grid = analyze_beat_grid(signal, 44100, 60, 200)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertAlmostEqual(grid.bpm, 122, delta=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=1)
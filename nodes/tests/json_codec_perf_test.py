@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""JSON codec microbenchmark.
+
+Compares the stdlib ``json`` module with ``utils.json_codec`` (orjson/msgspec
+when installed) on payloads that mirror the WebSocket node hot paths and
+reports the per-message cost of each.
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils import json_codec  # noqa: E402
+
+
+def _build_payloads():
+    control = {"slider_1": 0.42, "toggle": True, "prompt": "a neon city at night", "xy": [0.1, 0.9]}
+    settings = {"settings": {"numberOfImages": 4, "imageDisplayDuration": 1000, "fadeAnimDuration": 200,
+                             "mixBlendMode": "none", "enableLoop": True, "bgColourPicker": "#222222",
+                             "filters": {"brightness": 1.0, "contrast": 1.1, "saturate": 0.9}}}
+    latent = {"samples": [[[[0.123456] * 64] * 64] * 4], "shape": [1, 4, 64, 64], "channels": 4}
+    audio = {"type": "vrch_audio_player_track", "audio": {"base64": base64.b64encode(os.urandom(256 * 1024)).decode("ascii"),
+                                                          "mime_type": "audio/webm", "duration_ms": 5000},
+             "playlist": {"display_name": "ComfyUI Audio", "autoplay_request": False}}
+    return {"control": control, "settings": settings, "latent": latent, "audio": audio}
+
+
+def _time_us(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return round(statistics.median(samples), 2)
+
+
+def _run(iterations):
+    results = {}
+    for name, payload in _build_payloads().items():
+        text = json.dumps(payload)
+        encoded = text.encode("utf-8")
+        stdlib = {
+            "dumps_us": _time_us(lambda: json.dumps(payload), iterations),
+            "loads_us": _time_us(lambda: json.loads(encoded), iterations),
+            "copy_us": _time_us(lambda: json.loads(json.dumps(payload)), iterations),
+        }
+        codec = {
+            "dumps_us": _time_us(lambda: json_codec.dumps(payload), iterations),
+            "loads_us": _time_us(lambda: json_codec.loads(encoded), iterations),
+            "copy_us": _time_us(lambda: json_codec.copy(payload), iterations),
+        }
+        results[name] = {
+            "bytes": len(encoded),
+            "stdlib": stdlib,
+            "codec": codec,
+            "speedup": {key: round(stdlib[key] / codec[key], 2) if codec[key] else None for key in stdlib},
+        }
+    return {"backend": json_codec.BACKEND, "iterations": iterations, "payloads": results}
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="JSON codec microbenchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output-json", type=Path, default=None)
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    payload = _run(max(1, args.iterations))
+    print(json.dumps(payload, indent=2))
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
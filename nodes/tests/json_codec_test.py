@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for the JSON codec used on WebSocket hot paths."""
+
+import importlib
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nodes.utils import json_codec  # noqa: E402
+
+
+def _load_codec_without(*modules):
+    blocked = {name: None for name in modules}
+    with mock.patch.dict(sys.modules, blocked):
+        sys.modules.pop("nodes.utils.json_codec", None)
+        codec = importlib.import_module("nodes.utils.json_codec")
+    sys.modules["nodes.utils.json_codec"] = json_codec
+    return codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    def _check_codec(self, codec):
+        payload = {"a": 1, "b": [1.5, "x", None, True], "c": {"d": "é"}}
+        text = codec.dumps(payload)
+        self.assertIsInstance(text, str)
+        self.assertEqual(codec.loads(text), payload)
+        self.assertEqual(codec.loads(text.encode("utf-8")), payload)
+        self.assertEqual(codec.loads(memoryview(text.encode("utf-8"))), payload)
+
+        copied = codec.copy(payload)
+        self.assertEqual(copied, payload)
+        self.assertIsNot(copied["c"], payload["c"])
+
+        for invalid in ("not-json", b"\xff\xfe", None):
+            with self.assertRaises(codec.DECODE_ERRORS):
+                codec.loads(invalid)
+
+        # Integers wider than 64 bits still serialize.
+        self.assertEqual(codec.loads(codec.dumps({"big": 2 ** 70}))["big"], 2 ** 70)
+
+    def test_backends_produce_identical_text(self):
+        payload = {
+            "a": 1,
+            "b": [1.5, "x", None, True],
+            "c": {"d": "é"},
+            "arr": np.arange(3, dtype=np.int32),
+            "mat": np.ones((2, 2), dtype=np.float32),
+            "scalar": np.float64(0.25),
+            "flag": np.bool_(True),
+        }
+        expected = '{"a":1,"b":[1.5,"x",null,true],"c":{"d":"é"},"arr":[0,1,2],' \
+                   '"mat":[[1.0,1.0],[1.0,1.0]],"scalar":0.25,"flag":true}'
+        codecs = [json_codec, _load_codec_without("orjson", "msgspec")]
+        if json_codec.BACKEND == "orjson":
+            codecs.append(_load_codec_without("orjson"))
+        for codec in codecs:
+            with self.subTest(backend=codec.BACKEND):
+                self.assertEqual(codec.dumps(payload), expected)
+                # Payloads a fast backend rejects fall back to the stdlib with the same format.
+                self.assertEqual(codec.dumps({"n": np.int64(7), "big": 2 ** 70}), '{"n":7,"big":1180591620717411303424}')
+
+    def test_active_backend(self):
+        self.assertIn(json_codec.BACKEND, ("orjson", "msgspec", "json"))
+        self._check_codec(json_codec)
+
+    def test_stdlib_fallback(self):
+        codec = _load_codec_without("orjson", "msgspec")
+        self.assertEqual(codec.BACKEND, "json")
+        self._check_codec(codec)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=1)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for VRCH microphone WebSocket binary protocol."""
+
+import struct
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nodes.mic_websocket_protocol import (  # noqa: E402
+    DTYPE_FLOAT32,
+    DTYPE_UINT8,
+    HEADER_SIZE,
+    MicProtocolError,
+    decode_mic_frame,
+    encode_mic_frame,
+    is_mic_frame,
+)
+
+
+class TestMicWebSocketProtocol(unittest.TestCase):
+    def test_float32_frame_is_read_without_copy(self):
+        waveform = np.linspace(-1.0, 1.0, 128, dtype=np.float32)
+        spectrum = np.linspace(0.0, 1.0, 64, dtype=np.float32)
+        data = encode_mic_frame(waveform, spectrum, 48000, volume=0.25, is_active=True, rms=0.1, zcr=0.2, peak=0.9)
+        self.assertEqual(len(data), HEADER_SIZE + (128 + 64) * 4)
+        self.assertTrue(is_mic_frame(data))
+        self.assertFalse(is_mic_frame(b'{"waveform": []}'))
+
+        frame = decode_mic_frame(data)
+        self.assertEqual((frame.sample_rate, frame.is_active, frame.dtype), (48000, True, DTYPE_FLOAT32))
+        self.assertAlmostEqual(frame.volume, 0.25)
+        self.assertAlmostEqual(frame.peak, 0.9, places=6)
+        np.testing.assert_array_equal(frame.waveform, waveform)
+        np.testing.assert_array_equal(frame.spectrum, spectrum)
+        # float32 arrays are views of the received buffer.
+        self.assertIs(frame.spectrum.base, data)
+        self.assertEqual(frame.to_dict()["sr"], 48000)
+
+    def test_uint8_frame_matches_widget_scaling(self):
+        data = encode_mic_frame([0, 128, 255], [0, 51, 255], 16000, dtype=DTYPE_UINT8)
+        self.assertEqual(len(data), HEADER_SIZE + 6)
+        frame = decode_mic_frame(data)
+        np.testing.assert_allclose(frame.waveform, [-1.0, 0.0, 127 / 128])
+        np.testing.assert_allclose(frame.spectrum, [0.0, 0.2, 1.0])
+        self.assertFalse(frame.is_active)
+
+    def test_invalid_frames_raise(self):
+        data = encode_mic_frame(np.zeros(8), np.zeros(8), 48000)
+        with self.assertRaises(MicProtocolError):
+            decode_mic_frame(data[:-4])
+        with self.assertRaises(MicProtocolError):
+            decode_mic_frame(data[:HEADER_SIZE - 1])
+        bad_dtype = data[:5] + struct.pack(">B", 9) + data[6:]
+        with self.assertRaises(MicProtocolError):
+            decode_mic_frame(bad_dtype)
+        with self.assertRaises(MicProtocolError):
+            encode_mic_frame([0.0], [0.0], 48000, dtype=9)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=1)
@@ -134,6 +134,35 @@ class TestMidiWebSocketProtocol(unittest.TestCase):
         self.assertEqual(values, list(range(1, 9)))
         self.assertLess(elapsed_ms, 15.0)
 
+    def test_apply_defers_snapshot_and_keeps_arrival_time(self):
+        parser = MidiStateParser(debug=False)
+        definition = encode_definition_frame([{"key": "brightness", "number": 22}], definition_seq=1, seq=1)
+        self.assertTrue(parser.apply(definition, received_at=1000.0))
+        self.assertFalse(parser.apply("text"))
+        first = parser.snapshot()
+        self.assertTrue(first["definition_ready"])
+        self.assertEqual(first["received_at"], 1000.0)
+
+        # Reads between frames share one read-only snapshot, nested maps included.
+        self.assertIs(parser.snapshot(), first)
+        self.assertIsInstance(first["index_by_key"], dict)
+        with self.assertRaises(TypeError):
+            first["definition_ready"] = False
+        with self.assertRaises(TypeError):
+            first["index_by_key"]["brightness"] = 99
+
+        state = encode_state_frame(control_values=[{"control_index": 0, "value": 64}], definition_seq=1, seq=2)
+        self.assertTrue(parser.apply(state, received_at=1001.0))
+        second = parser.snapshot()
+        self.assertIsNot(second, first)
+        self.assertEqual(second["values_by_index"], {0: 64})
+        self.assertEqual(second["received_at"], 1001.0)
+        self.assertEqual(first["values_by_index"], {})
+        self.assertEqual(json.loads(json.dumps(second))["values_by_index"], {"0": 64})
+
+        # A truncated frame that fails part-way still invalidates the cache.
+        self.assertFalse(parser.apply(state[:-2], received_at=1002.0))
+        self.assertIsNot(parser.snapshot(), second)
 
 if __name__ == "__main__":
     unittest.main(verbosity=1)
@@ -6,6 +6,7 @@ This suite validates helper handlers and node/client integration behavior.
 
 import asyncio
 import base64
+import gc
 import io
 import json
 import socket
@@ -13,6 +14,7 @@ import struct
 import sys
 import tempfile
 import time
+import tracemalloc
 import unittest
 from pathlib import Path
 
@@ -48,6 +50,81 @@ class TestWebSocketNodesUnit(unittest.TestCase):
         # clear key should reset state.
         self.assertEqual(merger('{"__clear__": true, "z":9}'), {"z": 9})
 
+    def test_01b_json_state_merger_snapshot_is_versioned(self):
+        merger = ws_nodes.JsonStateMerger(max_keys=4, clear_key="__clear__", debug=False)
+        self.assertIsNone(merger.snapshot())
+        self.assertFalse(merger.apply("not-json"))
+        self.assertEqual(merger.version, 0)
+
+        self.assertTrue(merger.apply('{"a":1,"b":2}'))
+        first = merger.snapshot()
+        self.assertEqual(first, {"a": 1, "b": 2})
+        # Unchanged values and invalid payloads do not bump the version.
+        self.assertFalse(merger.apply('{"a":1}'))
+        self.assertFalse(merger.apply("[1, 2]"))
+        self.assertEqual(merger.version, 1)
+
+        # One read-only snapshot per version is shared by every reader.
+        self.assertIs(merger.snapshot(), first)
+        self.assertIsInstance(first, dict)
+        with self.assertRaises(TypeError):
+            first["a"] = 100
+        with self.assertRaises(TypeError):
+            first.update({"c": 3})
+
+        self.assertTrue(merger.apply('{"b":3,"c":{"d":[1,2]}}'))
+        second = merger.snapshot()
+        self.assertIsNot(second, first)
+        self.assertEqual(second, {"a": 1, "b": 3, "c": {"d": [1, 2]}})
+        # Nested values are read-only too, and earlier snapshots are not
+        # touched by later merges.
+        with self.assertRaises(TypeError):
+            second["c"]["d"].append(3)
+        self.assertEqual(first, {"a": 1, "b": 2})
+        self.assertEqual(merger.version, 2)
+        self.assertEqual(json.loads(ws_nodes.json_codec.dumps(second)), second)
+
+        # Unchanged keys keep their frozen value across versions.
+        self.assertTrue(merger.apply('{"a":5}'))
+        third = merger.snapshot()
+        self.assertIs(third["c"], second["c"])
+        self.assertEqual(third, {"a": 5, "b": 3, "c": {"d": [1, 2]}})
+
+    def test_01c_incremental_client_applies_pending_messages_on_read(self):
+        merger = ws_nodes.JsonStateMerger(max_keys=8, clear_key="__clear__", debug=False)
+        applied = []
+        original_apply = merger.apply
+
+        def counting_apply(message, received_at=None):
+            applied.append(message)
+            return original_apply(message, received_at=received_at)
+
+        merger.apply = counting_apply
+
+        client = ws_nodes.WebSocketClient.__new__(ws_nodes.WebSocketClient)
+        client.path = "/json"
+        client.latest_only = False
+        client.incremental = True
+        client.data_handler = merger
+        client.received_data = None
+        client.received_sequence = 0
+        client.lock = ws_nodes.threading.Lock()
+        client._apply_lock = ws_nodes.threading.Lock()
+        client._pending_messages = ws_nodes.deque()
+
+        for value in range(5):
+            client._queue_pending_message(json.dumps({"a": value, f"k{value}": True}))
+        self.assertEqual(applied, [])
+
+        data, sequence = client.get_latest_data_with_sequence()
+        self.assertEqual(len(applied), 5)
+        self.assertEqual(data["a"], 4)
+        self.assertTrue(all(data[f"k{value}"] for value in range(5)))
+        self.assertEqual(sequence, 5)
+        # A second read applies nothing new and returns an equal state.
+        self.assertEqual(client.get_latest_data_with_sequence(), (data, 5))
+        self.assertEqual(len(applied), 5)
+
     def test_02_audio_data_handler(self):
         valid = json.dumps({"base64_data": "abc", "meta": 1})
         self.assertEqual(ws_nodes.audio_data_handler(valid), {"base64_data": "abc", "meta": 1})
@@ -117,6 +194,16 @@ class TestWebSocketNodesUnit(unittest.TestCase):
 
     def test_06_default_websocket_paths_include_midi(self):
         self.assertIn("/midi", ws_nodes.DEFAULT_WEBSOCKET_PATHS)
+        self.assertIn("/mic", ws_nodes.DEFAULT_WEBSOCKET_PATHS)
+
+    def test_06b_mic_frame_handler_decodes_binary_frames(self):
+        from nodes.mic_websocket_protocol import DTYPE_UINT8, encode_mic_frame
+
+        frame = ws_nodes.mic_frame_handler(encode_mic_frame([128, 255], [0, 255], 48000, volume=0.5, dtype=DTYPE_UINT8))
+        self.assertEqual(frame.sample_rate, 48000)
+        np.testing.assert_allclose(frame.spectrum, [0.0, 1.0])
+        self.assertIsNone(ws_nodes.mic_frame_handler(b"VMIC-truncated"))
+        self.assertIsNone(ws_nodes.mic_frame_handler('{"waveform": []}'))
 
     def test_07_audio_sender_quality_presets(self):
         self.assertEqual(ws_nodes._normalize_audio_quality("compact"), ("compact", 64))
@@ -153,6 +240,149 @@ class TestWebSocketNodesUnit(unittest.TestCase):
         self.assertTrue(payload["playlist"]["filename"].endswith(".webm"))
         self.assertTrue(payload["playlist"]["autoplay_request"])
 
+    def test_08b_audio_stream_sender_and_loader(self):
+        sent = []
+
+        class FakeServer:
+            def send_to_channel(self, path, channel, data):
+                sent.append((path, channel, data))
+
+        original_get_server = ws_nodes.get_global_server
+        self.addCleanup(lambda: setattr(ws_nodes, "get_global_server", original_get_server))
+        ws_nodes.get_global_server = lambda *args, **kwargs: FakeServer()
+
+        waveform = torch.linspace(-0.5, 0.5, 2500).reshape(1, 1, 2500)
+        audio = {"waveform": waveform, "sample_rate": 10000}
+        sender = ws_nodes.VrchAudioWebSocketSenderNode()
+        _, payload = sender.send_audio(
+            audio=audio, channel="2", server="127.0.0.1:8001", title="Stream", autoplay_request=False,
+            quality="standard", debug=False, transport="stream", stream_packet_ms=100,
+        )
+        self.assertEqual(payload["type"], "vrch_audio_stream")
+        self.assertEqual(payload["packets"], 3)
+        self.assertEqual([(path, channel) for path, channel, _ in sent], [("/audio", 2)] * 3)
+
+        handler = ws_nodes.make_audio_handler()
+        first = handler(sent[0][2])
+
+        class FakeClient:
+            sequence = 1
+
+            def get_latest_data_with_sequence(self):
+                return first, self.sequence
+
+        fake_client = FakeClient()
+        original_get_client = ws_nodes.get_websocket_client
+        self.addCleanup(lambda: setattr(ws_nodes, "get_websocket_client", original_get_client))
+        ws_nodes.get_websocket_client = lambda *args, **kwargs: fake_client
+
+        loader = ws_nodes.VrchAudioWebSocketChannelLoaderNode()
+        (partial,) = loader.receive_audio(channel="2", server="127.0.0.1:8001")
+        # Playback can start after the first packet.
+        # Mono streams are expanded to stereo, like decoded clips and tracks.
+        self.assertEqual(tuple(partial["waveform"].shape), (1, 2, 1000))
+        self.assertEqual(partial["sample_rate"], 10000)
+
+        for _, _, packet in sent[1:]:
+            handler(packet)
+            fake_client.sequence += 1
+        (complete,) = loader.receive_audio(channel="2", server="127.0.0.1:8001")
+        self.assertEqual(tuple(complete["waveform"].shape), (1, 2, 2500))
+        torch.testing.assert_close(complete["waveform"], waveform.repeat(1, 2, 1), atol=1e-4, rtol=0)
+        self.assertIsNone(handler(b"VAUD-not-a-frame"))
+
+    def test_08d_audio_clip_transport_sends_raw_container_bytes(self):
+        sent = []
+
+        class FakeServer:
+            def send_to_channel(self, path, channel, data):
+                sent.append((path, channel, data))
+
+        webm_bytes = b"\x1aE\xdf\xa3fake-webm"
+        originals = (ws_nodes.get_global_server, ws_nodes._encode_pcm16_to_webm_opus, ws_nodes.decode_audio_bytes)
+        self.addCleanup(
+            lambda: (
+                setattr(ws_nodes, "get_global_server", originals[0]),
+                setattr(ws_nodes, "_encode_pcm16_to_webm_opus", originals[1]),
+                setattr(ws_nodes, "decode_audio_bytes", originals[2]),
+            )
+        )
+        ws_nodes.get_global_server = lambda *args, **kwargs: FakeServer()
+        ws_nodes._encode_pcm16_to_webm_opus = lambda *args: (webm_bytes, "libopus")
+
+        audio = {"waveform": torch.zeros(1, 2, 4800), "sample_rate": 48000}
+        _, payload = ws_nodes.VrchAudioWebSocketSenderNode().send_audio(
+            audio=audio, channel="3", server="127.0.0.1:8001", title="Clip", autoplay_request=True,
+            quality="standard", debug=False, transport="clip",
+        )
+        self.assertEqual((payload["type"], payload["transport"]), ("vrch_audio_player_track", "clip"))
+        self.assertNotIn("base64", payload["audio"])
+        self.assertEqual(payload["audio"]["size_bytes"], len(webm_bytes))
+        (path, channel, frame), = sent
+        self.assertEqual((path, channel, len(frame)), ("/audio", 3, 25 + len(webm_bytes)))
+
+        clip = ws_nodes.make_audio_handler()(frame)
+        self.assertIsInstance(clip, ws_nodes.AudioClip)
+        self.assertEqual(
+            (clip.clip_id, clip.sample_rate, clip.channels, clip.duration_us, clip.data, clip.container),
+            (payload["clip_id"], 48000, 2, 100_000, webm_bytes, "webm"),
+        )
+        self.assertIsInstance(ws_nodes.audio_data_handler(frame), ws_nodes.AudioClip)
+        # JSON recordings keep working alongside binary clips.
+        self.assertEqual(ws_nodes.audio_data_handler(json.dumps({"base64_data": "eA=="}))["base64_data"], "eA==")
+
+        decoded = []
+
+        def fake_decode(data, container="webm"):
+            decoded.append((data, container))
+            return torch.zeros(1, 10), 48000
+
+        ws_nodes.decode_audio_bytes = fake_decode
+        result = ws_nodes.VrchAudioWebSocketChannelLoaderNode()._audio_from_payload(clip)
+        self.assertEqual(decoded, [(webm_bytes, "webm")])
+        self.assertEqual((tuple(result["waveform"].shape), result["sample_rate"]), ((1, 2, 10), 48000))
+
+    def test_08c_audio_loader_reuses_decoded_audio_until_sequence_changes(self):
+        class FakeClient:
+            payload = None
+            sequence = 0
+
+            def get_latest_data_with_sequence(self):
+                return self.payload, self.sequence
+
+        fake_client = FakeClient()
+        original_get_client = ws_nodes.get_websocket_client
+        self.addCleanup(lambda: setattr(ws_nodes, "get_websocket_client", original_get_client))
+        ws_nodes.get_websocket_client = lambda *args, **kwargs: fake_client
+
+        decoded = []
+
+        def fake_decode(base64_data, debug=False):
+            decoded.append(base64_data)
+            return {"waveform": torch.zeros(1, 2, 8), "sample_rate": 8000}
+
+        loader = ws_nodes.VrchAudioWebSocketChannelLoaderNode()
+        loader._decode_base64_audio = fake_decode
+        default_audio = {"waveform": torch.ones(1, 2, 4), "sample_rate": 4000}
+
+        (audio,) = loader.receive_audio(channel="1", server="127.0.0.1:8001", default_audio=default_audio)
+        self.assertIs(audio, default_audio)
+
+        fake_client.payload, fake_client.sequence = {"base64_data": "Zmlyc3Q="}, 1
+        (first,) = loader.receive_audio(channel="1", server="127.0.0.1:8001")
+        (again,) = loader.receive_audio(channel="1", server="127.0.0.1:8001")
+        self.assertIs(again, first)
+        self.assertEqual(decoded, ["Zmlyc3Q="])
+
+        fake_client.payload, fake_client.sequence = {"base64_data": "c2Vjb25k"}, 2
+        (second,) = loader.receive_audio(channel="1", server="127.0.0.1:8001")
+        self.assertIsNot(second, first)
+        self.assertEqual(decoded, ["Zmlyc3Q=", "c2Vjb25k"])
+
+        # Targets are cached independently.
+        loader.receive_audio(channel="2", server="127.0.0.1:8001")
+        self.assertEqual(len(decoded), 3)
+
     def test_09_image_loader_prefers_websocket_image_over_default_image(self):
         received_image = torch.ones((1, 2, 2, 3), dtype=torch.float32)
 
@@ -294,6 +524,375 @@ class TestWebSocketNodesUnit(unittest.TestCase):
         self.assertEqual(sequence, 2)
         self.assertEqual(decoded_payloads, [second])
 
+    def test_14_image_renditions_encoded_once_per_rung(self):
+        img = Image.new("RGB", (64, 32), color=(0, 128, 255))
+
+        renditions = ws_nodes._encode_image_renditions(img, "PNG", "full+half+quarter")
+        self.assertEqual(len(renditions), 3)
+        sizes = [Image.open(io.BytesIO(payload)).size for payload in renditions]
+        self.assertEqual(sizes, [(64, 32), (32, 16), (16, 8)])
+
+        self.assertEqual(len(ws_nodes._encode_image_renditions(img, "PNG", "off")), 1)
+
+    def test_15_simple_viewer_sends_rendition_ladder(self):
+        sent = []
+
+        class FakeServer:
+            supports_renditions = True
+
+            def send_to_channel(self, path, channel, data):
+                sent.append(("single", path, channel, data))
+
+            def send_renditions_to_channel(self, path, channel, renditions):
+                sent.append(("ladder", path, channel, renditions))
+
+        class FakeProxy(FakeServer):
+            supports_renditions = False
+
+        ladders = []
+        original_encode = ws_nodes._encode_image_renditions
+
+        def recording_encode(img, format, ladder="off"):
+            ladders.append(ladder)
+            return original_encode(img, format, ladder)
+
+        original_get_server = ws_nodes.get_global_server
+        self.addCleanup(lambda: setattr(ws_nodes, "get_global_server", original_get_server))
+        self.addCleanup(lambda: setattr(ws_nodes, "_encode_image_renditions", original_encode))
+        ws_nodes._encode_image_renditions = recording_encode
+
+        def send(server):
+            ws_nodes.get_global_server = lambda *args, **kwargs: server
+            node = ws_nodes.VrchImageWebSocketSimpleWebViewerNode()
+            node.send_images(
+                images=torch.zeros((1, 8, 8, 3), dtype=torch.float32),
+                channel="1",
+                server="127.0.0.1:8001",
+                format="PNG",
+                number_of_images=1,
+                image_display_duration=50,
+                fade_anim_duration=10,
+                window_width=512,
+                window_height=512,
+                show_url=False,
+                dev_mode=False,
+                debug=False,
+                extra_params="",
+                url="",
+                rendition_ladder="full+half",
+            )
+
+        send(FakeServer())
+        self.assertEqual(len(sent), 1)
+        kind, path, channel, renditions = sent[0]
+        self.assertEqual((kind, path, channel), ("ladder", "/image", 1))
+        self.assertEqual(len(renditions), 2)
+        for payload in renditions:
+            self.assertEqual(payload[:8], renditions[0][:8])
+
+        # A proxy forwards only the full-size frame, so only that one is encoded.
+        send(FakeProxy())
+        self.assertEqual(ladders, ["full+half", "off"])
+        self.assertEqual(sent[1][:3], ("single", "/image", 1))
+        self.assertEqual(sent[1][3][8:], renditions[0][8:])
+
+    def test_16_latency_trace_header_round_trip(self):
+        from nodes.utils.websocket_server import monotonic_us, pack_image_header
+
+        buf = io.BytesIO()
+        Image.new("RGB", (4, 4), color=(255, 0, 0)).save(buf, format="PNG")
+        header = pack_image_header(3, 0, 1, sequence=99, timestamp_us=monotonic_us() - 2000)
+        message = header + buf.getvalue()
+
+        tensor = ws_nodes.image_data_handler(message)
+        self.assertEqual(tuple(tensor.shape), (1, 4, 4, 3))
+        self.assertEqual(tensor._metadata["raw_type"], 2)
+        self.assertEqual(tensor._metadata["batch_id"], 3)
+        self.assertEqual(tensor._metadata["sequence"], 99)
+
+        client = ws_nodes.WebSocketClient.__new__(ws_nodes.WebSocketClient)
+        client.path = "/image"
+        client._latency_stats = {"receive": ws_nodes.LatencyStats(), "decode": ws_nodes.LatencyStats()}
+        client._trace_latency("receive", message)
+        client._trace_latency("decode", struct.pack(">II", 1, 0) + buf.getvalue())
+        stats = client.get_latency_stats()
+        self.assertEqual(stats["receive"]["count"], 1)
+        self.assertGreaterEqual(stats["receive"]["last_ms"], 2.0)
+        self.assertEqual(stats["decode"]["count"], 0)
+
+    def test_17_websocket_client_decode_on_receive_returns_ready_frame(self):
+        decoded_payloads = []
+
+        def handler(message):
+            time.sleep(0.05)
+            decoded_payloads.append(message)
+            return message[8:]
+
+        client = ws_nodes.WebSocketClient.__new__(ws_nodes.WebSocketClient)
+        client.path = "/image"
+        client.debug = False
+        client.received_data = None
+        client.received_sequence = 0
+        client.received_raw_data = None
+        client.decoded_sequence = 0
+        client.latest_only = True
+        client.eager_decode = True
+        client.data_handler = handler
+        client.lock = ws_nodes.threading.Lock()
+        client._decode_future = None
+        client._decode_future_sequence = 0
+
+        frames = [struct.pack(">II", 1, index) + f"frame{index}".encode() for index in range(6)]
+        for frame in frames:
+            client._store_latest_message(frame)
+
+        data, sequence = client.get_latest_data_with_sequence()
+        self.assertEqual((data, sequence), (b"frame5", 6))
+        self.assertIn(frames[-1], decoded_payloads)
+        # Stale frames are cancelled or skipped, so not every frame is decoded.
+        self.assertLess(len(decoded_payloads), len(frames))
+
+        decode_count = len(decoded_payloads)
+        self.assertEqual(client.get_latest_data_with_sequence(), (b"frame5", 6))
+        self.assertEqual(len(decoded_payloads), decode_count)
+
+    def test_18_image_buffer_pool_recycles_released_frames(self):
+        pool = ws_nodes.ImageBufferPool(max_per_shape=2)
+        first = pool.acquire((4, 4, 3))
+        held = torch.from_numpy(first)[None,]
+        held_ptr = held.data_ptr()
+        del first
+        gc.collect()
+
+        # A live tensor keeps its lease, so the buffer behind it is never reused.
+        second = pool.acquire((4, 4, 3))
+        self.assertNotEqual(second.ctypes.data, held_ptr)
+        view = held[0, 1:]
+        del held
+        gc.collect()
+        third = pool.acquire((4, 4, 3))
+        self.assertNotEqual(third.ctypes.data, held_ptr)
+
+        # Once every tensor view is gone the buffer returns to the pool.
+        del view
+        gc.collect()
+        fourth = pool.acquire((4, 4, 3))
+        self.assertEqual(fourth.ctypes.data, held_ptr)
+        del second, third, fourth
+        gc.collect()
+        self.assertEqual(len(pool._free[(4, 4, 3)]), 2)
+
+        img = Image.new("RGB", (3, 2), color=(10, 128, 255))
+        expected = np.array(img).astype(np.float32) / 255.0
+        np.testing.assert_array_equal(ws_nodes._image_to_float_array(img), expected)
+
+    def test_19_image_loader_normalizes_uint8_frames(self):
+        img = Image.new("RGB", (3, 2), color=(0, 51, 255))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        payload = struct.pack(">II", 1, 1) + buf.getvalue()
+
+        raw = ws_nodes.image_uint8_data_handler(payload)
+        self.assertEqual(raw.dtype, torch.uint8)
+        self.assertEqual(raw._metadata["frame_total"], 1)
+
+        handlers = []
+
+        class FakeClient:
+            def get_latest_data_with_sequence(self):
+                return raw, 1
+
+        def fake_get_client(*args, **kwargs):
+            handlers.append(kwargs["data_handler"])
+            return FakeClient()
+
+        original_get_client = ws_nodes.get_websocket_client
+        self.addCleanup(lambda: setattr(ws_nodes, "get_websocket_client", original_get_client))
+        ws_nodes.get_websocket_client = fake_get_client
+
+        node = ws_nodes.VrchImageWebSocketChannelLoaderNode()
+        image, _ = node.receive_image("1", "127.0.0.1:8001", "black", False, normalize_on_device=True)
+
+        device = ws_nodes.VrchImageWebSocketChannelLoaderNode._normalize_device()
+        expected_handler = ws_nodes.image_uint8_data_handler if device is not None else ws_nodes.image_data_handler
+        self.assertIs(handlers[0], expected_handler)
+        self.assertEqual(image.dtype, torch.float32)
+        torch.testing.assert_close(image.cpu(), ws_nodes.image_data_handler(payload))
+        self.assertEqual(image._metadata["source_sequence"], 1)
+
+    def test_19b_image_loader_device_selection_and_cache_key(self):
+        import types
+
+        calls = []
+        fake_mm = types.ModuleType("comfy.model_management")
+
+        def get_torch_device():
+            calls.append("get_torch_device")
+            raise RuntimeError("no device")
+
+        fake_mm.get_torch_device = get_torch_device
+        fake_mm.intermediate_device = lambda: calls.append("intermediate_device") or torch.device("cpu")
+        fake_comfy = types.ModuleType("comfy")
+        fake_comfy.model_management = fake_mm
+        saved = {name: sys.modules.get(name) for name in ("comfy", "comfy.model_management")}
+
+        def restore():
+            for name, module in saved.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+
+        self.addCleanup(restore)
+        sys.modules["comfy"] = fake_comfy
+        sys.modules["comfy.model_management"] = fake_mm
+        # ComfyUI's device wins; the intermediate device is the fallback and CPU means no upload.
+        self.assertIsNone(ws_nodes.VrchImageWebSocketChannelLoaderNode._normalize_device())
+        self.assertEqual(calls, ["get_torch_device", "intermediate_device"])
+        fake_mm.get_torch_device = lambda: "cuda:1"
+        self.assertEqual(ws_nodes.VrchImageWebSocketChannelLoaderNode._normalize_device(), torch.device("cuda:1"))
+
+        buf = io.BytesIO()
+        Image.new("RGB", (3, 2), color=(0, 51, 255)).save(buf, format="PNG")
+        payload = struct.pack(">II", 1, 1) + buf.getvalue()
+        decoded = {
+            ws_nodes.image_data_handler: ws_nodes.image_data_handler(payload),
+            ws_nodes.image_uint8_data_handler: ws_nodes.image_uint8_data_handler(payload),
+        }
+
+        class FakeClient:
+            handler = None
+
+            def get_latest_data_with_sequence(self):
+                return decoded[self.handler], 1
+
+        client = FakeClient()
+
+        def fake_get_client(*args, **kwargs):
+            client.handler = kwargs["data_handler"]
+            return client
+
+        original_get_client = ws_nodes.get_websocket_client
+        self.addCleanup(lambda: setattr(ws_nodes, "get_websocket_client", original_get_client))
+        ws_nodes.get_websocket_client = fake_get_client
+
+        node = ws_nodes.VrchImageWebSocketChannelLoaderNode()
+        node._normalize_device = lambda: torch.device("cpu")
+        on_device, _ = node.receive_image("1", "127.0.0.1:8001", "black", False, normalize_on_device=True)
+        host_image, _ = node.receive_image("1", "127.0.0.1:8001", "black", False, normalize_on_device=False)
+        # Same source sequence, but the cached copy for the other device/dtype is not reused.
+        self.assertIsNot(host_image, on_device)
+        self.assertIs(host_image, decoded[ws_nodes.image_data_handler])
+        again, _ = node.receive_image("1", "127.0.0.1:8001", "black", False, normalize_on_device=True)
+        self.assertIs(again, on_device)
+
+    def test_20_image_handler_decodes_from_buffer_view(self):
+        buf = io.BytesIO()
+        Image.new("RGB", (5, 3), color=(1, 2, 3)).save(buf, format="JPEG")
+        payload = bytearray(struct.pack(">II", 1, 1) + buf.getvalue())
+
+        tensor = ws_nodes.image_data_handler(payload)
+        expected = ws_nodes.image_data_handler(bytes(payload))
+        self.assertEqual(tuple(tensor.shape), (1, 3, 5, 3))
+        torch.testing.assert_close(tensor, expected)
+
+        # PIL reads the payload from the view in chunks: decoding a noisy
+        # PNG traces far less than the payload, while a BytesIO copy of the
+        # same view traces more than all of it.
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 255, (512, 512, 3), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(noise).save(buf, format="PNG")
+        payload = struct.pack(">II", 1, 1) + buf.getvalue()
+
+        def traced_peak(open_stream):
+            tracemalloc.start()
+            try:
+                Image.open(open_stream()).load()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        view = memoryview(payload)[8:]
+        reader_peak = traced_peak(lambda: ws_nodes._BufferReader(view))
+        bytesio_peak = traced_peak(lambda: io.BytesIO(view))
+        self.assertGreaterEqual(bytesio_peak, len(view))
+        self.assertLess(reader_peak, 0.5 * len(view))
+
+    def test_21_image_batch_assembler_publishes_complete_batches(self):
+        from nodes.utils.websocket_server import pack_image_header
+
+        def frame(batch_id, index, total, colour):
+            buf = io.BytesIO()
+            Image.new("RGB", (4, 2), color=colour).save(buf, format="PNG")
+            return pack_image_header(batch_id, index, total) + buf.getvalue()
+
+        assembler = ws_nodes.ImageBatchAssembler(timeout=1.0)
+        first = frame(5, 0, 2, (0, 0, 0))
+        header = ws_nodes.unpack_image_header(first)
+        self.assertIsNone(assembler.add(header, first, now=0.0))
+        # An incomplete batch past the timeout is dropped, not published.
+        late = frame(5, 1, 2, (0, 0, 0))
+        self.assertIsNone(assembler.add(ws_nodes.unpack_image_header(late), late, now=5.0))
+        self.assertEqual(assembler.dropped_batches, 1)
+
+        client = ws_nodes.WebSocketClient.__new__(ws_nodes.WebSocketClient)
+        client.path = "/image"
+        client.debug = False
+        client.received_data = None
+        client.received_sequence = 0
+        client.received_raw_data = None
+        client.decoded_sequence = 0
+        client.latest_only = True
+        client.eager_decode = False
+        client.assemble_batches = True
+        client._batch_assembler = None
+        client.data_handler = ws_nodes.image_data_handler
+        client.lock = ws_nodes.threading.Lock()
+
+        colours = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+        frames = [frame(9, index, 3, colour) for index, colour in enumerate(colours)]
+        self.assertEqual(client._store_latest_message(frames[2]), 0)
+        self.assertEqual(client._store_latest_message(frames[0]), 0)
+        self.assertEqual(client._store_latest_message(frames[1]), 1)
+
+        batch, sequence = client.get_latest_data_with_sequence()
+        self.assertEqual((tuple(batch.shape), sequence), ((3, 2, 4, 3), 1))
+        self.assertEqual(batch._metadata["frame_total"], 3)
+        self.assertEqual(batch._metadata["batch_id"], 9)
+        for index, colour in enumerate(colours):
+            self.assertEqual(tuple((batch[index, 0, 0] * 255).round().int().tolist()), colour)
+
+        # Single-frame messages bypass the assembler.
+        self.assertEqual(client._store_latest_message(frame(1, 0, 1, (9, 9, 9))), 2)
+        single, sequence = client.get_latest_data_with_sequence()
+        self.assertEqual((tuple(single.shape), sequence), ((1, 2, 4, 3), 2))
+
+    def test_22_opus_encoder_detection_is_cached_and_pipes_output(self):
+        from unittest import mock
+
+        listing = (
+            "Encoders:\n"
+            " A....D aac                  AAC (Advanced Audio Coding)\n"
+            " A....D opus                 Opus\n"
+        )
+        completed = mock.Mock(stdout=listing)
+        saved = ws_nodes._opus_encoders
+        ws_nodes._opus_encoders = None
+        try:
+            with mock.patch.object(ws_nodes.subprocess, "run", return_value=completed) as run:
+                self.assertEqual(ws_nodes._ffmpeg_opus_encoders(), ("opus",))
+                self.assertEqual(ws_nodes._ffmpeg_opus_encoders(), ("opus",))
+            self.assertEqual(run.call_count, 1)
+            with mock.patch.object(ws_nodes.subprocess, "run", side_effect=FileNotFoundError):
+                self.assertEqual(ws_nodes._detect_ffmpeg_opus_encoders(), ws_nodes.OPUS_ENCODER_CANDIDATES)
+        finally:
+            ws_nodes._opus_encoders = saved
+
+        args = ws_nodes._webm_opus_encode_stream("libopus", 48000, 2, 128, 1.5).get_args()
+        self.assertIn("pipe:1", args)
+        self.assertIn("DURATION=1.500000", args)
+
 
 class TestWebSocketNodesIntegration(unittest.TestCase):
     def setUp(self):
@@ -421,6 +1020,13 @@ class TestWebSocketNodesIntegration(unittest.TestCase):
         sent, received = asyncio.run(send_and_receive())
         self.assertEqual(sent[0], {"hello": "world"})
         self.assertEqual(json.loads(received), {"hello": "world"})
+        # Let the server drop the test socket, so the connection count below
+        # can only be satisfied by the loader's own client.
+        sender_closed = self._wait_for(
+            lambda: not server.clients.get("/json", {}).get(1),
+            timeout=3.0,
+        )
+        self.assertTrue(sender_closed, "Test websocket did not disconnect in time")
 
         loader = ws_nodes.VrchJsonWebSocketChannelLoaderNode()
         # Prime loader to create its internal websocket client first.
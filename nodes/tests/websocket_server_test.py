@@ -7,12 +7,15 @@ Includes both safe tests (no real servers) and integration tests (real WebSocket
 """
 
 import asyncio
+import contextlib
+import io
 import socket
 import struct
 import sys
 import threading
 import time
 import unittest
+import unittest.mock
 import websockets
 from pathlib import Path
 
@@ -21,6 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from utils.websocket_server import WebSocketClientProxy, SimpleWebSocketServer, get_global_server, _port_servers, _server_lock
+    from utils.websocket_server import _decode_mux_frame, _encode_mux_frame
     print("✓ Successfully imported websocket_server module")
 except ImportError as e:
     print(f"✗ Failed to import websocket_server module: {e}")
@@ -268,12 +272,16 @@ class TestWebSocketServerUnit(unittest.TestCase):
         self.assertTrue(server._is_realtime_payload("/video", b"12345678"))
         print("✓ Image payload realtime detection test passed")
 
-    def test_09_realtime_control_retry_after_queue_full(self):
-        """Control payload should be retried after a full-queue drop."""
+    def test_09_realtime_control_not_dropped_behind_pending_frame(self):
+        """Control payload should use the priority lane and go out before a pending frame."""
         proxy = WebSocketClientProxy.__new__(WebSocketClientProxy)
         proxy._is_running = True
+        proxy.debug = False
         proxy._endpoint_last_control = {}
         proxy._endpoint_realtime = {}
+        proxy._endpoint_control_lanes = {}
+        proxy._endpoint_queued_bytes = {}
+        proxy._pool_cursors = {}
 
         uri = "ws://127.0.0.1:9000/image?channel=1"
         settings = '{"settings":{"bg":"#112233"}}'
@@ -283,19 +291,456 @@ class TestWebSocketServerUnit(unittest.TestCase):
 
         proxy._ensure_endpoint_worker = lambda _uri, realtime=False: q
         proxy._is_realtime_uri = lambda _uri: True
+        proxy._endpoint_queues = {uri: q}
+        proxy._pool_endpoints = {"/image": [uri]}
 
-        # First attempt: queue full, settings cannot be enqueued now.
         WebSocketClientProxy._enqueue_message(proxy, uri, settings, realtime=False)
-        self.assertEqual(q.qsize(), 1, "Queue should remain full after first dropped settings")
+        self.assertEqual(q.qsize(), 1, "Pending frame should stay queued")
+        self.assertEqual(list(proxy._endpoint_control_lanes[uri]), [settings])
 
-        # Queue drains (next tick), same settings should be retried successfully.
-        q.get_nowait()
+        # Unchanged settings are deduplicated on realtime paths.
         WebSocketClientProxy._enqueue_message(proxy, uri, settings, realtime=False)
+        self.assertEqual(len(proxy._endpoint_control_lanes[uri]), 1)
 
-        self.assertEqual(q.qsize(), 1, "Settings should be enqueued on retry when queue has room")
-        queued = q.get_nowait()
-        self.assertEqual(queued, settings, "Retried settings payload should be queued")
-        print("✓ Realtime control retry test passed")
+        # Worker drains the control lane before the frame.
+        self.assertEqual(WebSocketClientProxy._next_pool_item(proxy, "/image"), (uri, settings))
+        self.assertEqual(WebSocketClientProxy._next_pool_item(proxy, "/image"), (uri, b"frame-pending"))
+        self.assertIsNone(WebSocketClientProxy._next_pool_item(proxy, "/image"))
+        print("✓ Realtime control priority lane test passed")
+
+    def test_11_rendition_ladder_routes_slow_client_to_lower_rendition(self):
+        """Rendition ladder should route each client by measured throughput."""
+
+        class RecordingClient:
+            def __init__(self, delay):
+                self.closed = False
+                self.delay = delay
+                self.received = []
+
+            async def send(self, data):
+                await asyncio.sleep(self.delay)
+                self.received.append(data)
+
+        async def run_case():
+            server = SimpleWebSocketServer.__new__(SimpleWebSocketServer)
+            server.debug = False
+            server.paths = {"/image"}
+            server.clients = {"/image": {i: [] for i in range(1, 9)}}
+            server._realtime_send_tasks = {}
+
+            fast = RecordingClient(0.0)
+            slow = RecordingClient(0.15)
+            server.clients["/image"][1] = [fast, slow]
+
+            header = struct.pack(">II", 1, (1 << 16) | (0 << 8) | 1)
+            full = header + b"f" * (256 * 1024)
+            low = header + b"l" * 1024
+            for _ in range(8):
+                await server._broadcast_channel("/image", 1, full, renditions=(full, low))
+                await asyncio.sleep(0.08)
+
+            # Unmeasured clients start on the top rendition.
+            self.assertEqual(fast.received[0], full)
+            self.assertEqual(slow.received[0], full)
+            # Once measured, the slow client drops to the low rendition.
+            self.assertEqual(fast.received[-1], full)
+            self.assertEqual(slow.received[-1], low)
+
+        asyncio.run(run_case())
+        print("✓ Rendition ladder routing test passed")
+
+    def test_11b_rendition_ladder_recovers_full_rendition(self):
+        """A client that was degraded should probe back up to the full rendition once it speeds up."""
+        import utils.websocket_server as ws_server_module
+
+        class RecoveringClient:
+            def __init__(self):
+                self.closed = False
+                self.delay = 0.15
+                self.received = []
+
+            async def send(self, data):
+                await asyncio.sleep(self.delay)
+                self.received.append(data)
+
+        async def run_case():
+            server = SimpleWebSocketServer.__new__(SimpleWebSocketServer)
+            server.debug = False
+            server.paths = {"/image"}
+            server.clients = {"/image": {i: [] for i in range(1, 9)}}
+            server._realtime_send_tasks = {}
+
+            client = RecoveringClient()
+            server.clients["/image"][1] = [client]
+
+            header = struct.pack(">II", 1, (1 << 16) | (0 << 8) | 1)
+            full = header + b"f" * (256 * 1024)
+            low = header + b"l" * 1024
+            for _ in range(6):
+                await server._broadcast_channel("/image", 1, full, renditions=(full, low))
+                await asyncio.sleep(0.08)
+            self.assertEqual(client.received[-1], low)
+
+            # The link recovers: old slow samples age out and the client steps back up.
+            client.delay = 0.0
+            for _ in range(20):
+                await server._broadcast_channel("/image", 1, full, renditions=(full, low))
+                await asyncio.sleep(0.05)
+            self.assertEqual(client.received[-1], full)
+
+        with unittest.mock.patch.object(ws_server_module, "RENDITION_THROUGHPUT_WINDOW_SECONDS", 0.3), \
+                unittest.mock.patch.object(ws_server_module, "RENDITION_PROBE_INTERVAL_SECONDS", 0.2):
+            asyncio.run(run_case())
+        print("✓ Rendition ladder recovery test passed")
+
+    def test_11c_rendition_throughput_window_and_hysteresis(self):
+        """Throughput is bytes over busy time in a window; upgrades are rate limited."""
+        from utils.websocket_server import RENDITION_PROBE_INTERVAL_SECONDS, RENDITION_THROUGHPUT_WINDOW_SECONDS
+
+        server = SimpleWebSocketServer.__new__(SimpleWebSocketServer)
+        client = object()
+        server._frame_intervals = {("/image", 1): {"last": 0.0, "interval": 0.1}}
+        renditions = (b"f" * 100000, b"h" * 25000, b"l" * 1000)
+
+        server._record_client_throughput(client, 100000, 0.5, now=0.0)
+        server._record_client_throughput(client, 100000, 0.5, now=0.1)
+        self.assertAlmostEqual(server._client_throughput_estimate(client, now=0.2), 200000.0)
+        self.assertIs(server._select_rendition("/image", 1, client, renditions, now=0.2), renditions[2])
+
+        # Fast samples alone would allow the top rendition, but only one step per probe interval.
+        later = 0.2 + RENDITION_THROUGHPUT_WINDOW_SECONDS + 0.1
+        server._record_client_throughput(client, 1000, 0.0001, now=later)
+        self.assertIs(server._select_rendition("/image", 1, client, renditions, now=later), renditions[1])
+        self.assertIs(server._select_rendition("/image", 1, client, renditions, now=later + 0.01), renditions[1])
+        step = later + RENDITION_PROBE_INTERVAL_SECONDS
+        server._record_client_throughput(client, 1000, 0.0001, now=step)
+        self.assertIs(server._select_rendition("/image", 1, client, renditions, now=step), renditions[0])
+        print("✓ Rendition throughput window test passed")
+
+    def test_12_proxy_renditions_send_top_rendition(self):
+        """Proxy has no per-client fan-out and forwards only the top rendition."""
+        proxy = WebSocketClientProxy.__new__(WebSocketClientProxy)
+        sent = []
+        proxy.send_to_channel = lambda path, channel, data: sent.append((path, channel, data))
+
+        WebSocketClientProxy.send_renditions_to_channel(proxy, "/image", 1, [b"full", b"half"])
+        self.assertEqual(sent, [("/image", 1, b"full")])
+        print("✓ Proxy rendition forwarding test passed")
+
+    def test_13_mux_frame_round_trip(self):
+        """Multiplexed frames should carry their channel for text and binary payloads."""
+        self.assertEqual(_decode_mux_frame(_encode_mux_frame(3, '{"a":1}')), (3, '{"a":1}'))
+        self.assertEqual(_decode_mux_frame(_encode_mux_frame(8, b"\x00frame")), (8, b"\x00frame"))
+        self.assertEqual(_encode_mux_frame(2, memoryview(bytearray(b"view"))), b"\x02view")
+        self.assertEqual(_decode_mux_frame("9{}"), (None, None))
+        self.assertEqual(_decode_mux_frame(b"\x00abc"), (None, None))
+        self.assertEqual(_decode_mux_frame(""), (None, None))
+        print("✓ Mux frame round trip test passed")
+
+    @staticmethod
+    def _make_idle_proxy(**budget):
+        """Build a proxy on the running loop whose pool workers never send."""
+        proxy = WebSocketClientProxy.__new__(WebSocketClientProxy)
+        proxy.host = "127.0.0.1"
+        proxy.port = 9000
+        proxy.debug = False
+        proxy._is_running = True
+        proxy._loop = asyncio.get_running_loop()
+        proxy.dropped_messages = 0
+        proxy.dropped_bytes = 0
+        proxy.max_queued_bytes = 1024 * 1024
+        proxy.overflow_policy = "drop_oldest"
+        proxy.set_queue_budget(**budget)
+        for name in (
+            "_endpoint_queues", "_endpoint_control_lanes", "_endpoint_queued_bytes", "_endpoint_dropped",
+            "_overflow_warning_state", "_endpoint_targets", "_endpoint_realtime", "_endpoint_last_control",
+            "_endpoint_pools", "_pool_endpoints", "_pool_signals", "_pool_workers", "_pool_cursors",
+        ):
+            setattr(proxy, name, {})
+        proxy._mux_supported = None
+        # Keep the pool worker idle so lanes can be inspected directly.
+        proxy._pool_worker = lambda _path, _signal: asyncio.sleep(0)
+        return proxy
+
+    def test_14_control_lane_preempts_bulk_backlog(self):
+        """Only tagged settings JSON overtakes the bulk backlog on non-realtime paths."""
+        from utils.websocket_server import PROXY_CONTROL_MAX_BYTES
+
+        async def run_case():
+            proxy = self._make_idle_proxy()
+
+            uri = proxy._endpoint_uri("/audio", 1)
+            bulk = "x" * (PROXY_CONTROL_MAX_BYTES + 1)
+            proxy._enqueue_message(uri, bulk)
+            proxy._enqueue_message(uri, '{"control":1}')
+            proxy._enqueue_message(uri, '{"settings":{"volume":1}}')
+
+            self.assertEqual(proxy._next_pool_item("/audio"), (uri, '{"settings":{"volume":1}}'))
+            self.assertEqual(proxy._next_pool_item("/audio"), (uri, bulk))
+            self.assertEqual(proxy._next_pool_item("/audio"), (uri, '{"control":1}'))
+            self.assertIsNone(proxy._next_pool_item("/audio"))
+
+            # Small /json text must keep the order JsonStateMerger depends on.
+            json_uri = proxy._endpoint_uri("/json", 1)
+            large = '{"a":"' + "y" * (PROXY_CONTROL_MAX_BYTES + 1) + '"}'
+            proxy._enqueue_message(json_uri, large)
+            proxy._enqueue_message(json_uri, '{"a":"small"}')
+            self.assertEqual(proxy._next_pool_item("/json"), (json_uri, large))
+            self.assertEqual(proxy._next_pool_item("/json"), (json_uri, '{"a":"small"}'))
+
+        asyncio.run(run_case())
+        print("✓ Control lane preemption test passed")
+
+    def test_14b_control_lane_overflow_is_counted_and_throttled(self):
+        """A full control lane drops the oldest entry, counts it and warns at most once per interval."""
+        from utils.websocket_server import PROXY_CONTROL_LANE_MAX_MESSAGES
+
+        async def run_case():
+            proxy = self._make_idle_proxy()
+            uri = proxy._endpoint_uri("/image", 1)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                for i in range(PROXY_CONTROL_LANE_MAX_MESSAGES + 5):
+                    proxy._enqueue_message(uri, '{"settings":%d}' % i)
+            self.assertEqual(len(proxy._endpoint_control_lanes[uri]), PROXY_CONTROL_LANE_MAX_MESSAGES)
+            self.assertEqual(proxy._endpoint_control_lanes[uri][0], '{"settings":5}')
+            self.assertEqual(proxy.get_queue_stats()["endpoints"][uri]["dropped_messages"], 5)
+            self.assertEqual(out.getvalue().count("Control lane full"), 1)
+
+        asyncio.run(run_case())
+        print("✓ Control lane overflow test passed")
+
+    def test_15_bulk_queue_byte_budget_and_overflow_policy(self):
+        """Non-realtime bulk lanes should stay within the byte budget and count drops."""
+
+        async def run_case():
+            for policy, expected in (("drop_oldest", [b"c" * 400, b"d" * 400]), ("drop_newest", [b"a" * 400, b"b" * 400])):
+                proxy = self._make_idle_proxy(max_queued_bytes=1000, overflow_policy=policy)
+                uri = proxy._endpoint_uri("/latent", 2)
+                for payload in (b"a" * 400, b"b" * 400, b"c" * 400, b"d" * 400, b"e" * 2000):
+                    proxy._enqueue_message(uri, payload)
+
+                stats = proxy.get_queue_stats()
+                self.assertEqual(stats["overflow_policy"], policy)
+                self.assertLessEqual(stats["queued_bytes"], 1000)
+                self.assertEqual(stats["dropped_messages"], 3)
+                self.assertEqual(stats["dropped_bytes"], 400 + 400 + 2000)
+                self.assertEqual(stats["endpoints"][uri]["dropped_bytes"], 2800)
+
+                drained = []
+                while True:
+                    item = proxy._next_pool_item("/latent")
+                    if item is None:
+                        break
+                    drained.append(item[1])
+                self.assertEqual(drained, expected)
+                self.assertEqual(proxy.get_queue_stats()["queued_bytes"], 0)
+
+        asyncio.run(run_case())
+        print("✓ Bulk queue byte budget test passed")
+
+    def test_15b_queue_budget_is_global_and_counts_send_failures(self):
+        """The byte budget spans endpoints, sizes text as UTF-8 and counts payloads lost on send."""
+        from utils.websocket_server import _payload_size
+
+        self.assertEqual(_payload_size("abc"), 3)
+        self.assertEqual(_payload_size("\u00e9\u4e2d"), 5)
+        self.assertEqual(_payload_size(b"\x00\x01"), 2)
+
+        async def run_case():
+            proxy = self._make_idle_proxy(max_queued_bytes=1000)
+            json_uri = proxy._endpoint_uri("/json", 1)
+            latent_uri = proxy._endpoint_uri("/latent", 2)
+            proxy._enqueue_message(json_uri, "j" * 400)
+            proxy._enqueue_message(latent_uri, b"a" * 400)
+            proxy._enqueue_message(latent_uri, b"b" * 400)
+
+            stats = proxy.get_queue_stats()
+            self.assertLessEqual(stats["queued_bytes"], 1000)
+            # The new payload's endpoint is evicted first; /json keeps its entry.
+            self.assertEqual(stats["endpoints"][latent_uri]["dropped_messages"], 1)
+            self.assertEqual(stats["endpoints"][json_uri]["queued_bytes"], 400)
+
+            # Once its own lane is empty, eviction spills over to other endpoints.
+            proxy._enqueue_message(latent_uri, b"c" * 900)
+            stats = proxy.get_queue_stats()
+            self.assertLessEqual(stats["queued_bytes"], 1000)
+            self.assertEqual(stats["endpoints"][json_uri]["dropped_messages"], 1)
+
+        asyncio.run(run_case())
+
+        class FailingSocket:
+            close_code = None
+            close_reason = None
+
+            async def send(self, _data):
+                raise ConnectionError("server gone")
+
+        async def run_failure_case():
+            proxy = self._make_idle_proxy()
+            uri = proxy._endpoint_uri("/json", 1)
+            proxy._enqueue_message(uri, '{"a":1}')
+
+            async def ensure_connection(_path, _uri):
+                proxy._is_running = False
+                return "/json", FailingSocket(), None
+
+            async def close_connection(_key):
+                return None
+
+            proxy._ensure_connection = ensure_connection
+            proxy._close_connection = close_connection
+            await WebSocketClientProxy._pool_worker(proxy, "/json", asyncio.Event())
+            stats = proxy.get_queue_stats()
+            self.assertEqual(stats["dropped_messages"], 1)
+            self.assertEqual(stats["dropped_bytes"], len('{"a":1}'))
+
+        asyncio.run(run_failure_case())
+        print("✓ Global queue budget test passed")
+
+    def test_15c_mux_frame_over_message_limit_is_dropped(self):
+        """A payload whose prefixed mux frame exceeds the limit is dropped, not sent."""
+        import utils.websocket_server as ws_server
+
+        class RecordingSocket:
+            close_code = None
+            close_reason = None
+
+            def __init__(self, proxy):
+                self.proxy = proxy
+                self.sent = []
+
+            async def send(self, data):
+                self.sent.append(data)
+                self.proxy._is_running = False
+
+        async def run_case():
+            proxy = self._make_idle_proxy()
+            uri = proxy._endpoint_uri("/latent", 1)
+            proxy._ensure_endpoint_worker(uri)
+            socket_ = RecordingSocket(proxy)
+
+            async def ensure_connection(_path, _uri):
+                return "/latent", socket_, 1
+
+            proxy._ensure_connection = ensure_connection
+            proxy._enqueue_message(uri, b"x" * 16)
+            proxy._enqueue_message(uri, b"y" * 15)
+            with unittest.mock.patch.object(ws_server, "WEBSOCKET_MAX_MESSAGE_BYTES", 16), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                await WebSocketClientProxy._pool_worker(proxy, "/latent", asyncio.Event())
+            self.assertEqual(socket_.sent, [b"\x01" + b"y" * 15])
+            stats = proxy.get_queue_stats()
+            self.assertEqual((stats["dropped_messages"], stats["dropped_bytes"]), (1, 16))
+
+        asyncio.run(run_case())
+        print("✓ Oversized mux frame drop test passed")
+
+    def test_15d_fallback_gives_each_endpoint_its_own_worker(self):
+        """Without multiplexing, a failing endpoint backs off without stalling the others."""
+
+        class Socket:
+            close_code = None
+            close_reason = None
+
+            def __init__(self, uri, sent):
+                self.uri = uri
+                self.sent = sent
+
+            async def send(self, data):
+                if self.uri.endswith("channel=1"):
+                    raise ConnectionError("slow endpoint gone")
+                self.sent.append(data)
+
+        async def run_case():
+            proxy = self._make_idle_proxy()
+            slow = proxy._endpoint_uri("/json", 1)
+            fast = proxy._endpoint_uri("/json", 2)
+            proxy._ensure_endpoint_worker(slow)
+            proxy._ensure_endpoint_worker(fast)
+            self.assertEqual(proxy._pool_endpoints, {"/json": [slow, fast]})
+            sent = []
+
+            async def ensure_connection(_path, uri):
+                # The first handshake finds a server without multiplexing.
+                proxy._mux_supported = False
+                return uri, Socket(uri, sent), None
+
+            async def close_connection(_key):
+                return None
+
+            proxy._ensure_connection = ensure_connection
+            proxy._close_connection = close_connection
+            proxy._enqueue_message(slow, '{"a":1}')
+            proxy._enqueue_message(fast, '{"b":1}')
+
+            # The path worker settles the item in hand, then splits the pool.
+            await asyncio.wait_for(WebSocketClientProxy._pool_worker(proxy, "/json", asyncio.Event()), 1.0)
+            self.assertEqual(proxy._endpoint_pools, {slow: slow, fast: fast})
+            self.assertNotIn("/json", proxy._pool_endpoints)
+            self.assertEqual(proxy.get_queue_stats()["dropped_messages"], 1)
+
+            # Endpoints added later get their own worker straight away.
+            late = proxy._endpoint_uri("/json", 3)
+            proxy._ensure_endpoint_worker(late)
+            self.assertEqual(proxy._endpoint_pools[late], late)
+
+            # The slow endpoint's backoff does not delay the fast one.
+            proxy._enqueue_message(slow, '{"a":2}')
+            workers = [
+                asyncio.ensure_future(WebSocketClientProxy._pool_worker(proxy, key, proxy._pool_signals[key]))
+                for key in (slow, fast)
+            ]
+            await asyncio.sleep(0.05)
+            self.assertEqual(sent, ['{"b":1}'])
+            started = time.monotonic()
+            proxy._enqueue_message(fast, '{"b":2}')
+            for _ in range(50):
+                if len(sent) == 2:
+                    break
+                await asyncio.sleep(0.005)
+            self.assertEqual(sent, ['{"b":1}', '{"b":2}'])
+            self.assertLess(time.monotonic() - started, 0.2)
+            proxy._is_running = False
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        asyncio.run(run_case())
+        print("✓ Per-endpoint fallback worker test passed")
+
+    def test_16_extended_image_header_and_relay_latency(self):
+        """Extended /image headers keep the 8-byte prefix and feed relay latency stats."""
+        from utils.websocket_server import (
+            IMAGE_EXTENDED_HEADER_SIZE,
+            IMAGE_HEADER_SIZE,
+            monotonic_us,
+            pack_image_header,
+            unpack_image_header,
+        )
+
+        plain = pack_image_header(7, 1, 3)
+        self.assertEqual(plain, struct.pack(">II", 1, (7 << 16) | (1 << 8) | 3))
+        self.assertEqual(unpack_image_header(plain)["header_size"], IMAGE_HEADER_SIZE)
+        self.assertNotIn("sequence", unpack_image_header(plain))
+
+        sent_at = monotonic_us() - 5000
+        extended = pack_image_header(7, 1, 3, sequence=42, timestamp_us=sent_at)
+        self.assertEqual(len(extended), IMAGE_EXTENDED_HEADER_SIZE)
+        self.assertEqual(extended[4:8], plain[4:8])
+        header = unpack_image_header(extended + b"jpeg")
+        self.assertEqual((header["raw_type"], header["batch_id"], header["frame_index"], header["frame_total"]), (2, 7, 1, 3))
+        self.assertEqual((header["sequence"], header["send_timestamp_us"]), (42, sent_at))
+        self.assertIsNone(unpack_image_header(b"\x00\x01"))
+
+        server = SimpleWebSocketServer.__new__(SimpleWebSocketServer)
+        server._record_relay_latency("/image", 1, plain + b"jpeg")
+        self.assertEqual(server.get_latency_stats(), {})
+        server._record_relay_latency("/image", 1, extended + b"jpeg")
+        relay = server.get_latency_stats()[("/image", 1)]["relay"]
+        self.assertEqual(relay["count"], 1)
+        self.assertGreaterEqual(relay["last_ms"], 5.0)
+        print("✓ Extended image header latency test passed")
 
 
 class TestWebSocketServerIntegration(unittest.TestCase):
@@ -960,6 +1405,48 @@ class TestWebSocketServerIntegration(unittest.TestCase):
 
         print("✓ Proxy sender stability under downlink pressure test passed")
 
+    def test_18_proxy_pools_channels_on_one_connection_per_path(self):
+        """Proxy should carry every channel of a path over one multiplexed connection."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((self.test_host, 0))
+            port = sock.getsockname()[1]
+        server = SimpleWebSocketServer(self.test_host, port, debug=False)
+        self.servers.append(server)
+        server.register_path("/json")
+        time.sleep(1.2)
+
+        proxy = WebSocketClientProxy(self.test_host, port, debug=False)
+        proxy.register_path("/json")
+
+        async def run_case():
+            receivers = {}
+            for channel in range(1, 5):
+                uri = f"ws://{self.test_host}:{port}/json?channel={channel}"
+                receivers[channel] = await websockets.connect(uri)
+                self.clients.append(receivers[channel])
+            await asyncio.sleep(0.3)
+
+            for channel in receivers:
+                proxy.send_to_channel("/json", channel, f'{{"channel":{channel}}}')
+
+            for channel, receiver in receivers.items():
+                message = await asyncio.wait_for(receiver.recv(), timeout=3.0)
+                self.assertEqual(message, f'{{"channel":{channel}}}')
+
+            self.assertTrue(proxy._mux_supported)
+            self.assertEqual(len(server._mux_connections), 1, "Expected one pooled connection for /json")
+            self.assertEqual(len(proxy._connections), 1)
+
+            for receiver in receivers.values():
+                await receiver.close()
+
+        try:
+            asyncio.run(run_case())
+        finally:
+            proxy.stop()
+            server.stop()
+        print("✓ Proxy connection pooling test passed")
+
 
 def run_all_tests():
     """Run both unit tests and integration tests"""
@@ -0,0 +1,228 @@
+"""Shared decoder for recorded / WebSocket audio payloads (WebM, Ogg, ...).
+
+Payloads are decoded in-process through ComfyUI's audio loader when it is
+available, otherwise through an ffmpeg pipe that emits float32 WAV, which is
+parsed straight into a tensor. The number of concurrent ffmpeg processes is
+bounded and decoded results are kept in an LRU cache capped by total samples.
+Base64 payloads are keyed by the SHA-256 of the base64 string itself (the same
+digest ``VrchAudioRecorderNode.IS_CHANGED`` reports), so a cache hit skips
+base64 decoding as well.
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import struct
+import threading
+from collections import OrderedDict
+
+import ffmpeg
+import numpy as np
+import torch
+
+
+DECODER_MAX_WORKERS = 2
+# ~64 MB of float32 samples across all cached waveforms.
+DECODED_AUDIO_CACHE_MAX_SAMPLES = 1 << 24
+
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class AudioDecodeError(ValueError):
+    """Raised when an audio payload cannot be decoded."""
+
+
+def payload_digest(data) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def base64_digest(base64_data: str) -> str:
+    return hashlib.sha256(base64_data.encode()).hexdigest()
+
+
+def decode_base64_payload(base64_data: str) -> bytes:
+    """Decode a base64 string, accepting ``data:`` URL prefixes and missing padding."""
+    text = base64_data.strip()
+    if "," in text:
+        text = text.split(",", 1)[1]
+    text += "=" * (-len(text) % 4)
+    try:
+        return base64.b64decode(text)
+    except (binascii.Error, ValueError) as err:
+        raise AudioDecodeError(f"invalid base64 audio payload: {err}") from err
+
+
+class DecodedAudioCache:
+    """LRU cache of (waveform, sample_rate) bounded by the total number of samples.
+
+    The cache keeps its own copy of each waveform and ``get`` returns a clone,
+    so callers may modify what they receive without corrupting later hits.
+    """
+
+    def __init__(self, max_samples=DECODED_AUDIO_CACHE_MAX_SAMPLES):
+        self.max_samples = max(0, int(max_samples))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.total_samples = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        waveform, sample_rate = entry
+        return waveform.clone(), sample_rate
+
+    def put(self, key, entry):
+        waveform, sample_rate = entry
+        samples = int(waveform.numel())
+        if samples <= self.max_samples:
+            entry = (waveform.clone(), sample_rate)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_samples -= int(previous[0].numel())
+            if samples > self.max_samples:
+                return
+            self._entries[key] = entry
+            self.total_samples += samples
+            while self.total_samples > self.max_samples:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.total_samples -= int(evicted.numel())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_samples = 0
+
+
+def parse_float_wav(data):
+    """Parse a 32-bit float WAV byte string into ([channels, samples] tensor, sample_rate).
+
+    ffmpeg cannot seek back on a pipe, so the RIFF/data sizes may be left as
+    placeholders; the data chunk then runs to the end of the buffer.
+    """
+    view = memoryview(data)
+    if len(view) < 12 or bytes(view[:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        raise AudioDecodeError("not a RIFF/WAVE payload")
+    offset = 12
+    channels = sample_rate = None
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        (chunk_size,) = struct.unpack_from("<I", view, offset + 4)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", view, body)
+            if format_tag not in (_WAVE_FORMAT_IEEE_FLOAT, _WAVE_FORMAT_EXTENSIBLE) or bits != 32:
+                raise AudioDecodeError(f"unsupported WAV sample format {format_tag}/{bits}")
+        elif chunk_id == b"data":
+            if not channels:
+                raise AudioDecodeError("WAV data chunk before fmt chunk")
+            end = len(view) if chunk_size in (0, 0xFFFFFFFF) else min(len(view), body + chunk_size)
+            frame_bytes = 4 * channels
+            end -= (end - body) % frame_bytes
+            samples = np.frombuffer(view[body:end], dtype="<f4").reshape(-1, channels)
+            return torch.from_numpy(samples.T.copy()), int(sample_rate)
+        offset = body + chunk_size + (chunk_size & 1)
+    raise AudioDecodeError("WAV payload has no data chunk")
+
+
+def _load_comfy_audio_loader():
+    try:
+        from comfy_extras.nodes_audio import load as comfy_load_audio  # type: ignore
+    except Exception:
+        return None
+    return comfy_load_audio
+
+
+class AudioDecoder:
+    """Decodes container audio bytes to ([channels, samples] float32 tensor, sample_rate)."""
+
+    def __init__(self, max_workers=DECODER_MAX_WORKERS, cache=None):
+        self._slots = threading.BoundedSemaphore(max(1, int(max_workers)))
+        self.cache = cache if cache is not None else DecodedAudioCache()
+        self._comfy_loader = _load_comfy_audio_loader()
+
+    def decode(self, audio_bytes, container="webm"):
+        if not audio_bytes:
+            raise AudioDecodeError("empty audio payload")
+        key = ("bytes", container, payload_digest(audio_bytes))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._decode_uncached(audio_bytes, container)
+        self.cache.put(key, result)
+        return result
+
+    def decode_base64(self, base64_data, container="webm", digest=None):
+        """Decode a base64 payload; cache hits skip base64 and container decoding."""
+        if not base64_data or not base64_data.strip():
+            raise AudioDecodeError("empty audio payload")
+        key = ("base64", container, digest or base64_digest(base64_data))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        audio_bytes = decode_base64_payload(base64_data)
+        if not audio_bytes:
+            raise AudioDecodeError("empty audio payload")
+        result = self._decode_uncached(audio_bytes, container)
+        self.cache.put(key, result)
+        return result
+
+    def _decode_uncached(self, audio_bytes, container):
+        errors = []
+        if self._comfy_loader is not None:
+            try:
+                waveform, sample_rate = self._comfy_loader(io.BytesIO(audio_bytes))
+                return waveform.to(torch.float32), int(sample_rate)
+            except Exception as err:
+                errors.append(f"comfy loader: {err}")
+        try:
+            return parse_float_wav(self._run_ffmpeg(audio_bytes, container))
+        except Exception as err:
+            errors.append(f"ffmpeg: {err}")
+        raise AudioDecodeError("; ".join(errors))
+
+    def _run_ffmpeg(self, audio_bytes, container):
+        stream = (
+            ffmpeg
+            .input("pipe:0", format=container)
+            .output("pipe:1", format="wav", acodec="pcm_f32le")
+            .global_args("-loglevel", "error")
+        )
+        with self._slots:
+            process = stream.run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
+            output, err = process.communicate(input=bytes(audio_bytes))
+        if process.returncode != 0 or not output:
+            raise AudioDecodeError((err or b"").decode("utf-8", errors="replace") or "ffmpeg produced no output")
+        return output
+
+
+_audio_decoder = None
+_audio_decoder_lock = threading.Lock()
+
+
+def get_audio_decoder() -> AudioDecoder:
+    global _audio_decoder
+    with _audio_decoder_lock:
+        if _audio_decoder is None:
+            _audio_decoder = AudioDecoder()
+        return _audio_decoder
+
+
+def decode_audio_bytes(audio_bytes, container="webm"):
+    return get_audio_decoder().decode(audio_bytes, container)
+
+
+def decode_base64_audio(base64_data, container="webm", digest=None):
+    return get_audio_decoder().decode_base64(base64_data, container, digest)
@@ -0,0 +1,153 @@
+"""Vectorized frequency-band analysis for spectrum frames.
+
+Band layouts are turned into bin index tables (half-open ``[start, end)``
+ranges) once per (sample_rate, spectrum length, band set) and cached. A frame
+is then reduced with one cumulative sum and two gathers, so the per-frame cost
+is O(bins + bands) regardless of how many bands are requested.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+BAND_TABLE_CACHE_SIZE = 256
+BAND_LAYOUTS = ["linear", "log", "mel", "bark", "custom"]
+
+
+class BandTable:
+    """Half-open bin ranges for a set of bands over a fixed spectrum length."""
+
+    __slots__ = ("n_bins", "starts", "ends", "counts")
+
+    def __init__(self, n_bins, starts, ends):
+        self.n_bins = int(n_bins)
+        self.starts = np.asarray(starts, dtype=np.intp)
+        self.ends = np.maximum(np.asarray(ends, dtype=np.intp), self.starts)
+        self.counts = (self.ends - self.starts).astype(np.float64)
+        for array in (self.starts, self.ends, self.counts):
+            array.setflags(write=False)
+
+    def __len__(self):
+        return len(self.starts)
+
+
+def _freq_per_bin(sample_rate, n_bins):
+    return (sample_rate / 2) / n_bins
+
+
+@lru_cache(maxsize=BAND_TABLE_CACHE_SIZE)
+def split_band_table(sample_rate, n_bins, split_freqs):
+    """Contiguous bands split at ``split_freqs`` (Hz), covering the whole spectrum.
+
+    Every band but the last gets at least one bin, matching the low/mid/high
+    split of ``VrchMicLoaderNode``.
+    """
+    freq_per_bin = _freq_per_bin(sample_rate, n_bins)
+    starts, ends = [], []
+    start = 0
+    for index, freq in enumerate(split_freqs):
+        end = int(freq / freq_per_bin)
+        end = max(1 if index == 0 else start + 1, end)
+        end = min(end, n_bins)
+        starts.append(start)
+        ends.append(end)
+        start = end
+    starts.append(start)
+    ends.append(n_bins)
+    return BandTable(n_bins, starts, ends)
+
+
+@lru_cache(maxsize=BAND_TABLE_CACHE_SIZE)
+def range_band_table(sample_rate, n_bins, ranges):
+    """Independent ``(freq_min, freq_max)`` bands with inclusive bin bounds.
+
+    A band that does not span at least two bins is empty (volume 0.0), matching
+    ``VrchAudioFrequencyBandAnalyzerNode``.
+    """
+    freq_per_bin = _freq_per_bin(sample_rate, n_bins)
+    starts, ends = [], []
+    for freq_min, freq_max in ranges:
+        if freq_min > freq_max:
+            freq_min, freq_max = freq_max, freq_min
+        bin_min = max(0, int(freq_min / freq_per_bin))
+        bin_max = min(n_bins - 1, int(freq_max / freq_per_bin))
+        if bin_min >= bin_max:
+            starts.append(0)
+            ends.append(0)
+        else:
+            starts.append(bin_min)
+            ends.append(bin_max + 1)
+    return BandTable(n_bins, starts, ends)
+
+
+@lru_cache(maxsize=BAND_TABLE_CACHE_SIZE)
+def edge_band_table(sample_rate, n_bins, edges):
+    """Contiguous bands between consecutive ``edges`` (Hz).
+
+    Each band gets at least one bin, so narrow low-frequency bands of log/mel
+    layouts repeat their nearest bin instead of reading 0.0.
+    """
+    freq_per_bin = _freq_per_bin(sample_rate, n_bins)
+    bins = np.clip((np.asarray(edges, dtype=np.float64) / freq_per_bin).astype(np.intp), 0, n_bins)
+    starts = np.minimum(bins[:-1], n_bins - 1)
+    ends = np.minimum(np.maximum(bins[1:], starts + 1), n_bins)
+    return BandTable(n_bins, starts, ends)
+
+
+def _hz_to_mel(freq):
+    return 2595.0 * np.log10(1.0 + freq / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+
+def _hz_to_bark(freq):
+    # Traunmueller (1990)
+    return 26.81 * freq / (1960.0 + freq) - 0.53
+
+
+def _bark_to_hz(bark):
+    return 1960.0 * (bark + 0.53) / (26.28 - bark)
+
+
+def parse_custom_edges(text):
+    """Parse comma/space separated band edges in Hz into a sorted tuple."""
+    values = sorted({float(part) for part in str(text).replace(",", " ").split()})
+    if len(values) < 2:
+        raise ValueError("custom band layout needs at least two edges")
+    if values[0] < 0:
+        raise ValueError("custom band edges must be non-negative")
+    return tuple(values)
+
+
+def band_edges(layout, band_count, freq_min, freq_max, custom_edges=""):
+    """Return ``band_count + 1`` band edges in Hz (or the parsed custom edges)."""
+    if layout == "custom":
+        return parse_custom_edges(custom_edges)
+    if layout not in BAND_LAYOUTS:
+        raise ValueError(f"unknown band layout: {layout}")
+    band_count = max(1, int(band_count))
+    low, high = sorted((float(freq_min), float(freq_max)))
+    if layout == "linear":
+        edges = np.linspace(low, high, band_count + 1)
+    elif layout == "log":
+        edges = np.geomspace(max(low, 1.0), max(high, 1.0), band_count + 1)
+    elif layout == "mel":
+        edges = _mel_to_hz(np.linspace(_hz_to_mel(low), _hz_to_mel(high), band_count + 1))
+    else:
+        edges = _bark_to_hz(np.linspace(_hz_to_bark(low), _hz_to_bark(high), band_count + 1))
+    return tuple(float(edge) for edge in edges)
+
+
+def band_means(spectrum, table):
+    """Mean of each band of ``table`` over one spectrum frame; empty bands are 0.0."""
+    values = np.asarray(spectrum, dtype=np.float64)
+    if values.ndim != 1 or len(values) != table.n_bins:
+        raise ValueError(f"spectrum length {values.shape} does not match band table ({table.n_bins} bins)")
+    cumulative = np.empty(table.n_bins + 1, dtype=np.float64)
+    cumulative[0] = 0.0
+    np.cumsum(values, out=cumulative[1:])
+    sums = cumulative[table.ends] - cumulative[table.starts]
+    return np.divide(sums, table.counts, out=np.zeros(len(table), dtype=np.float64), where=table.counts > 0)
@@ -0,0 +1,403 @@
+"""Beat tracking state for live spectrum frames.
+
+``SpectralFrameRing`` keeps the most recent spectrum frames in a preallocated
+``[capacity, bins]`` array. Low-band energy, positive spectral flux against the
+previous row, spectrum deviation and waveform RMS are computed when a frame is
+pushed, so a push costs O(bins) and allocates no arrays once the ring exists.
+
+``TempoEstimator`` keeps an onset-strength envelope on a fixed time grid and
+estimates tempo, confidence and beat phase from its FFT autocorrelation.
+
+``analyze_beat_grid`` runs the same tempo estimate offline over a whole
+signal: a log-magnitude spectral-flux envelope from a chunked STFT, then a
+fixed-tempo beat grid aligned to the envelope and snapped to nearby onsets.
+"""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+
+SPECTRAL_RING_CAPACITY = 500
+# Onset envelope grid (cells per second) and history length of TempoEstimator.
+ENVELOPE_RATE = 50.0
+TEMPO_HISTORY_SECONDS = 10.0
+# Log-normal tempo prior (centre in BPM, width in octaves) that resolves
+# octave ambiguity between a period and its multiples.
+TEMPO_PRIOR_BPM = 120.0
+TEMPO_PRIOR_OCTAVES = 1.0
+ACF_SMOOTHING_LAGS = 1.0
+# Offline STFT settings; frames are processed in chunks to bound memory.
+BEAT_GRID_N_FFT = 2048
+BEAT_GRID_HOP = 512
+STFT_CHUNK_FRAMES = 1024
+# Log compression of STFT magnitudes and the moving-average window (seconds)
+# subtracted from the onset envelope.
+ONSET_LOG_GAIN = 100.0
+ONSET_MEAN_SECONDS = 0.5
+# Relative range and steps of the beat grid period refinement, and the
+# fraction of a period within which beats snap to the strongest onset.
+BEAT_PERIOD_SEARCH = 0.01
+BEAT_PERIOD_STEPS = 201
+BEAT_SNAP_FRACTION = 0.1
+
+
+class FrameFeatures(NamedTuple):
+    low_energy: float
+    prev_low_energy: float
+    flux: float
+    rms: float
+    prev_rms: float
+    spectral_std: float
+    has_previous: bool
+
+
+class SpectralFrameRing:
+    """Fixed-size ring buffer of spectrum frames with incremental onset features."""
+
+    def __init__(self, capacity=SPECTRAL_RING_CAPACITY):
+        self.capacity = max(2, int(capacity))
+        self.n_bins = 0
+        self.low_bins = 0
+        self.index = -1
+        self.count = 0
+        self._frames = None
+        self._scratch = None
+        self._low_energy = np.zeros(self.capacity, dtype=np.float64)
+        self._rms = np.zeros(self.capacity, dtype=np.float64)
+        self._contiguous = False
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.index = -1
+        self.count = 0
+        self._contiguous = False
+
+    def mark_gap(self):
+        """Record a missing frame; the next push has no previous row to compare with."""
+        self._contiguous = False
+
+    def _allocate(self, n_bins, low_bins):
+        if n_bins != self.n_bins:
+            self._frames = np.zeros((self.capacity, n_bins), dtype=np.float64)
+            self._scratch = np.empty(n_bins, dtype=np.float64)
+        self.n_bins = n_bins
+        self.low_bins = low_bins
+        self.clear()
+
+    def latest(self):
+        """Read-only view of the newest frame, or ``None`` when the ring is empty."""
+        if self.count == 0:
+            return None
+        row = self._frames[self.index].view()
+        row.setflags(write=False)
+        return row
+
+    def push(self, spectrum, waveform, low_bins):
+        """Append a frame and return its ``FrameFeatures``.
+
+        ``low_bins`` is the number of leading spectrum bins used for the beat
+        band; changing it (or the spectrum length) restarts the ring.
+        """
+        n_bins = len(spectrum)
+        low_bins = min(max(1, int(low_bins)), n_bins)
+        if n_bins != self.n_bins or low_bins != self.low_bins:
+            self._allocate(n_bins, low_bins)
+
+        has_previous = self._contiguous and self.count > 0
+        previous = self.index
+        index = (previous + 1) % self.capacity
+        row = self._frames[index]
+        row[:] = spectrum
+        low = row[:low_bins]
+        scratch = self._scratch[:low_bins]
+
+        np.abs(low, out=scratch)
+        low_energy = float(scratch.sum())
+
+        mean = float(row.sum()) / n_bins
+        spectral_std = math.sqrt(max(0.0, float(row.dot(row)) / n_bins - mean * mean))
+
+        samples = np.asarray(waveform, dtype=np.float64)
+        rms = math.sqrt(float(samples.dot(samples)) / len(samples)) if len(samples) else 0.0
+
+        if has_previous:
+            np.subtract(low, self._frames[previous, :low_bins], out=scratch)
+            np.maximum(scratch, 0.0, out=scratch)
+            flux = float(scratch.sum())
+            prev_low_energy = float(self._low_energy[previous])
+            prev_rms = float(self._rms[previous])
+        else:
+            flux = prev_low_energy = prev_rms = 0.0
+
+        self._low_energy[index] = low_energy
+        self._rms[index] = rms
+        self.index = index
+        self.count = min(self.count + 1, self.capacity)
+        self._contiguous = True
+        return FrameFeatures(low_energy, prev_low_energy, flux, rms, prev_rms, spectral_std, has_previous)
+
+
+class TempoEstimate(NamedTuple):
+    bpm: float
+    confidence: float
+    phase: float
+
+
+NO_TEMPO = TempoEstimate(0.0, 0.0, 0.0)
+
+
+def tempo_from_envelope(envelope, frame_rate, bpm_min, bpm_max, nfft=None):
+    """Estimate ``TempoEstimate`` from an onset envelope sampled at ``frame_rate``.
+
+    The envelope is autocorrelated with one real FFT. The strongest lag inside
+    the BPM range (weighted by the tempo prior) is refined with parabolic
+    interpolation; confidence is its autocorrelation relative to lag 0, and
+    phase is the fraction of a beat elapsed at the last sample.
+    """
+    x = np.asarray(envelope, dtype=np.float64)
+    n = len(x)
+    bpm_min, bpm_max = sorted((float(bpm_min), float(bpm_max)))
+    if n < 4 or bpm_min <= 0:
+        return NO_TEMPO
+    lag_min = max(1, int(math.floor(60.0 * frame_rate / bpm_max)))
+    # At least two periods have to fit in the window.
+    lag_max = min(int(math.ceil(60.0 * frame_rate / bpm_min)), n // 2)
+    if lag_min > lag_max:
+        return NO_TEMPO
+
+    x = x - x.mean()
+    nfft = nfft or 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(x, nfft)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    # Gaussian smoothing of the autocorrelation, so onsets jittered by
+    # irregular frame timing still add up at the beat period.
+    power *= np.exp(-2.0 * (math.pi * ACF_SMOOTHING_LAGS * np.arange(len(power)) / nfft) ** 2)
+    acf = np.fft.irfft(power, nfft)[:lag_max + 2]
+    if acf[0] <= 0:
+        return NO_TEMPO
+    candidates = np.arange(lag_min, lag_max + 1, dtype=np.float64)
+    octaves = np.log2(60.0 * frame_rate / candidates / TEMPO_PRIOR_BPM) / TEMPO_PRIOR_OCTAVES
+    scores = acf[lag_min:lag_max + 1] * np.exp(-0.5 * octaves ** 2)
+    best = lag_min + int(np.argmax(scores))
+    if acf[best] <= 0:
+        return NO_TEMPO
+
+    lag = float(best)
+    if best > 1:
+        left, centre, right = acf[best - 1], acf[best], acf[best + 1]
+        curvature = left - 2.0 * centre + right
+        if curvature < 0:
+            lag += float(np.clip(0.5 * (left - right) / curvature, -0.5, 0.5))
+    bpm = float(np.clip(60.0 * frame_rate / lag, bpm_min, bpm_max))
+    confidence = float(np.clip(acf[best] / acf[0], 0.0, 1.0))
+
+    # Phase of the envelope component at the beat period: impulses at
+    # k0 + m * lag give an angle of -2*pi*k0/lag.
+    omega = 2.0 * math.pi / lag
+    positions = np.arange(n, dtype=np.float64) * omega
+    angle = math.atan2(-float(x.dot(np.sin(positions))), float(x.dot(np.cos(positions))))
+    phase = (((n - 1) * omega + angle) / (2.0 * math.pi)) % 1.0
+    return TempoEstimate(bpm, confidence, phase)
+
+
+class TempoEstimator:
+    """Onset-strength envelope ring with FFT autocorrelation tempo estimates.
+
+    Onsets arrive at irregular wall-clock times, so each one is binned onto a
+    ``frame_rate`` grid and cells without onsets read as silence. ``push`` is
+    O(1) amortised; ``estimate`` costs one FFT over the analysis window and is
+    meant to run every ``update_interval``.
+    """
+
+    def __init__(self, frame_rate=ENVELOPE_RATE, history_seconds=TEMPO_HISTORY_SECONDS):
+        self.frame_rate = float(frame_rate)
+        self.capacity = max(8, int(round(history_seconds * self.frame_rate)))
+        self._envelope = np.zeros(self.capacity, dtype=np.float64)
+        self._window = np.empty(self.capacity, dtype=np.float64)
+        self._nfft = 1 << (2 * self.capacity - 1).bit_length()
+        self.index = -1
+        self.count = 0
+        self._last_cell = None
+        self._carry = 0.0
+        self.last_estimate = NO_TEMPO
+        self._estimate_time = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self._envelope.fill(0.0)
+        self.index = -1
+        self.count = 0
+        self._last_cell = None
+        self._carry = 0.0
+        self.last_estimate = NO_TEMPO
+
+    def _zero(self, start, length):
+        end = start + length
+        if end <= self.capacity:
+            self._envelope[start:end] = 0.0
+        else:
+            self._envelope[start:] = 0.0
+            self._envelope[:end - self.capacity] = 0.0
+
+    def push(self, onset, timestamp):
+        # Linear binning: the onset is split between the two cells around its
+        # timestamp, so grid quantization adds no timing jitter.
+        position = timestamp * self.frame_rate
+        cell = int(math.floor(position))
+        carry = onset * (position - cell)
+        if self._last_cell is None:
+            self.index, self.count, self._last_cell = 0, 1, cell
+            self._envelope[0] = onset - carry
+            self._carry = carry
+            return
+        steps = cell - self._last_cell
+        if steps <= 0:
+            # Same cell (or a clock step backwards): accumulate into the newest cell.
+            self._envelope[self.index] += onset - carry
+            self._carry += carry
+            return
+        if steps < self.capacity:
+            self._zero((self.index + 1) % self.capacity, steps)
+            self._envelope[(self.index + 1) % self.capacity] = self._carry
+        else:
+            steps = self.capacity
+            self._envelope.fill(0.0)
+        self.index = (self.index + steps) % self.capacity
+        self.count = min(self.count + steps, self.capacity)
+        self._envelope[self.index] += onset - carry
+        self._carry = carry
+        self._last_cell = cell
+
+    def window(self, seconds):
+        """The newest ``seconds`` of the envelope in time order (a reused buffer)."""
+        n = min(self.count, max(1, int(round(seconds * self.frame_rate))))
+        start = self.index - n + 1
+        if start >= 0:
+            self._window[:n] = self._envelope[start:self.index + 1]
+        else:
+            head = -start
+            self._window[:head] = self._envelope[start:]
+            self._window[head:n] = self._envelope[:self.index + 1]
+        return self._window[:n]
+
+    def estimate(self, window_seconds, bpm_min, bpm_max, timestamp=None):
+        """Estimate tempo over the newest ``window_seconds`` and remember it for ``phase_at``."""
+        if self.count == 0:
+            return NO_TEMPO
+        result = tempo_from_envelope(self.window(window_seconds), self.frame_rate, bpm_min, bpm_max, self._nfft)
+        self.last_estimate = result
+        self._estimate_time = (self._last_cell + 0.5) / self.frame_rate if timestamp is None else timestamp
+        return result
+
+    def phase_at(self, timestamp):
+        """Beat phase of the last estimate advanced to ``timestamp`` (0 on the beat)."""
+        bpm, _, phase = self.last_estimate
+        if bpm <= 0:
+            return 0.0
+        return (phase + (timestamp - self._estimate_time) * bpm / 60.0) % 1.0
+
+
+class BeatGrid(NamedTuple):
+    bpm: float
+    confidence: float
+    beat_times: np.ndarray
+    duration: float
+
+
+def onset_envelope(samples, sample_rate, n_fft=BEAT_GRID_N_FFT, hop=BEAT_GRID_HOP):
+    """Spectral-flux onset envelope of a mono signal; returns ``(envelope, frame_rate)``.
+
+    The STFT is centred (frame ``i`` is at ``i * hop`` samples) and evaluated
+    in chunks of ``STFT_CHUNK_FRAMES``. Flux is the mel-weighted positive
+    change of the log-compressed magnitudes, minus a moving average and
+    half-wave rectified.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    frame_rate = sample_rate / hop
+    if len(samples) == 0:
+        return np.zeros(0, dtype=np.float64), frame_rate
+    pad = n_fft // 2
+    padded = np.pad(samples, pad, mode="reflect" if len(samples) > pad else "constant")
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop]
+    window = np.hanning(n_fft).astype(np.float32)
+    # Weight bins by mel density (d mel / d f ~ 1 / (700 + f)) so wideband
+    # high-frequency noise does not drown out low-frequency onsets.
+    weights = 1.0 / (700.0 + np.fft.rfftfreq(n_fft, 1.0 / sample_rate))
+    weights = (weights / weights.sum()).astype(np.float32)
+
+    envelope = np.zeros(len(frames), dtype=np.float64)
+    previous = None
+    for start in range(0, len(frames), STFT_CHUNK_FRAMES):
+        magnitude = np.abs(np.fft.rfft(frames[start:start + STFT_CHUNK_FRAMES] * window, axis=1))
+        np.log1p(ONSET_LOG_GAIN * magnitude, out=magnitude)
+        if previous is not None:
+            magnitude_with_previous = np.concatenate((previous[None, :], magnitude))
+        else:
+            magnitude_with_previous = np.concatenate((magnitude[:1], magnitude))
+        flux = np.diff(magnitude_with_previous, axis=0)
+        np.maximum(flux, 0.0, out=flux)
+        envelope[start:start + len(magnitude)] = flux.dot(weights)
+        previous = magnitude[-1]
+
+    width = max(1, int(round(ONSET_MEAN_SECONDS * frame_rate)))
+    if width > 1 and len(envelope) > width:
+        cumulative = np.concatenate(([0.0], np.cumsum(envelope)))
+        low = np.clip(np.arange(len(envelope)) - width // 2, 0, len(envelope))
+        high = np.clip(low + width, 0, len(envelope))
+        envelope = envelope - (cumulative[high] - cumulative[low]) / (high - low)
+        np.maximum(envelope, 0.0, out=envelope)
+    return envelope, frame_rate
+
+
+def _grid_score(envelope, period):
+    """Best grid offset for ``period`` and the envelope summed over its beats."""
+    n = len(envelope)
+    beat_count = int((n - 1) // period) + 1
+    offsets = np.arange(int(math.ceil(period)), dtype=np.float64)
+    grid = np.rint(offsets[:, None] + np.arange(beat_count) * period).astype(np.intp)
+    scores = np.where(grid < n, envelope[np.minimum(grid, n - 1)], 0.0).sum(axis=1)
+    best = int(np.argmax(scores))
+    return scores[best], grid[best]
+
+
+def beat_positions(envelope, period):
+    """Beat positions (in envelope frames) of a fixed-tempo grid; returns ``(positions, period)``.
+
+    The period is refined within ``BEAT_PERIOD_SEARCH`` of the estimate (the
+    autocorrelation peak is not precise enough to stay in phase over a whole
+    track), together with the grid offset that maximises the envelope summed
+    over all beats. Each beat then moves to the strongest onset within
+    ``BEAT_SNAP_FRACTION`` of a period.
+    """
+    n = len(envelope)
+    if n == 0 or period <= 0:
+        return np.zeros(0, dtype=np.float64), float(period)
+    best_score, best_period, beats = -1.0, period, None
+    for candidate in period * (1.0 + np.linspace(-BEAT_PERIOD_SEARCH, BEAT_PERIOD_SEARCH, BEAT_PERIOD_STEPS)):
+        score, grid = _grid_score(envelope, candidate)
+        if score > best_score:
+            best_score, best_period, beats = score, float(candidate), grid
+    beats = beats[beats < n]
+
+    reach = max(1, int(round(BEAT_SNAP_FRACTION * best_period)))
+    candidates = np.clip(beats[:, None] + np.arange(-reach, reach + 1), 0, n - 1)
+    local = envelope[candidates]
+    snapped = candidates[np.arange(len(beats)), np.argmax(local, axis=1)]
+    return np.where(local.max(axis=1) > 0, snapped, beats).astype(np.float64), best_period
+
+
+def analyze_beat_grid(samples, sample_rate, bpm_min, bpm_max, n_fft=BEAT_GRID_N_FFT, hop=BEAT_GRID_HOP):
+    """Tempo and beat timestamps (seconds) of a whole mono signal as a ``BeatGrid``."""
+    duration = len(samples) / float(sample_rate) if sample_rate else 0.0
+    envelope, frame_rate = onset_envelope(samples, sample_rate, n_fft, hop)
+    bpm, confidence, _ = tempo_from_envelope(envelope, frame_rate, bpm_min, bpm_max)
+    if bpm <= 0:
+        return BeatGrid(0.0, 0.0, np.zeros(0, dtype=np.float64), duration)
+    beats, period = beat_positions(envelope, 60.0 * frame_rate / bpm)
+    return BeatGrid(60.0 * frame_rate / period, confidence, beats / frame_rate, duration)
@@ -0,0 +1,96 @@
+"""JSON codec used on WebSocket hot paths.
+
+Prefers orjson, then msgspec, and falls back to the stdlib ``json`` module.
+``dumps`` always returns ``str`` so results can be sent as WebSocket text
+frames, and ``loads`` accepts ``str``, ``bytes``, ``bytearray`` or
+``memoryview``. Decode failures raise one of ``DECODE_ERRORS``.
+
+Output is the same whichever backend is active: compact separators, raw
+UTF-8 text, and numpy arrays / scalars serialized as lists / numbers.
+"""
+
+import json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _default(obj):
+    """Serialize numpy values the way orjson's OPT_SERIALIZE_NUMPY does."""
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default)
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    DECODE_ERRORS = (ValueError, TypeError)
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj):
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Types orjson rejects (e.g. ints wider than 64 bits) use the stdlib.
+            return _stdlib_dumps(obj).encode("utf-8")
+
+    def loads(data):
+        return orjson.loads(data)
+
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    DECODE_ERRORS = (ValueError, TypeError, msgspec.DecodeError)
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=_default)
+    _msgspec_decoder = msgspec.json.Decoder()
+
+    def dumps_bytes(obj):
+        try:
+            return _msgspec_encoder.encode(obj)
+        except (TypeError, msgspec.EncodeError):
+            return _stdlib_dumps(obj).encode("utf-8")
+
+    def loads(data):
+        return _msgspec_decoder.decode(data)
+
+else:
+    BACKEND = "json"
+    DECODE_ERRORS = (ValueError, TypeError)
+
+    def dumps_bytes(obj):
+        return _stdlib_dumps(obj).encode("utf-8")
+
+    def loads(data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+def dumps(obj):
+    """Serialize obj to a compact JSON ``str``."""
+    if BACKEND == "json":
+        return _stdlib_dumps(obj)
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def copy(obj):
+    """Deep-copy a JSON-compatible structure through the codec."""
+    return loads(dumps_bytes(obj))
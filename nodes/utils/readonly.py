@@ -0,0 +1,43 @@
+"""Read-only containers for state snapshots handed to node outputs.
+
+``ReadOnlyDict`` and ``ReadOnlyList`` subclass ``dict`` and ``list`` so the
+``isinstance`` checks in downstream nodes and every ``json_codec`` backend keep
+working, but any mutation raises ``TypeError``. A cached snapshot can then be
+returned to every reader without a defensive copy. ``copy.copy``,
+``copy.deepcopy`` and ``pickle`` produce plain, mutable containers.
+"""
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only; copy it before modifying")
+
+
+class ReadOnlyDict(dict):
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce_ex__(self, protocol):
+        return dict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+def freeze(value):
+    """Return a read-only copy of a JSON-like structure (dicts and lists, recursively)."""
+    if isinstance(value, (ReadOnlyDict, ReadOnlyList)):
+        return value
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ReadOnlyList(freeze(item) for item in value)
+    return value
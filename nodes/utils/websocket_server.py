@@ -5,6 +5,7 @@ import struct
 import threading
 import time
 import urllib.parse
+from collections import deque
 from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import websockets
@@ -18,9 +19,117 @@ if not hasattr(builtins, "__vrch_ws_server_lock"):
 
 _port_servers = builtins.__vrch_ws_port_servers
 _server_lock = builtins.__vrch_ws_server_lock
-_REALTIME_PATHS = {"/image", "/video"}
+_REALTIME_PATHS = {"/image", "/video", "/mic"}
 WEBSOCKET_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+# /image binary header: ">II" (raw_type, meta). raw_type 2 extends it with a
+# global sequence number and a monotonic send timestamp for latency tracing.
+IMAGE_HEADER_FORMAT = ">II"
+IMAGE_HEADER_SIZE = struct.calcsize(IMAGE_HEADER_FORMAT)
+IMAGE_EXTENDED_HEADER_FORMAT = ">IIQQ"
+IMAGE_EXTENDED_HEADER_SIZE = struct.calcsize(IMAGE_EXTENDED_HEADER_FORMAT)
+IMAGE_RAW_TYPE = 1
+IMAGE_RAW_TYPE_EXTENDED = 2
+LATENCY_SAMPLE_WINDOW = 256
 REALTIME_SKIP_WARNING_INTERVAL_SECONDS = 2.0
+# Rendition ladder routing: fraction of measured client throughput a rendition
+# may use, and smoothing factor for the frame interval estimate. Throughput is
+# bytes over busy time (send plus socket drain) in a sliding window; a client
+# steps down at once but up at most one rendition per probe interval, and with
+# no samples in the window it probes one rendition up.
+RENDITION_THROUGHPUT_HEADROOM = 0.8
+RENDITION_EWMA_ALPHA = 0.3
+RENDITION_THROUGHPUT_WINDOW_SECONDS = 2.0
+RENDITION_THROUGHPUT_WINDOW_SAMPLES = 64
+RENDITION_MIN_BUSY_SECONDS = 0.0005
+RENDITION_PROBE_INTERVAL_SECONDS = 2.0
+RENDITION_DRAIN_POLL_SECONDS = 0.002
+RENDITION_DRAIN_TIMEOUT_SECONDS = 2.0
+# Proxy fan-in: one multiplexed connection per path carries every channel.
+# Each frame is prefixed with its channel number; servers acknowledge the
+# handshake with PROXY_MUX_ACK, otherwise the proxy falls back to one
+# connection per path+channel endpoint.
+PROXY_MUX_ACK = '{"vrch_mux":1}'
+PROXY_MUX_HANDSHAKE_TIMEOUT_SECONDS = 2.0
+PROXY_OUTPUT_CLIENT_NAME = "comfyui-output"
+# Proxy priority lanes: small text payloads on realtime paths and explicitly
+# tagged settings JSON use a per-endpoint control lane that the pool worker
+# always drains before frames. Other text keeps FIFO order with the bulk lane.
+PROXY_CONTROL_MAX_BYTES = 64 * 1024
+PROXY_SETTINGS_PREFIX = '{"settings"'
+PROXY_CONTROL_LANE_MAX_MESSAGES = 256
+# Proxy bulk lanes share one byte budget across every endpoint of the proxy
+# so an unreachable server cannot grow pending payloads without bound.
+PROXY_DEFAULT_MAX_QUEUED_BYTES = 256 * 1024 * 1024
+PROXY_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+
+def monotonic_us():
+    """Monotonic clock in microseconds, comparable across processes on one host."""
+    return time.monotonic_ns() // 1000
+
+
+def pack_image_header(batch_id, frame_index, frame_total, sequence=None, timestamp_us=None):
+    """Pack an /image frame header; pass sequence to emit the extended header."""
+    meta = ((int(batch_id) & 0xFFFF) << 16) | ((int(frame_index) & 0xFF) << 8) | (int(frame_total) & 0xFF)
+    if sequence is None:
+        return struct.pack(IMAGE_HEADER_FORMAT, IMAGE_RAW_TYPE, meta)
+    if timestamp_us is None:
+        timestamp_us = monotonic_us()
+    return struct.pack(IMAGE_EXTENDED_HEADER_FORMAT, IMAGE_RAW_TYPE_EXTENDED, meta, int(sequence), int(timestamp_us))
+
+
+def unpack_image_header(data):
+    """Parse an /image frame header.
+
+    Returns a dict with raw_type, batch_id, frame_index, frame_total,
+    header_size and, for extended headers, sequence and send_timestamp_us.
+    Returns None when data is too short.
+    """
+    if len(data) < IMAGE_HEADER_SIZE:
+        return None
+    raw_type, meta = struct.unpack_from(IMAGE_HEADER_FORMAT, data)
+    header = {
+        "raw_type": raw_type,
+        "batch_id": (meta >> 16) & 0xFFFF,
+        "frame_index": (meta >> 8) & 0xFF,
+        "frame_total": meta & 0xFF,
+        "header_size": IMAGE_HEADER_SIZE,
+    }
+    if raw_type == IMAGE_RAW_TYPE_EXTENDED and len(data) >= IMAGE_EXTENDED_HEADER_SIZE:
+        _, _, sequence, timestamp_us = struct.unpack_from(IMAGE_EXTENDED_HEADER_FORMAT, data)
+        header["sequence"] = sequence
+        header["send_timestamp_us"] = timestamp_us
+        header["header_size"] = IMAGE_EXTENDED_HEADER_SIZE
+    return header
+
+
+class LatencyStats:
+    """Rolling window of latency samples in milliseconds."""
+
+    def __init__(self, maxlen=LATENCY_SAMPLE_WINDOW):
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, value_ms):
+        with self._lock:
+            self._samples.append(float(value_ms))
+
+    def record_since(self, timestamp_us):
+        self.record((monotonic_us() - int(timestamp_us)) / 1000.0)
+
+    def summary(self):
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return {"count": 0, "last_ms": None, "p50_ms": None, "p95_ms": None, "avg_ms": None}
+        ordered = sorted(samples)
+        return {
+            "count": len(samples),
+            "last_ms": round(samples[-1], 3),
+            "p50_ms": round(ordered[len(ordered) // 2], 3),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "avg_ms": round(sum(samples) / len(samples), 3),
+        }
 
 
 def _describe_ws_payload(path, data):
@@ -28,7 +137,7 @@ def _describe_ws_payload(path, data):
     clean_path = str(path or "").split("?", 1)[0]
     if clean_path == "/image" and isinstance(data, (bytes, bytearray)) and len(data) >= 8:
         try:
-            raw_type, meta = struct.unpack(">II", data[:8])
+            raw_type, meta = struct.unpack_from(IMAGE_HEADER_FORMAT, data)
             batch_id = (meta >> 16) & 0xFFFF
             frame_index = (meta >> 8) & 0xFF
             frame_total = meta & 0xFF
@@ -41,6 +150,39 @@ def _describe_ws_payload(path, data):
     return f"type={type(data).__name__} bytes={size}"
 
 
+def _payload_size(data):
+    if isinstance(data, str):
+        # Text goes on the wire as UTF-8; ASCII is the common case and needs no encode.
+        return len(data) if data.isascii() else len(data.encode("utf-8"))
+    return len(data) if hasattr(data, "__len__") else 0
+
+
+def _encode_mux_frame(channel, data):
+    """Prefix a payload with its channel for a multiplexed proxy connection.
+
+    Binary payloads are copied once, straight into the prefixed frame.
+    """
+    if isinstance(data, str):
+        return f"{int(channel)}{data}"
+    return b"".join((bytes((int(channel),)), data))
+
+
+def _decode_mux_frame(message):
+    """Split a multiplexed frame into (channel, payload); channel is None if invalid."""
+    if not message:
+        return None, None
+    if isinstance(message, str):
+        try:
+            channel = int(message[0])
+        except ValueError:
+            return None, None
+    else:
+        channel = message[0]
+    if channel < 1 or channel > 8:
+        return None, None
+    return channel, message[1:]
+
+
 def _describe_ws_uri_payload(uri, data):
     try:
         parsed = urllib.parse.urlparse(uri)
@@ -164,24 +306,45 @@ async def _is_valid_websocket_server(host, port, timeout=5):
 class WebSocketClientProxy:
     """Client proxy that connects to an existing WebSocket server."""
 
-    def __init__(self, host, port, debug=False):
+    # The external server does its own fan-out, so only one rendition is sent.
+    supports_renditions = False
+
+    def __init__(self, host, port, debug=False, max_queued_bytes=PROXY_DEFAULT_MAX_QUEUED_BYTES,
+                 overflow_policy="drop_oldest"):
         host, port = _normalize_endpoint(host, port)
         self.host = host
         self.port = port
         self.debug = debug
         self.paths = set()
         self.clients = {}  # path -> channel -> [websocket connections] (compat only)
+        self.max_queued_bytes = PROXY_DEFAULT_MAX_QUEUED_BYTES
+        self.overflow_policy = "drop_oldest"
+        self.set_queue_budget(max_queued_bytes, overflow_policy)
+        self.dropped_messages = 0
+        self.dropped_bytes = 0
 
         self._is_running = True
         self._loop = asyncio.new_event_loop()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
 
-        self._connections = {}  # uri -> websocket connection
-        self._endpoint_queues = {}  # uri -> asyncio.Queue
-        self._endpoint_workers = {}  # uri -> asyncio.Task
-        self._endpoint_readers = {}  # uri -> asyncio.Task
-        self._endpoint_realtime = {}  # uri -> bool
-        self._endpoint_last_control = {}  # uri -> last control text payload
+        self._connections = {}  # connection key (path, or endpoint uri in fallback) -> websocket
+        self._connection_readers = {}  # connection key -> asyncio.Task
+        self._endpoint_queues = {}  # endpoint uri -> asyncio.Queue (bulk lane)
+        self._endpoint_control_lanes = {}  # endpoint uri -> deque (high-priority lane)
+        self._endpoint_queued_bytes = {}  # endpoint uri -> bytes pending in the bulk lane
+        self._endpoint_dropped = {}  # endpoint uri -> {"messages": n, "bytes": n}
+        self._overflow_warning_state = {}  # endpoint uri or (uri, lane) -> {"last": t, "suppressed": n}
+        self._endpoint_targets = {}  # endpoint uri -> (path, channel)
+        self._endpoint_realtime = {}  # endpoint uri -> bool
+        self._endpoint_last_control = {}  # endpoint uri -> last control text payload
+        # A pool is one sender task; its key is the path while channels are
+        # multiplexed, or the endpoint uri once the server turns out not to be.
+        self._endpoint_pools = {}  # endpoint uri -> pool key
+        self._pool_endpoints = {}  # pool key -> [endpoint uri]
+        self._pool_signals = {}  # pool key -> asyncio.Event
+        self._pool_workers = {}  # pool key -> asyncio.Task
+        self._pool_cursors = {}  # pool key -> next endpoint index for bulk round-robin
+        self._mux_supported = None  # None until the first handshake resolves it
 
         self._thread.start()
 
@@ -198,6 +361,43 @@ class WebSocketClientProxy:
         self._loop.run_until_complete(self._loop.shutdown_asyncgens())
         self._loop.close()
 
+    def set_queue_budget(self, max_queued_bytes=None, overflow_policy=None):
+        """Configure the byte budget and overflow policy for bulk payloads.
+
+        The budget is global: it bounds the pending bytes of all endpoints
+        (every path and channel) of this proxy together.
+
+        overflow_policy:
+          - "drop_oldest": evict the oldest pending payloads to make room,
+            starting with the incoming payload's endpoint
+          - "drop_newest": reject the incoming payload while over budget
+        """
+        if max_queued_bytes is not None:
+            self.max_queued_bytes = max(1, int(max_queued_bytes))
+        if overflow_policy is not None:
+            policy = str(overflow_policy).strip().lower()
+            self.overflow_policy = policy if policy in PROXY_OVERFLOW_POLICIES else "drop_oldest"
+
+    def get_queue_stats(self):
+        """Return pending and dropped bulk payload metrics per endpoint."""
+        queued = dict(list(self._endpoint_queued_bytes.items()))
+        dropped = {uri: dict(stats) for uri, stats in list(self._endpoint_dropped.items())}
+        return {
+            "max_queued_bytes": self.max_queued_bytes,
+            "overflow_policy": self.overflow_policy,
+            "queued_bytes": sum(queued.values()),
+            "dropped_messages": self.dropped_messages,
+            "dropped_bytes": self.dropped_bytes,
+            "endpoints": {
+                uri: {
+                    "queued_bytes": queued.get(uri, 0),
+                    "dropped_messages": dropped.get(uri, {}).get("messages", 0),
+                    "dropped_bytes": dropped.get(uri, {}).get("bytes", 0),
+                }
+                for uri in set(queued) | set(dropped)
+            },
+        }
+
     def register_path(self, path):
         """Register a path for this proxy."""
         if path not in self.paths:
@@ -222,7 +422,7 @@ class WebSocketClientProxy:
                 return False
             if isinstance(data, (bytes, bytearray)) and len(data) >= 8:
                 try:
-                    _, meta = struct.unpack(">II", data[:8])
+                    _, meta = struct.unpack_from(IMAGE_HEADER_FORMAT, data)
                     frame_total = meta & 0xFF
                     return frame_total <= 1
                 except Exception:
@@ -236,70 +436,138 @@ class WebSocketClientProxy:
         except Exception:
             return False
 
+    def _endpoint_uri(self, path, channel):
+        return f"ws://{self.host}:{self.port}{path}?channel={int(channel)}"
+
     def _ensure_endpoint_worker(self, uri, realtime=False):
         queue = self._endpoint_queues.get(uri)
         if queue is None:
             # Realtime paths use bounded queue to avoid unbounded lag buildup.
             queue = asyncio.Queue(maxsize=1 if self._is_realtime_uri(uri) else 0)
             self._endpoint_queues[uri] = queue
+            self._endpoint_control_lanes[uri] = deque()
             self._endpoint_realtime[uri] = bool(realtime)
-            self._endpoint_workers[uri] = self._loop.create_task(self._endpoint_worker(uri, queue))
+
+            parsed = urllib.parse.urlparse(uri)
+            path = parsed.path or "/"
+            channel = int(urllib.parse.parse_qs(parsed.query).get("channel", ["1"])[0])
+            self._endpoint_targets[uri] = (path, channel)
+            self._add_to_pool(uri if self._mux_supported is False else path, uri)
         elif realtime:
             self._endpoint_realtime[uri] = True
         return queue
 
-    async def _endpoint_worker(self, uri, queue):
-        websocket = None
+    def _add_to_pool(self, pool_key, uri):
+        self._endpoint_pools[uri] = pool_key
+        self._pool_endpoints.setdefault(pool_key, []).append(uri)
+        if pool_key not in self._pool_workers:
+            signal = asyncio.Event()
+            self._pool_signals[pool_key] = signal
+            self._pool_workers[pool_key] = self._loop.create_task(self._pool_worker(pool_key, signal))
+
+    def _split_pool(self, pool_key):
+        """Give every endpoint of a path pool its own worker (non-multiplexing server).
+
+        Per-endpoint sockets then connect, fail and back off independently, so
+        a slow or unreachable channel does not stall the others.
+        """
+        uris = self._pool_endpoints.pop(pool_key, [])
+        self._pool_signals.pop(pool_key, None)
+        self._pool_workers.pop(pool_key, None)
+        self._pool_cursors.pop(pool_key, None)
+        for uri in uris:
+            self._add_to_pool(uri, uri)
+
+    def _wake_pool_worker(self, uri):
+        pool_key = getattr(self, "_endpoint_pools", {}).get(uri)
+        if pool_key is None:
+            return
+        signal = self._pool_signals.get(pool_key)
+        if signal is not None:
+            signal.set()
+
+    def _next_pool_item(self, pool_key):
+        """Return the next (uri, payload) for a pool, or None when all lanes are empty.
+
+        Control lanes are always drained first; bulk lanes are served
+        round-robin so channels share the connection fairly.
+        """
+        uris = self._pool_endpoints.get(pool_key, [])
+        for uri in uris:
+            lane = self._endpoint_control_lanes.get(uri)
+            if lane:
+                return uri, lane.popleft()
+
+        count = len(uris)
+        start = self._pool_cursors.get(pool_key, 0)
+        for offset in range(count):
+            uri = uris[(start + offset) % count]
+            queue = self._endpoint_queues.get(uri)
+            if queue is None:
+                continue
+            try:
+                data = self._bulk_get_nowait(uri, queue)
+            except asyncio.QueueEmpty:
+                continue
+
+            self._pool_cursors[pool_key] = (start + offset + 1) % count
+            if self._endpoint_realtime.get(uri, False):
+                coalesced = 0
+                while True:
+                    try:
+                        data = self._bulk_get_nowait(uri, queue)
+                    except asyncio.QueueEmpty:
+                        break
+                    coalesced += 1
+                if coalesced and self.debug:
+                    print(
+                        f"[WebSocketClientProxy] Realtime worker coalesced {coalesced} "
+                        f"pending payload(s) for {uri}; sending latest "
+                        f"{_describe_ws_uri_payload(uri, data)}"
+                    )
+            return uri, data
+        return None
+
+    async def _pool_worker(self, pool_key, signal):
         reconnect_backoff = 0.5
         sent_count = 0
 
         while self._is_running:
-            try:
-                data = await queue.get()
-            except asyncio.CancelledError:
-                break
-
-            if data is None and not self._is_running:
-                break
+            item = self._next_pool_item(pool_key)
+            if item is None:
+                signal.clear()
+                try:
+                    await signal.wait()
+                except asyncio.CancelledError:
+                    break
+                continue
 
+            uri, data = item
+            payload = data
+            conn_key = None
+            websocket = None
+            sent = False
             try:
-                coalesced = 0
-                if self._endpoint_realtime.get(uri, False):
-                    while True:
-                        try:
-                            newer_data = queue.get_nowait()
-                        except asyncio.QueueEmpty:
-                            break
-                        data = newer_data
-                        coalesced += 1
-                    if coalesced and self.debug:
-                        print(
-                            f"[WebSocketClientProxy] Realtime worker coalesced {coalesced} "
-                            f"pending payload(s) for {uri}; sending latest "
-                            f"{_describe_ws_uri_payload(uri, data)}"
+                conn_key, websocket, channel = await self._ensure_connection(self._endpoint_targets[uri][0], uri)
+                if channel is not None:
+                    frame_size = _payload_size(data) + 1
+                    if frame_size > WEBSOCKET_MAX_MESSAGE_BYTES:
+                        # The server would close the shared connection (1009) for every channel.
+                        stats = self._count_drop(uri, payload)
+                        self._warn_throttled(
+                            (uri, "oversize"),
+                            f"Dropped {_describe_ws_uri_payload(uri, payload)} for {uri}: "
+                            f"{frame_size}B multiplexed frame exceeds {WEBSOCKET_MAX_MESSAGE_BYTES}B "
+                            f"total_dropped_bytes={stats['bytes']}",
                         )
-
-                if _ws_is_closed(websocket):
-                    websocket = await asyncio.wait_for(
-                        websockets.connect(
-                            uri,
-                            ping_interval=20,
-                            ping_timeout=20,
-                            max_size=WEBSOCKET_MAX_MESSAGE_BYTES,
-                            compression=None,
-                        ),
-                        timeout=5.0,
-                    )
-                    self._connections[uri] = websocket
-                    self._cancel_endpoint_reader(uri)
-                    self._endpoint_readers[uri] = self._loop.create_task(self._endpoint_reader(uri, websocket))
-                    reconnect_backoff = 0.5
-                    sent_count = 0
-                    if self.debug:
-                        print(f"[WebSocketClientProxy] Connected: {uri}")
-
+                        continue
+                    data = _encode_mux_frame(channel, data)
                 await websocket.send(data)
+                sent = True
                 sent_count += 1
+                reconnect_backoff = 0.5
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 if self.debug:
                     ws_close_code = getattr(websocket, "close_code", None) if websocket is not None else None
@@ -309,28 +577,105 @@ class WebSocketClientProxy:
                         f"(sent={sent_count}, ws_close_code={ws_close_code}, ws_close_reason={ws_close_reason})"
                     )
 
-                if websocket is not None:
-                    try:
-                        await websocket.close()
-                    except Exception:
-                        pass
-                websocket = None
-                self._connections.pop(uri, None)
-                self._cancel_endpoint_reader(uri)
+                if conn_key is not None:
+                    await self._close_connection(conn_key)
+                sent_count = 0
+                # The dequeued payload is not retried; account for it as dropped.
+                self._count_drop(uri, payload)
+
+            if self._mux_supported is False and pool_key not in self._endpoint_targets:
+                # The server does not multiplex: hand this path's endpoints to
+                # their own workers once the item in hand is settled, so order
+                # per endpoint is kept.
+                self._split_pool(pool_key)
+                return
 
+            if not sent:
                 # Keep behavior resilient for temporary disconnects.
                 await asyncio.sleep(reconnect_backoff)
                 reconnect_backoff = min(reconnect_backoff * 2, 5.0)
 
+    async def _ensure_connection(self, path, uri):
+        """Return (connection key, websocket, mux channel or None) for an endpoint."""
+        if self._mux_supported is not False:
+            websocket = self._connections.get(path)
+            if not _ws_is_closed(websocket):
+                return path, websocket, self._endpoint_targets[uri][1]
+
+            websocket = await self._connect_mux(path)
+            if websocket is not None:
+                self._register_connection(path, websocket)
+                return path, websocket, self._endpoint_targets[uri][1]
+
+        websocket = self._connections.get(uri)
+        if _ws_is_closed(websocket):
+            websocket = await asyncio.wait_for(
+                websockets.connect(
+                    f"{uri}&client={PROXY_OUTPUT_CLIENT_NAME}",
+                    ping_interval=20,
+                    ping_timeout=20,
+                    max_size=WEBSOCKET_MAX_MESSAGE_BYTES,
+                    compression=None,
+                ),
+                timeout=5.0,
+            )
+            self._register_connection(uri, websocket)
+        return uri, websocket, None
+
+    async def _connect_mux(self, path):
+        """Open a multiplexed connection for path, or return None if unsupported.
+
+        Connection errors propagate so a down server does not disable pooling.
+        """
+        mux_uri = f"ws://{self.host}:{self.port}{path}?mux=1&client={PROXY_OUTPUT_CLIENT_NAME}"
+        websocket = await asyncio.wait_for(
+            websockets.connect(
+                mux_uri,
+                ping_interval=20,
+                ping_timeout=20,
+                max_size=WEBSOCKET_MAX_MESSAGE_BYTES,
+                compression=None,
+            ),
+            timeout=5.0,
+        )
+        try:
+            ack = await asyncio.wait_for(websocket.recv(), timeout=PROXY_MUX_HANDSHAKE_TIMEOUT_SECONDS)
+        except Exception:
+            ack = None
+
+        if ack == PROXY_MUX_ACK:
+            self._mux_supported = True
+            return websocket
+
+        self._mux_supported = False
+        if self.debug:
+            print(
+                f"[WebSocketClientProxy] Server {self.host}:{self.port} did not acknowledge "
+                f"multiplexing; using one connection per endpoint"
+            )
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+        return None
+
+    def _register_connection(self, conn_key, websocket):
+        self._connections[conn_key] = websocket
+        self._cancel_connection_reader(conn_key)
+        self._connection_readers[conn_key] = self._loop.create_task(self._connection_reader(conn_key, websocket))
+        if self.debug:
+            print(f"[WebSocketClientProxy] Connected: {conn_key} (mux={self._mux_supported})")
+
+    async def _close_connection(self, conn_key):
+        websocket = self._connections.pop(conn_key, None)
+        self._cancel_connection_reader(conn_key)
         if websocket is not None:
             try:
                 await websocket.close()
             except Exception:
                 pass
-        self._connections.pop(uri, None)
-        self._cancel_endpoint_reader(uri)
 
-    async def _endpoint_reader(self, uri, websocket):
+    async def _connection_reader(self, conn_key, websocket):
         try:
             async for _ in websocket:
                 # Drain inbound messages to avoid receiver backpressure disconnects.
@@ -338,81 +683,170 @@ class WebSocketClientProxy:
         except websockets.exceptions.ConnectionClosed as e:
             if self.debug:
                 print(
-                    f"[WebSocketClientProxy] Reader closed for {uri}: "
+                    f"[WebSocketClientProxy] Reader closed for {conn_key}: "
                     f"{type(e).__name__}(code={e.code}, reason={e.reason})"
                 )
         except Exception as e:
             if self.debug:
-                print(f"[WebSocketClientProxy] Reader closed for {uri}: {type(e).__name__}: {e}")
+                print(f"[WebSocketClientProxy] Reader closed for {conn_key}: {type(e).__name__}: {e}")
         finally:
             if self.debug:
                 ws_close_code = getattr(websocket, "close_code", None)
                 ws_close_reason = getattr(websocket, "close_reason", None)
                 print(
-                    f"[WebSocketClientProxy] Reader finalized for {uri} "
+                    f"[WebSocketClientProxy] Reader finalized for {conn_key} "
                     f"(ws_close_code={ws_close_code}, ws_close_reason={ws_close_reason})"
                 )
 
-    def _cancel_endpoint_reader(self, uri):
-        task = self._endpoint_readers.pop(uri, None)
+    def _cancel_connection_reader(self, conn_key):
+        task = self._connection_readers.pop(conn_key, None)
         if task is not None and not task.done():
             task.cancel()
 
     def _enqueue_message(self, uri, data, realtime=False):
         if not self._is_running:
             return
+        self._put_endpoint_message(uri, data, realtime=realtime)
+        self._wake_pool_worker(uri)
+
+    def _is_control_payload(self, uri, data):
+        if not isinstance(data, str) or len(data) > PROXY_CONTROL_MAX_BYTES:
+            return False
+        # Only realtime paths (where frames are coalesced anyway) and tagged
+        # settings may jump the queue; everything else must stay in order.
+        return self._is_realtime_uri(uri) or data.startswith(PROXY_SETTINGS_PREFIX)
+
+    def _put_control_message(self, uri, data):
+        lane = self._endpoint_control_lanes.get(uri)
+        if lane is None:
+            lane = deque()
+            self._endpoint_control_lanes[uri] = lane
+        if len(lane) >= PROXY_CONTROL_LANE_MAX_MESSAGES:
+            dropped = lane.popleft()
+            self._count_drop(uri, dropped)
+            self._warn_throttled(
+                (uri, "control"),
+                f"Control lane full for {uri}; dropped oldest of {PROXY_CONTROL_LANE_MAX_MESSAGES} "
+                f"pending control messages",
+            )
+        lane.append(data)
+
+    def _bulk_get_nowait(self, uri, queue):
+        data = queue.get_nowait()
+        remaining = self._endpoint_queued_bytes.get(uri, 0) - _payload_size(data)
+        self._endpoint_queued_bytes[uri] = max(0, remaining)
+        return data
+
+    def _bulk_put_nowait(self, uri, queue, data):
+        queue.put_nowait(data)
+        self._endpoint_queued_bytes[uri] = self._endpoint_queued_bytes.get(uri, 0) + _payload_size(data)
+
+    def _count_drop(self, uri, data):
+        size = _payload_size(data)
+        self.dropped_messages += 1
+        self.dropped_bytes += size
+        stats = self._endpoint_dropped.setdefault(uri, {"messages": 0, "bytes": 0})
+        stats["messages"] += 1
+        stats["bytes"] += size
+        return stats
+
+    def _warn_throttled(self, key, message):
+        now = time.monotonic()
+        state = self._overflow_warning_state.setdefault(key, {"last": 0.0, "suppressed": 0})
+        if state["last"] > 0 and now - state["last"] < REALTIME_SKIP_WARNING_INTERVAL_SECONDS:
+            state["suppressed"] += 1
+            return
+        suppressed_text = f" dropped_since_last={state['suppressed']}" if state["suppressed"] else ""
+        state["suppressed"] = 0
+        state["last"] = now
+        print(f"[WebSocketClientProxy][WARNING] {message}{suppressed_text}", flush=True)
+
+    def _record_overflow_drop(self, uri, data):
+        stats = self._count_drop(uri, data)
+        self._warn_throttled(
+            uri,
+            f"Queue budget {self.max_queued_bytes}B exceeded for {uri} "
+            f"(policy={self.overflow_policy}); dropped {_describe_ws_uri_payload(uri, data)} "
+            f"total_dropped_bytes={stats['bytes']}",
+        )
+
+    def _total_queued_bytes(self):
+        return sum(self._endpoint_queued_bytes.values())
+
+    def _eviction_order(self, uri):
+        """Endpoints to evict from under drop_oldest: the incoming one first, then other bulk lanes."""
+        others = [
+            other for other in self._endpoint_queues
+            if other != uri and not self._endpoint_realtime.get(other, False) and not self._is_realtime_uri(other)
+        ]
+        return [uri] + others
+
+    def _put_budgeted_message(self, uri, queue, data):
+        size = _payload_size(data)
+        budget = self.max_queued_bytes
+        if size > budget:
+            self._record_overflow_drop(uri, data)
+            return
+
+        if self.overflow_policy == "drop_oldest":
+            for victim in self._eviction_order(uri):
+                victim_queue = self._endpoint_queues.get(victim, queue)
+                while self._total_queued_bytes() + size > budget:
+                    try:
+                        self._record_overflow_drop(victim, self._bulk_get_nowait(victim, victim_queue))
+                    except asyncio.QueueEmpty:
+                        break
+                if self._total_queued_bytes() + size <= budget:
+                    break
+
+        if self._total_queued_bytes() + size > budget:
+            self._record_overflow_drop(uri, data)
+            return
+
+        self._bulk_put_nowait(uri, queue, data)
+
+    def _put_endpoint_message(self, uri, data, realtime=False):
         queue = self._ensure_endpoint_worker(uri, realtime=realtime)
         if realtime:
             self._endpoint_realtime[uri] = True
 
-        if self._is_realtime_uri(uri):
-            # Control messages on realtime paths should not starve frame delivery.
-            # Deduplicate unchanged control payloads and enqueue as best-effort only.
-            if isinstance(data, str):
+        if self._is_control_payload(uri, data):
+            if self._is_realtime_uri(uri):
+                # Settings are often resent every tick on realtime paths;
+                # only forward changes.
                 if self._endpoint_last_control.get(uri) == data:
                     return
-                try:
-                    queue.put_nowait(data)
-                    # Mark as delivered to queue only after successful enqueue.
-                    self._endpoint_last_control[uri] = data
-                except asyncio.QueueFull:
-                    # Drop control update when a realtime frame is already pending.
-                    pass
-                return
+                self._endpoint_last_control[uri] = data
+            self._put_control_message(uri, data)
+            return
 
+        if self._is_realtime_uri(uri):
             # Keep only the latest pending payload for realtime endpoints.
             try:
                 while True:
-                    queue.get_nowait()
+                    self._bulk_get_nowait(uri, queue)
             except asyncio.QueueEmpty:
                 pass
             try:
-                queue.put_nowait(data)
+                self._bulk_put_nowait(uri, queue, data)
             except asyncio.QueueFull:
-                try:
-                    queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-                try:
-                    queue.put_nowait(data)
-                except asyncio.QueueFull:
-                    pass
+                pass
             return
 
         if realtime:
             try:
-                queue.put_nowait(data)
+                self._bulk_put_nowait(uri, queue, data)
             except asyncio.QueueFull:
                 try:
-                    queue.get_nowait()
+                    self._bulk_get_nowait(uri, queue)
                 except asyncio.QueueEmpty:
                     pass
                 try:
-                    queue.put_nowait(data)
+                    self._bulk_put_nowait(uri, queue, data)
                 except asyncio.QueueFull:
                     pass
             return
-        queue.put_nowait(data)
+        self._put_budgeted_message(uri, queue, data)
 
     def send_to_channel(self, path, channel, data):
         """Send data to a channel via persistent WebSocket client connection."""
@@ -431,7 +865,7 @@ class WebSocketClientProxy:
         except Exception:
             return
 
-        uri = f"ws://{self.host}:{self.port}{path}?channel={channel_int}&client=comfyui-output"
+        uri = self._endpoint_uri(path, channel_int)
         realtime = self._is_realtime_payload(path, data)
 
         try:
@@ -440,14 +874,20 @@ class WebSocketClientProxy:
             if self.debug:
                 print("[WebSocketClientProxy] Loop is closed; dropping message")
 
+    def send_renditions_to_channel(self, path, channel, renditions):
+        """Send the highest rendition; the external server does its own fan-out."""
+        if not renditions:
+            return
+        self.send_to_channel(path, channel, renditions[0])
+
     async def _shutdown_async(self):
-        workers = [task for task in self._endpoint_workers.values() if task and not task.done()]
+        workers = [task for task in self._pool_workers.values() if task and not task.done()]
         for task in workers:
             task.cancel()
         if workers:
             await asyncio.gather(*workers, return_exceptions=True)
 
-        readers = [task for task in self._endpoint_readers.values() if task and not task.done()]
+        readers = [task for task in self._connection_readers.values() if task and not task.done()]
         for task in readers:
             task.cancel()
         if readers:
@@ -460,9 +900,17 @@ class WebSocketClientProxy:
                 pass
 
         self._connections.clear()
-        self._endpoint_workers.clear()
-        self._endpoint_readers.clear()
+        self._connection_readers.clear()
+        self._pool_workers.clear()
+        self._pool_signals.clear()
+        self._pool_endpoints.clear()
+        self._endpoint_pools.clear()
         self._endpoint_queues.clear()
+        self._endpoint_control_lanes.clear()
+        self._endpoint_queued_bytes.clear()
+        self._overflow_warning_state.clear()
+        self._pool_cursors.clear()
+        self._endpoint_targets.clear()
         self._endpoint_realtime.clear()
         self._endpoint_last_control.clear()
 
@@ -502,6 +950,9 @@ class WebSocketClientProxy:
 
 
 class SimpleWebSocketServer:
+    # Clients are served locally, so each can get its own rendition.
+    supports_renditions = True
+
     def __init__(self, host, port, debug=False, compression=None):
         host, port = _normalize_endpoint(host, port)
         self.host = host
@@ -517,6 +968,11 @@ class SimpleWebSocketServer:
         self._realtime_pending = {}
         self._realtime_send_tasks = {}
         self._realtime_skip_warning_state = {}
+        self._client_throughput = {}  # websocket -> deque of (t, bytes, busy seconds)
+        self._client_renditions = {}  # websocket -> {"index": i, "changed": t}
+        self._frame_intervals = {}  # (path, channel) -> {"last": t, "interval": s}
+        self._mux_connections = set()  # multiplexed proxy uplinks
+        self._latency_stats = {}  # (path, channel) -> LatencyStats for traced /image frames
         self._conn_id_seq = 0
 
         self.loop = asyncio.new_event_loop()
@@ -601,7 +1057,7 @@ class SimpleWebSocketServer:
                 return False
             if isinstance(data, (bytes, bytearray)) and len(data) >= 8:
                 try:
-                    _, meta = struct.unpack(">II", data[:8])
+                    _, meta = struct.unpack_from(IMAGE_HEADER_FORMAT, data)
                     frame_total = meta & 0xFF
                     return frame_total <= 1
                 except Exception:
@@ -631,7 +1087,7 @@ class SimpleWebSocketServer:
 
         return failed_clients
 
-    async def _broadcast_channel(self, path, channel, data, exclude=None):
+    async def _broadcast_channel(self, path, channel, data, exclude=None, renditions=None):
         channel_map = self.clients.get(path)
         if not channel_map:
             return
@@ -644,19 +1100,167 @@ class SimpleWebSocketServer:
         if exclude is not None:
             snapshot = [client for client in snapshot if client != exclude]
 
+        self._record_relay_latency(path, channel, data)
+
+        if renditions:
+            self._update_frame_interval(path, channel)
+
         if self._is_realtime_payload(path, data):
-            self._broadcast_channel_realtime(path, channel, snapshot, data)
+            self._broadcast_channel_realtime(path, channel, snapshot, data, renditions=renditions)
             return
 
-        failed_clients = await self._broadcast_to_clients(
-            snapshot, data, send_timeout=2.0, path=path, channel=channel
-        )
+        if renditions and len(renditions) > 1:
+            # Reliable payloads still honour the ladder, grouped per rendition.
+            groups = {}
+            for client in snapshot:
+                payload = self._select_rendition(path, channel, client, renditions)
+                groups.setdefault(id(payload), (payload, []))[1].append(client)
+            failed_clients = []
+            for payload, group_clients in groups.values():
+                failed_clients.extend(await self._broadcast_to_clients(
+                    group_clients, payload, send_timeout=2.0, path=path, channel=channel
+                ))
+        else:
+            failed_clients = await self._broadcast_to_clients(
+                snapshot, data, send_timeout=2.0, path=path, channel=channel
+            )
 
         for failed in failed_clients:
             if failed in channel_clients:
                 channel_clients.remove(failed)
 
-    def _broadcast_channel_realtime(self, path, channel, clients, data):
+    def _record_relay_latency(self, path, channel, data):
+        if path != "/image" or not isinstance(data, (bytes, bytearray)):
+            return
+        if len(data) < IMAGE_EXTENDED_HEADER_SIZE or data[3] != IMAGE_RAW_TYPE_EXTENDED:
+            return
+        header = unpack_image_header(data)
+        stats_map = getattr(self, "_latency_stats", None)
+        if stats_map is None:
+            stats_map = {}
+            self._latency_stats = stats_map
+        stats = stats_map.get((path, channel))
+        if stats is None:
+            stats = LatencyStats()
+            stats_map[(path, channel)] = stats
+        stats.record_since(header["send_timestamp_us"])
+
+    def get_latency_stats(self):
+        """Return send->relay latency summaries per (path, channel) for traced frames."""
+        stats_map = getattr(self, "_latency_stats", {})
+        return {key: {"relay": stats.summary()} for key, stats in list(stats_map.items())}
+
+    def _update_frame_interval(self, path, channel):
+        state_map = getattr(self, "_frame_intervals", None)
+        if state_map is None:
+            state_map = {}
+            self._frame_intervals = state_map
+
+        now = time.monotonic()
+        state = state_map.get((path, channel))
+        if state is None:
+            state_map[(path, channel)] = {"last": now, "interval": None}
+            return
+
+        elapsed = now - state["last"]
+        state["last"] = now
+        if elapsed <= 0:
+            return
+        previous = state["interval"]
+        if previous is None:
+            state["interval"] = elapsed
+        else:
+            state["interval"] = previous + RENDITION_EWMA_ALPHA * (elapsed - previous)
+
+    def _record_client_throughput(self, client, size, elapsed, now=None):
+        throughput_map = getattr(self, "_client_throughput", None)
+        if throughput_map is None:
+            throughput_map = {}
+            self._client_throughput = throughput_map
+
+        samples = throughput_map.get(client)
+        if samples is None:
+            samples = deque(maxlen=RENDITION_THROUGHPUT_WINDOW_SAMPLES)
+            throughput_map[client] = samples
+        samples.append((time.monotonic() if now is None else now, size, max(0.0, elapsed)))
+
+    def _client_throughput_estimate(self, client, now=None):
+        """Bytes/sec over the client's recent sends, or None without samples in the window."""
+        samples = getattr(self, "_client_throughput", {}).get(client)
+        if not samples:
+            return None
+        now = time.monotonic() if now is None else now
+        while samples and now - samples[0][0] > RENDITION_THROUGHPUT_WINDOW_SECONDS:
+            samples.popleft()
+        if not samples:
+            return None
+        total_bytes = sum(sample[1] for sample in samples)
+        busy = sum(sample[2] for sample in samples)
+        return total_bytes / max(busy, RENDITION_MIN_BUSY_SECONDS)
+
+    def _select_rendition(self, path, channel, client, renditions, now=None):
+        """Pick the highest rendition the client's measured throughput can sustain.
+
+        ``renditions`` is ordered from highest to lowest quality. Clients without
+        a throughput estimate yet start on the highest rendition. Downgrades
+        apply at once; upgrades move one rendition per probe interval.
+        """
+        if len(renditions) == 1:
+            return renditions[0]
+
+        state_map = getattr(self, "_client_renditions", None)
+        if state_map is None:
+            state_map = {}
+            self._client_renditions = state_map
+        now = time.monotonic() if now is None else now
+        last = len(renditions) - 1
+        state = state_map.get(client)
+        if state is None:
+            state = {"index": 0, "changed": now}
+            state_map[client] = state
+        current = min(state["index"], last)
+
+        throughput = self._client_throughput_estimate(client, now=now)
+        interval_state = getattr(self, "_frame_intervals", {}).get((path, channel))
+        interval = interval_state.get("interval") if interval_state else None
+        if not interval:
+            target = current
+        elif throughput is None:
+            # Nothing measured recently: probe one rendition up.
+            target = 0
+        else:
+            budget = throughput * interval * RENDITION_THROUGHPUT_HEADROOM
+            target = next((i for i, payload in enumerate(renditions) if len(payload) <= budget), last)
+
+        if target > current:
+            current = target
+            state["changed"] = now
+        elif target < current and now - state["changed"] >= RENDITION_PROBE_INTERVAL_SECONDS:
+            current -= 1
+            state["changed"] = now
+        state["index"] = current
+        return renditions[current]
+
+    async def _wait_for_drain(self, client):
+        """Wait until the client's socket write buffer is flushed to the kernel."""
+        transport = getattr(client, "transport", None)
+        if transport is None or not hasattr(transport, "get_write_buffer_size"):
+            return
+        deadline = time.monotonic() + RENDITION_DRAIN_TIMEOUT_SECONDS
+        while transport.get_write_buffer_size() > 0 and not transport.is_closing():
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(RENDITION_DRAIN_POLL_SECONDS)
+
+    async def _timed_send(self, client, data):
+        # send() returns once the frame is buffered; the drain wait makes the
+        # sample reflect how fast the client actually takes the bytes.
+        started = time.monotonic()
+        await client.send(data)
+        await self._wait_for_drain(client)
+        self._record_client_throughput(client, len(data), time.monotonic() - started)
+
+    def _broadcast_channel_realtime(self, path, channel, clients, data, renditions=None):
         for client in clients:
             if _ws_is_closed(client):
                 channel_clients = self.clients.get(path, {}).get(channel, [])
@@ -674,7 +1278,11 @@ class SimpleWebSocketServer:
                     self._warn_realtime_skip_busy_client(path, channel, client, data)
                     continue
 
-            send_task = asyncio.create_task(client.send(data))
+            if renditions:
+                payload = self._select_rendition(path, channel, client, renditions)
+                send_task = asyncio.create_task(self._timed_send(client, payload))
+            else:
+                send_task = asyncio.create_task(client.send(data))
             self._realtime_send_tasks[task_key] = send_task
             send_task.add_done_callback(
                 lambda t, p=path, ch=channel, c=client: self._on_realtime_send_done(p, ch, c, t)
@@ -761,6 +1369,14 @@ class SimpleWebSocketServer:
         channel_str = params.get("channel", [None])[0]
         client_name = params.get("client", [""])[0] or ""
 
+        if params.get("mux", [""])[0] == "1":
+            try:
+                await self._handle_mux_connection(websocket, resource_path, conn_id, client_name)
+            finally:
+                if task is not None and task in self._connection_tasks:
+                    self._connection_tasks.remove(task)
+            return
+
         try:
             channel = int(channel_str)
             if channel < 1 or channel > 8:
@@ -853,6 +1469,8 @@ class SimpleWebSocketServer:
             if websocket in channel_clients:
                 channel_clients.remove(websocket)
             self._realtime_skip_warning_state.pop((resource_path, channel, websocket), None)
+            self._client_throughput.pop(websocket, None)
+            self._client_renditions.pop(websocket, None)
 
             if task is not None and task in self._connection_tasks:
                 self._connection_tasks.remove(task)
@@ -868,7 +1486,52 @@ class SimpleWebSocketServer:
                     f"last_rx={rx_last_desc}, close_code={close_code}, close_reason={close_reason})"
                 )
 
-    async def _send_to_channel_async(self, path, channel, data):
+    async def _handle_mux_connection(self, websocket, resource_path, conn_id, client_name):
+        """Relay a multiplexed proxy connection that publishes into any channel.
+
+        The connection is acknowledged with PROXY_MUX_ACK and never joins a
+        channel client list, so it only carries uplink traffic.
+        """
+        setattr(websocket, "_vrch_conn_id", conn_id)
+        setattr(websocket, "_vrch_client_name", client_name)
+        mux_connections = getattr(self, "_mux_connections", None)
+        if mux_connections is None:
+            mux_connections = set()
+            self._mux_connections = mux_connections
+        mux_connections.add(websocket)
+
+        if self.debug:
+            print(
+                f"[SimpleWebSocketServer] New multiplexed connection id={conn_id} "
+                f"from {websocket.remote_address} on path '{resource_path}'"
+            )
+
+        try:
+            await websocket.send(PROXY_MUX_ACK)
+            async for message in websocket:
+                channel, payload = _decode_mux_frame(message)
+                if channel is None:
+                    if self.debug:
+                        print(
+                            f"[SimpleWebSocketServer] Dropping malformed multiplexed frame "
+                            f"on {resource_path} id={conn_id}"
+                        )
+                    continue
+                await self._broadcast_channel(resource_path, channel, payload, exclude=websocket)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            if self.debug:
+                print(
+                    f"[SimpleWebSocketServer] Multiplexed reader exception on {resource_path} "
+                    f"id={conn_id}: {type(e).__name__}: {e}"
+                )
+        finally:
+            mux_connections.discard(websocket)
+            if self.debug:
+                print(f"[SimpleWebSocketServer] Multiplexed connection closed id={conn_id} on {resource_path}")
+
+    async def _send_to_channel_async(self, path, channel, data, renditions=None):
         channel_map = self.clients.get(path)
         if not channel_map or channel not in channel_map:
             if self.debug:
@@ -879,19 +1542,20 @@ class SimpleWebSocketServer:
         if self.debug:
             print(f"[SimpleWebSocketServer] Sending {len(str(data))} bytes to {path} channel {channel} with {len(clients)} client(s)")
 
-        await self._broadcast_channel(path, channel, data, exclude=None)
+        await self._broadcast_channel(path, channel, data, exclude=None, renditions=renditions)
 
-    def _queue_realtime_send(self, path, channel, data):
+    def _queue_realtime_send(self, path, channel, data, renditions=None):
         if not self._is_running:
             return
 
         key = (path, channel)
         state = self._realtime_pending.get(key)
         if state is None:
-            state = {"latest": None, "sending": False}
+            state = {"latest": None, "renditions": None, "sending": False}
             self._realtime_pending[key] = state
 
         state["latest"] = data
+        state["renditions"] = renditions
         if not state["sending"]:
             state["sending"] = True
             self.loop.create_task(self._flush_realtime_send(path, channel))
@@ -904,13 +1568,15 @@ class SimpleWebSocketServer:
                 return
 
             payload = state.get("latest")
+            renditions = state.get("renditions")
             state["latest"] = None
+            state["renditions"] = None
             if payload is None:
                 state["sending"] = False
                 return
 
             try:
-                await self._send_to_channel_async(path, channel, payload)
+                await self._send_to_channel_async(path, channel, payload, renditions=renditions)
             except Exception as e:
                 if self.debug:
                     print(f"[SimpleWebSocketServer] Realtime send failed on {path} channel {channel}: {e}")
@@ -924,6 +1590,9 @@ class SimpleWebSocketServer:
 
     def send_to_channel(self, path, channel, data):
         """Send data to all clients on a specific path and channel."""
+        self._dispatch_send(path, channel, data)
+
+    def _dispatch_send(self, path, channel, data, renditions=None):
         if not getattr(self, "_is_running", False):
             return
         loop = getattr(self, "loop", None)
@@ -937,7 +1606,7 @@ class SimpleWebSocketServer:
 
         if self._is_realtime_payload(path, data):
             try:
-                loop.call_soon_threadsafe(self._queue_realtime_send, path, channel_int, data)
+                loop.call_soon_threadsafe(self._queue_realtime_send, path, channel_int, data, renditions)
             except RuntimeError:
                 if self.debug:
                     print(f"[SimpleWebSocketServer] Realtime schedule failed for {path} channel {channel_int}")
@@ -946,7 +1615,7 @@ class SimpleWebSocketServer:
         future = None
         try:
             future = asyncio.run_coroutine_threadsafe(
-                self._send_to_channel_async(path, channel_int, data),
+                self._send_to_channel_async(path, channel_int, data, renditions=renditions),
                 loop,
             )
             future.result(timeout=2.0)
@@ -959,6 +1628,18 @@ class SimpleWebSocketServer:
             if self.debug:
                 print(f"[SimpleWebSocketServer] Failed to schedule send: {e}")
 
+    def send_renditions_to_channel(self, path, channel, renditions):
+        """Send a rendition ladder (highest quality first) to a path and channel.
+
+        Each client receives the highest rendition its measured throughput can
+        sustain at the current frame rate. Renditions are encoded once by the
+        caller and shared by every client routed to them.
+        """
+        renditions = [payload for payload in (renditions or []) if payload]
+        if not renditions:
+            return
+        self._dispatch_send(path, channel, renditions[0], renditions=tuple(renditions))
+
     async def _shutdown_async(self):
         if self.server is not None:
             self.server.close()
@@ -968,7 +1649,7 @@ class SimpleWebSocketServer:
                 pass
             self.server = None
 
-        all_clients = []
+        all_clients = list(getattr(self, "_mux_connections", ()))
         for channel_map in self.clients.values():
             for client_list in channel_map.values():
                 all_clients.extend(list(client_list))
@@ -988,6 +1669,10 @@ class SimpleWebSocketServer:
             for channel in self.clients[path]:
                 self.clients[path][channel].clear()
         self._realtime_pending.clear()
+        self._client_throughput.clear()
+        self._client_renditions.clear()
+        self._frame_intervals.clear()
+        self._latency_stats.clear()
 
         pending_tasks = [task for task in self._realtime_send_tasks.values() if task and not task.done()]
         for task in pending_tasks:
@@ -1,23 +1,55 @@
 import hashlib
+import inspect
 import io
 import json
 import time
 import struct
 import base64
 import re
-import tempfile
+import subprocess
 import numpy as np
 import asyncio
 import websockets
 import threading
 import torch
 import urllib.parse
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import ffmpeg
-import torchaudio
 from PIL import Image
 from .node_utils import VrchNodeUtils
-from .utils.websocket_server import WEBSOCKET_MAX_MESSAGE_BYTES, get_global_server
+from .utils.websocket_server import (
+    IMAGE_EXTENDED_HEADER_SIZE,
+    IMAGE_HEADER_SIZE,
+    IMAGE_RAW_TYPE_EXTENDED,
+    PROXY_DEFAULT_MAX_QUEUED_BYTES,
+    PROXY_OVERFLOW_POLICIES,
+    WEBSOCKET_MAX_MESSAGE_BYTES,
+    LatencyStats,
+    get_global_server,
+    monotonic_us,
+    pack_image_header,
+    unpack_image_header,
+)
 from .midi_websocket_protocol import MidiStateParser
+from .mic_websocket_protocol import MicProtocolError, decode_mic_frame, is_mic_frame
+from .audio_websocket_protocol import (
+    FLAG_STREAM_END,
+    FLAG_STREAM_START,
+    FRAME_CLIP,
+    FRAME_STREAM,
+    AudioClip,
+    AudioProtocolError,
+    AudioStreamBuffer,
+    decode_frame as decode_audio_frame,
+    encode_clip_frame,
+    encode_stream_packet,
+    is_audio_frame,
+)
+from .utils import json_codec
+from .utils.readonly import ReadOnlyDict, freeze
+from .utils.audio_decoder import decode_audio_bytes, decode_base64_audio
 
 # Category for organizational purposes
 CATEGORY = "vrch.ai/viewer/websocket"
@@ -27,15 +59,36 @@ DEFAULT_SERVER_IP = VrchNodeUtils.get_default_ip_address(fallback_ip="0.0.0.0")
 DEFAULT_SERVER_PORT = 8001
 JSON_STATE_MAX_KEYS = 128
 JSON_STATE_CLEAR_KEY = "__clear__"
-DEFAULT_WEBSOCKET_PATHS = ["/image", "/json", "/latent", "/audio", "/video", "/text", "/midi"]
+DEFAULT_WEBSOCKET_PATHS = ["/image", "/json", "/latent", "/audio", "/video", "/text", "/midi", "/mic"]
 AUDIO_PLAYER_TRACK_MESSAGE_TYPE = "vrch_audio_player_track"
 AUDIO_PLAYER_TRACK_TARGET = "audio_player_playlist"
 AUDIO_PLAYER_TRACK_SOURCE = "comfyui_audio_sender"
+AUDIO_STREAM_MESSAGE_TYPE = "vrch_audio_stream"
+AUDIO_TRANSPORTS = ["track", "stream", "clip"]
+AUDIO_STREAM_DEFAULT_PACKET_MS = 100
 AUDIO_PLAYER_QUALITY_PRESETS_KBPS = {
     "compact": 64,
     "standard": 128,
     "high": 192,
 }
+# Downscale factors per rendition, highest quality first.
+IMAGE_RENDITION_LADDERS = {
+    "off": (1.0,),
+    "full+half": (1.0, 0.5),
+    "full+half+quarter": (1.0, 0.5, 0.25),
+}
+
+
+_image_sequence_lock = threading.Lock()
+_image_sequence = 0
+
+
+def _next_image_sequence():
+    """Process-wide sequence number for latency-traced /image frames."""
+    global _image_sequence
+    with _image_sequence_lock:
+        _image_sequence = (_image_sequence + 1) & 0xFFFFFFFFFFFFFFFF
+        return _image_sequence
 
 
 def _describe_image_binary_payload(data):
@@ -43,22 +96,51 @@ def _describe_image_binary_payload(data):
         return f"type={type(data).__name__}"
 
     size = len(data)
-    if size < 8:
+    if size < IMAGE_HEADER_SIZE:
         return f"bytes={size} header=short"
 
     try:
-        raw_type, meta = struct.unpack(">II", data[:8])
-        batch_id = (meta >> 16) & 0xFFFF
-        frame_index = (meta >> 8) & 0xFF
-        frame_total = meta & 0xFF
-        return (
-            f"type={raw_type} batch={batch_id} "
-            f"frame={frame_index}/{frame_total} bytes={size}"
+        header = unpack_image_header(data)
+        description = (
+            f"type={header['raw_type']} batch={header['batch_id']} "
+            f"frame={header['frame_index']}/{header['frame_total']} bytes={size}"
         )
+        if "sequence" in header:
+            description += f" seq={header['sequence']}"
+        return description
     except Exception as e:
         return f"bytes={size} header_error={type(e).__name__}"
 
 
+def _encode_image_renditions(img, format, ladder="off"):
+    """Encode a PIL image once per rendition in the selected ladder."""
+    scales = IMAGE_RENDITION_LADDERS.get(ladder, IMAGE_RENDITION_LADDERS["off"])
+    renditions = []
+    for scale in scales:
+        frame = img
+        if scale < 1.0:
+            size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+            frame = img.resize(size, Image.BILINEAR)
+        buf = io.BytesIO()
+        frame.save(buf, format=format)
+        renditions.append(buf.getvalue())
+    return renditions
+
+
+def _send_image_frame(server, ch, img, format, header, rendition_ladder="off"):
+    if not getattr(server, "supports_renditions", False):
+        # Proxies forward only the full-size frame; don't encode rungs nobody gets.
+        rendition_ladder = "off"
+    renditions = _encode_image_renditions(img, format, rendition_ladder)
+    if len(header) == IMAGE_EXTENDED_HEADER_SIZE and header[3] == IMAGE_RAW_TYPE_EXTENDED:
+        # Re-stamp after encoding so traced latency starts at hand-off to the server.
+        header = header[:16] + struct.pack(">Q", monotonic_us())
+    if len(renditions) > 1:
+        server.send_renditions_to_channel("/image", ch, [header + payload for payload in renditions])
+    else:
+        server.send_to_channel("/image", ch, header + renditions[0])
+
+
 class VrchWebSocketServerNode:
 
     @classmethod
@@ -73,6 +155,8 @@ class VrchWebSocketServerNode:
             "optional": {
                 "external_server_only": ("BOOLEAN", {"default": False}),
                 "debug": ("BOOLEAN", {"default": False}),
+                "proxy_queue_limit_mb": ("INT", {"default": PROXY_DEFAULT_MAX_QUEUED_BYTES // (1024 * 1024), "min": 1, "max": 4096}),
+                "proxy_overflow_policy": (list(PROXY_OVERFLOW_POLICIES), {"default": "drop_oldest"}),
             }
         }
 
@@ -82,7 +166,9 @@ class VrchWebSocketServerNode:
     OUTPUT_NODE = True
     CATEGORY = CATEGORY
 
-    def start_server(self, server, port, external_server_only=False, debug=False):
+    def start_server(self, server, port, external_server_only=False, debug=False,
+                     proxy_queue_limit_mb=PROXY_DEFAULT_MAX_QUEUED_BYTES // (1024 * 1024),
+                     proxy_overflow_policy="drop_oldest"):
         # Compose full server string
         try:
             port = int(port)
@@ -95,6 +181,9 @@ class VrchWebSocketServerNode:
         # Get or create the global server
         server_mode = "external_only" if external_server_only else "auto"
         ws_server = get_global_server(host, port, debug=debug, mode=server_mode)
+        if hasattr(ws_server, "set_queue_budget"):
+            # Only the client proxy queues payloads while the external server is unreachable.
+            ws_server.set_queue_budget(int(proxy_queue_limit_mb) * 1024 * 1024, proxy_overflow_policy)
         # Register default paths on first init or server change
         if server_changed or not getattr(self, '_initialized', False):
             for p in DEFAULT_WEBSOCKET_PATHS:
@@ -107,6 +196,13 @@ class VrchWebSocketServerNode:
         is_running = ws_server.is_running()
         if debug:
             print(f"[VrchWebSocketServerNode] Server on {host}:{port} status check. Running: {is_running}")
+            if hasattr(ws_server, "get_queue_stats"):
+                stats = ws_server.get_queue_stats()
+                print(
+                    f"[VrchWebSocketServerNode] Proxy queue on {host}:{port}: "
+                    f"queued_bytes={stats['queued_bytes']} dropped_messages={stats['dropped_messages']} "
+                    f"dropped_bytes={stats['dropped_bytes']} policy={stats['overflow_policy']}"
+                )
         return {
             "ui": {
                 "server_status": [is_running],
@@ -148,6 +244,10 @@ class VrchImageWebSocketWebViewerNode:
                 "debug": ("BOOLEAN", {"default": False}),
                 "extra_params":("STRING", {"multiline": True, "dynamicPrompts": False}),
                 "url": ("STRING", {"default": "", "multiline": True}),
+            },
+            "optional": {
+                "rendition_ladder": (list(IMAGE_RENDITION_LADDERS.keys()), {"default": "off"}),
+                "latency_trace": ("BOOLEAN", {"default": False}),
             }
         }
     RETURN_TYPES = ("IMAGE", "STRING")
@@ -176,7 +276,9 @@ class VrchImageWebSocketWebViewerNode:
                     dev_mode,
                     debug,
                     extra_params,
-                    url):
+                    url,
+                    rendition_ladder="off",
+                    latency_trace=False):
         results = []
         host, port = server.split(":")
         server = get_global_server(host, port, path="/image", debug=debug) # Ensure path is set correctly for viewer
@@ -189,13 +291,9 @@ class VrchImageWebSocketWebViewerNode:
         for index, tensor in enumerate(images):
             arr = 255.0 * tensor.cpu().numpy()
             img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
-            buf = io.BytesIO()
-            img.save(buf, format=format)
-            binary_data = buf.getvalue()
-            meta = (batch_id << 16) | ((index & 0xFF) << 8) | (batch_size & 0xFF)
-            header = struct.pack(">II", 1, meta)
-            data = header + binary_data
-            server.send_to_channel("/image", ch, data)
+            sequence = _next_image_sequence() if latency_trace else None
+            header = pack_image_header(batch_id, index, batch_size, sequence=sequence)
+            _send_image_frame(server, ch, img, format, header, rendition_ladder)
             
         # Send server settings
         if save_settings:
@@ -211,7 +309,7 @@ class VrchImageWebSocketWebViewerNode:
                     "serverMessages": server_messages,
                 }
             }
-            settings_json = json.dumps(settings)
+            settings_json = json_codec.dumps(settings)
             server.send_to_channel("/image", ch, settings_json)
             if debug:
                 print(f"[VrchImageWebSocketWebViewerNode] Sending settings to channel {ch} via global server on {host}:{port} with path '/image': {settings_json}")
@@ -240,6 +338,10 @@ class VrchImageWebSocketSimpleWebViewerNode:
                 "debug": ("BOOLEAN", {"default": False}),
                 "extra_params":("STRING", {"multiline": True, "dynamicPrompts": False}),
                 "url": ("STRING", {"default": "", "multiline": True}),
+            },
+            "optional": {
+                "rendition_ladder": (list(IMAGE_RENDITION_LADDERS.keys()), {"default": "off"}),
+                "latency_trace": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -263,7 +365,9 @@ class VrchImageWebSocketSimpleWebViewerNode:
                     dev_mode,
                     debug,
                     extra_params,
-                    url):
+                    url,
+                    rendition_ladder="off",
+                    latency_trace=False):
         results = []
         host, port = server.split(":")
         server = get_global_server(host, port, path="/image", debug=debug) # Ensure path is set correctly for viewer
@@ -276,13 +380,9 @@ class VrchImageWebSocketSimpleWebViewerNode:
         for index, tensor in enumerate(images):
             arr = 255.0 * tensor.cpu().numpy()
             img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
-            buf = io.BytesIO()
-            img.save(buf, format=format)
-            binary_data = buf.getvalue()
-            meta = (batch_id << 16) | ((index & 0xFF) << 8) | (batch_size & 0xFF)
-            header = struct.pack(">II", 1, meta)
-            data = header + binary_data
-            server.send_to_channel("/image", ch, data)
+            sequence = _next_image_sequence() if latency_trace else None
+            header = pack_image_header(batch_id, index, batch_size, sequence=sequence)
+            _send_image_frame(server, ch, img, format, header, rendition_ladder)
 
         if debug:
             print(f"[VrchImageWebSocketSimpleWebViewerNode] Sent {len(images)} images to channel {ch} via global server on {host}:{port} with path '/image'")
@@ -400,7 +500,7 @@ class VrchImageWebSocketSettingsNode:
 
             if diff:
                 payload = {"settings": diff}
-                payload_json = json.dumps(payload)
+                payload_json = json_codec.dumps(payload)
                 server.send_to_channel("/image", ch, payload_json)
                 if debug:
                     print(f"[VrchImageWebSocketSettingsNode] Incremental update -> channel {ch}: {payload_json}")
@@ -411,7 +511,7 @@ class VrchImageWebSocketSettingsNode:
                     print("[VrchImageWebSocketSettingsNode] Incremental update skipped (no changes detected)")
                 return (None,)
 
-        settings_json = json.dumps(settings)
+        settings_json = json_codec.dumps(settings)
         server.send_to_channel("/image", ch, settings_json)
         if debug:
             print(f"[VrchImageWebSocketSettingsNode] Sending settings to channel {ch} via global server on {host}:{port} with path '/image': {settings_json}")
@@ -504,6 +604,26 @@ class VrchImageWebSocketFilterSettingsNode:
 _websocket_clients = {}
 _websocket_clients_lock = threading.RLock()
 _websocket_client_debug_seq = 0
+# Shared pool for decode-on-receive image clients; one worker per client is not needed
+# because each client keeps at most one pending decode (the newest frame).
+IMAGE_DECODE_WORKERS = 2
+IMAGE_DECODE_WAIT_SECONDS = 1.0
+IMAGE_BATCH_TIMEOUT_SECONDS = 2.0
+# Incremental clients apply queued messages on the receive thread once this many are pending.
+INCREMENTAL_MAX_PENDING_MESSAGES = 1024
+_image_decode_executor = None
+_image_decode_executor_lock = threading.Lock()
+
+
+def _get_image_decode_executor():
+    global _image_decode_executor
+    with _image_decode_executor_lock:
+        if _image_decode_executor is None:
+            _image_decode_executor = ThreadPoolExecutor(
+                max_workers=IMAGE_DECODE_WORKERS,
+                thread_name_prefix="vrch-image-decode",
+            )
+        return _image_decode_executor
 
 
 def _format_socket_address(addr):
@@ -515,8 +635,80 @@ def _format_socket_address(addr):
         return ":".join(str(part) for part in addr)
     return str(addr)
 
+class ImageBatchFrames(list):
+    """Raw /image frames of one complete batch, ordered by frame_index."""
+
+
+class ImageBatchAssembler:
+    """Collects raw /image frames by batch_id and releases a batch once every
+    frame has arrived. Batches left incomplete past the timeout are dropped."""
+
+    def __init__(self, timeout=IMAGE_BATCH_TIMEOUT_SECONDS, debug=False):
+        self.timeout = timeout
+        self.debug = debug
+        self.dropped_batches = 0
+        self._pending = {}  # batch_id -> {"started_at", "frames", "missing"}
+
+    def add(self, header, message, now=None):
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        batch_id = header["batch_id"]
+        frame_index = header["frame_index"]
+        frame_total = header["frame_total"]
+        if frame_index >= frame_total:
+            return None
+
+        entry = self._pending.get(batch_id)
+        if entry is None or len(entry["frames"]) != frame_total:
+            entry = {"started_at": now, "frames": [None] * frame_total, "missing": frame_total}
+            self._pending[batch_id] = entry
+        if entry["frames"][frame_index] is None:
+            entry["missing"] -= 1
+        entry["frames"][frame_index] = message
+        if entry["missing"] > 0:
+            return None
+        del self._pending[batch_id]
+        return ImageBatchFrames(entry["frames"])
+
+    def _expire(self, now):
+        for batch_id, entry in list(self._pending.items()):
+            if now - entry["started_at"] > self.timeout:
+                del self._pending[batch_id]
+                self.dropped_batches += 1
+                if self.debug:
+                    received = len(entry["frames"]) - entry["missing"]
+                    print(
+                        f"[ImageBatchAssembler] Dropped incomplete batch {batch_id} "
+                        f"({received}/{len(entry['frames'])} frames after {self.timeout:.1f}s)"
+                    )
+
+
+def assemble_image_batch(frames, data_handler):
+    """Decode the frames of a batch into one preallocated [N,H,W,C] tensor."""
+    batch = None
+    metadata = {}
+    for index, frame in enumerate(frames):
+        image = data_handler(frame)
+        if image is None:
+            return None
+        if batch is None:
+            batch = torch.empty((len(frames),) + tuple(image.shape[1:]), dtype=image.dtype)
+            metadata = dict(getattr(image, "_metadata", {}) or {})
+        elif tuple(image.shape[1:]) != tuple(batch.shape[1:]):
+            # Frames of different sizes cannot be stacked into one IMAGE batch.
+            return None
+        batch[index] = image[0]
+    if batch is None:
+        return None
+    metadata["frame_index"] = 0
+    metadata["frame_total"] = len(frames)
+    batch._metadata = metadata
+    return batch
+
+
 class WebSocketClient:
-    def __init__(self, host, port, path, channel, data_handler=None, debug=False, latest_only=False):
+    def __init__(self, host, port, path, channel, data_handler=None, debug=False, latest_only=False, eager_decode=False,
+                 assemble_batches=False, incremental=False):
         global _websocket_client_debug_seq
         with _websocket_clients_lock:
             _websocket_client_debug_seq += 1
@@ -531,6 +723,12 @@ class WebSocketClient:
         self.received_raw_data = None
         self.decoded_sequence = 0
         self.latest_only = bool(latest_only)
+        self.eager_decode = bool(eager_decode)
+        self.assemble_batches = bool(assemble_batches)
+        self._batch_assembler = None
+        self.incremental = bool(incremental)
+        self._pending_messages = deque()
+        self._apply_lock = threading.Lock()
         self.data_handler = data_handler
         self.lock = threading.Lock()
         self.running = True
@@ -542,13 +740,17 @@ class WebSocketClient:
         self._active_connection_started_at = None
         self._active_connection_label = "local=unknown remote=unknown"
         self._last_reuse_debug_log_at = 0.0
+        self._latency_stats = {"receive": LatencyStats(), "decode": LatencyStats()}
+        self._decode_future = None
+        self._decode_future_sequence = 0
         self.loop = asyncio.new_event_loop()
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         if self.debug:
             print(
                 f"[WebSocketClient] Created client#{self.debug_id} "
-                f"endpoint={self._endpoint_label()} latest_only={self.latest_only}"
+                f"endpoint={self._endpoint_label()} latest_only={self.latest_only} "
+                f"eager_decode={self.eager_decode}"
             )
 
     def _endpoint_label(self):
@@ -633,22 +835,35 @@ class WebSocketClient:
 
                             connection_message_count += 1
                             self._total_messages_received += 1
+                            self._trace_latency("receive", message)
                             
                             if self.latest_only:
                                 self._store_latest_message(message)
                                 continue
 
-                            # Process the message using the data handler if provided,
-                            # otherwise store the raw message.
-                            processed_data = self._process_message(message)
-                            
-                            # Store the processed data. The sequence only advances
-                            # for valid payloads so ignored messages do not look
-                            # like new source frames.
-                            with self.lock:
+                            state_handler = self._state_handler()
+                            if state_handler is not None and self.incremental:
+                                self._queue_pending_message(message)
+                            elif state_handler is not None:
+                                # Versioned handlers merge in place; the snapshot is
+                                # taken when the graph reads, not per message.
+                                if state_handler.apply(message):
+                                    with self.lock:
+                                        self.received_sequence += 1
+                            else:
+                                # Process the message using the data handler if provided,
+                                # otherwise store the raw message.
+                                processed_data = self._process_message(message)
                                 if processed_data is not None:
-                                    self.received_sequence += 1
-                                self.received_data = processed_data
+                                    self._trace_latency("decode", message)
+
+                                # Store the processed data. The sequence only advances
+                                # for valid payloads so ignored messages do not look
+                                # like new source frames.
+                                with self.lock:
+                                    if processed_data is not None:
+                                        self.received_sequence += 1
+                                    self.received_data = processed_data
                             
                             if self.debug:
                                 print(
@@ -716,12 +931,59 @@ class WebSocketClient:
         data, _sequence = self.get_latest_data_with_sequence()
         return data
 
+    def _trace_latency(self, stage, message):
+        if self.path != "/image" or not isinstance(message, (bytes, bytearray)):
+            return
+        if len(message) < IMAGE_EXTENDED_HEADER_SIZE or message[3] != IMAGE_RAW_TYPE_EXTENDED:
+            return
+        header = unpack_image_header(message)
+        self._latency_stats[stage].record_since(header["send_timestamp_us"])
+
+    def get_latency_stats(self):
+        """Return send->receive and send->decode summaries for traced /image frames."""
+        return {stage: stats.summary() for stage, stats in self._latency_stats.items()}
+
     def get_latest_data_with_sequence(self):
         if self.latest_only:
             return self._decode_latest_message()
+        state_handler = self._state_handler()
+        if state_handler is not None and getattr(self, "incremental", False):
+            self._apply_pending_messages(state_handler)
         with self.lock:
+            if state_handler is not None:
+                return state_handler.snapshot(), self.received_sequence
             return self.received_data, self.received_sequence
 
+    def _queue_pending_message(self, message):
+        # Arrival time is kept so handlers (e.g. MIDI packet age) see receive time, not read time.
+        with self.lock:
+            self._pending_messages.append((message, time.time()))
+            overflow = len(self._pending_messages) >= INCREMENTAL_MAX_PENDING_MESSAGES
+        if overflow:
+            self._apply_pending_messages(self._state_handler())
+
+    def _apply_pending_messages(self, state_handler):
+        with self._apply_lock:
+            with self.lock:
+                if not self._pending_messages:
+                    return 0
+                pending = self._pending_messages
+                self._pending_messages = deque()
+            changed = 0
+            for message, received_at in pending:
+                if state_handler.apply(message, received_at=received_at):
+                    changed += 1
+            with self.lock:
+                self.received_sequence += changed
+        return changed
+
+    def _state_handler(self):
+        """Return the data handler if it merges in place (``apply``/``snapshot``)."""
+        handler = self.data_handler
+        if hasattr(handler, "apply") and hasattr(handler, "snapshot"):
+            return handler
+        return None
+
     def _is_latest_message_candidate(self, message):
         if self.path == "/image":
             return isinstance(message, (bytes, bytearray)) and len(message) >= 8
@@ -730,13 +992,66 @@ class WebSocketClient:
     def _store_latest_message(self, message):
         if not self._is_latest_message_candidate(message):
             return 0
+        if getattr(self, "assemble_batches", False) and self.path == "/image":
+            message = self._collect_batch_frame(message)
+            if message is None:
+                return 0
         with self.lock:
             self.received_sequence += 1
             source_sequence = self.received_sequence
             self.received_raw_data = message
+            if getattr(self, "eager_decode", False):
+                self._schedule_eager_decode(source_sequence, message)
         return source_sequence
 
+    def _collect_batch_frame(self, message):
+        # Single frames pass through; frames of a multi-frame batch are held
+        # until the whole batch has arrived and then published as one message.
+        header = unpack_image_header(message)
+        if header is None or header["frame_total"] <= 1:
+            return message
+        if self._batch_assembler is None:
+            self._batch_assembler = ImageBatchAssembler(debug=self.debug)
+        return self._batch_assembler.add(header, message)
+
+    def _schedule_eager_decode(self, source_sequence, message):
+        # Caller holds self.lock. A queued decode of an older frame is cancelled;
+        # one already running is left to finish and discarded on commit.
+        previous = self._decode_future
+        if previous is not None and not previous.done():
+            previous.cancel()
+        self._decode_future = _get_image_decode_executor().submit(
+            self._eager_decode, source_sequence, message
+        )
+        self._decode_future_sequence = source_sequence
+
+    def _eager_decode(self, source_sequence, message):
+        with self.lock:
+            if source_sequence != self.received_sequence:
+                return
+        try:
+            processed_data = self._process_message(message)
+        except Exception as e:
+            processed_data = None
+            if self.debug:
+                print(f"{self._debug_prefix()} error decoding on receive: {e}")
+        if processed_data is not None:
+            self._trace_latency("decode", message)
+        self._commit_decoded(source_sequence, processed_data)
+
+    def _commit_decoded(self, source_sequence, processed_data):
+        with self.lock:
+            if source_sequence <= self.decoded_sequence:
+                return False
+            self.received_data = processed_data
+            self.decoded_sequence = source_sequence
+        return True
+
     def _process_message(self, message):
+        if isinstance(message, ImageBatchFrames):
+            if self.data_handler is None:
+                return message
+            return assemble_image_batch(message, self.data_handler)
         if self.data_handler:
             return self.data_handler(message)
         return message
@@ -747,6 +1062,20 @@ class WebSocketClient:
             if source_sequence == self.decoded_sequence:
                 return self.received_data, self.decoded_sequence
             raw_data = self.received_raw_data
+            future = getattr(self, "_decode_future", None)
+            if getattr(self, "_decode_future_sequence", 0) != source_sequence:
+                future = None
+
+        if future is not None and not future.cancelled():
+            # The newest frame is already decoding in the background; wait for it
+            # instead of decoding the same payload twice.
+            try:
+                future.result(timeout=IMAGE_DECODE_WAIT_SECONDS)
+            except Exception:
+                pass
+            with self.lock:
+                if self.decoded_sequence >= source_sequence:
+                    return self.received_data, self.decoded_sequence
 
         try:
             processed_data = self._process_message(raw_data)
@@ -755,6 +1084,8 @@ class WebSocketClient:
             if self.debug:
                 print(f"[WebSocketClient] Error processing latest message: {e}")
         else:
+            if processed_data is not None:
+                self._trace_latency("decode", raw_data)
             if self.debug:
                 print(
                     f"{self._debug_prefix()} decoded latest data "
@@ -762,9 +1093,7 @@ class WebSocketClient:
                     f"{_describe_image_binary_payload(raw_data)}"
                 )
 
-        with self.lock:
-            self.received_data = processed_data
-            self.decoded_sequence = source_sequence
+        self._commit_decoded(source_sequence, processed_data)
         return processed_data, source_sequence
     
     async def _shutdown_async(self):
@@ -788,6 +1117,9 @@ class WebSocketClient:
                 f"{self._active_connection_label} total_msg={self._total_messages_received}"
             )
         self.running = False
+        decode_future = getattr(self, "_decode_future", None)
+        if decode_future is not None:
+            decode_future.cancel()
         if self.loop and self.loop.is_running():
             try:
                 future = asyncio.run_coroutine_threadsafe(self._shutdown_async(), self.loop)
@@ -802,7 +1134,8 @@ class WebSocketClient:
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=1.5)
 
-def get_websocket_client(host, port, path, channel, data_handler=None, debug=False, latest_only=False):
+def get_websocket_client(host, port, path, channel, data_handler=None, debug=False, latest_only=False, eager_decode=False,
+                         assemble_batches=False, incremental=False):
     key = f"{host}:{port}:{path}:{channel}"
     with _websocket_clients_lock:
         client = _websocket_clients.get(key)
@@ -823,7 +1156,11 @@ def get_websocket_client(host, port, path, channel, data_handler=None, debug=Fal
                 client = None
 
         if client is None:
-            client = WebSocketClient(host, port, path, channel, data_handler, debug, latest_only=latest_only)
+            client = WebSocketClient(
+                host, port, path, channel, data_handler, debug,
+                latest_only=latest_only, eager_decode=eager_decode, assemble_batches=assemble_batches,
+                incremental=incremental,
+            )
             _websocket_clients[key] = client
         else:
             # Update debug setting if client already exists.
@@ -831,6 +1168,22 @@ def get_websocket_client(host, port, path, channel, data_handler=None, debug=Fal
             previous_latest_only = client.latest_only
             client.debug = debug
             client.latest_only = bool(latest_only)
+            client.eager_decode = bool(eager_decode)
+            client.assemble_batches = bool(assemble_batches)
+            if not incremental and client.incremental and client._state_handler() is not None:
+                client._apply_pending_messages(client._state_handler())
+            client.incremental = bool(incremental)
+            if (
+                data_handler is not None
+                and client.data_handler is not data_handler
+                and inspect.isfunction(data_handler)
+            ):
+                # Stateless handler functions (e.g. float32 vs uint8 image decode) can be
+                # swapped in place; the latest raw frame is decoded again with the new one.
+                with client.lock:
+                    client.data_handler = data_handler
+                    if client.latest_only:
+                        client.decoded_sequence = 0
             if hasattr(client.data_handler, "debug"):
                 client.data_handler.debug = debug
             now = time.monotonic()
@@ -861,70 +1214,215 @@ def stop_all_websocket_clients():
         except Exception:
             pass
         
+IMAGE_BUFFER_POOL_MAX_PER_SHAPE = 4
+
+
+class ImageBufferPool:
+    """Reusable float32 frame buffers keyed by shape.
+
+    ``acquire`` leases out a numpy view over a pooled buffer and attaches a
+    ``weakref.finalize`` to it. The view stays alive as long as anything built
+    on it does (``torch.from_numpy`` tensors and their views, numpy views), so
+    the buffer only goes back to the pool once no frame can still read it.
+    """
+
+    def __init__(self, max_per_shape=IMAGE_BUFFER_POOL_MAX_PER_SHAPE):
+        self.max_per_shape = max_per_shape
+        self._free = {}
+        # Finalizers may run on any thread, including one already holding the lock.
+        self._lock = threading.RLock()
+
+    def acquire(self, shape):
+        key = tuple(shape)
+        with self._lock:
+            free = self._free.get(key)
+            buf = free.pop() if free else None
+        if buf is None:
+            buf = torch.empty(key, dtype=torch.float32)
+        # The view's base is the pooled tensor, so numpy views of the lease
+        # keep the lease itself alive rather than collapsing onto the buffer.
+        lease = buf.numpy()
+        weakref.finalize(lease, self._release, key, buf)
+        return lease
+
+    def _release(self, key, buf):
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_per_shape:
+                free.append(buf)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+
+_image_buffer_pool = ImageBufferPool()
+
+
+def _image_to_float_array(image):
+    pixels = np.asarray(image)
+    if pixels.dtype != np.uint8:
+        return pixels.astype(np.float32) / 255.0
+    buf = _image_buffer_pool.acquire(pixels.shape)
+    np.divide(pixels, np.float32(255.0), out=buf)
+    return buf
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only stream over a buffer. PIL pulls the payload through
+    ``readinto`` in decoder-sized chunks, so the compressed frame is never
+    copied as a whole (``BytesIO`` would copy all of it up front)."""
+
+    def __init__(self, view):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        end = min(self._pos + len(buffer), len(self._view))
+        count = max(0, end - self._pos)
+        buffer[:count] = self._view[self._pos:end]
+        self._pos += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
 def image_data_handler(message):
     """Default handler for processing image messages"""
+    return _decode_image_message(message)
+
+
+def image_uint8_data_handler(message):
+    """Image handler that keeps decoded pixels as uint8 for on-device normalization"""
+    return _decode_image_message(message, as_uint8=True)
+
+
+def _decode_image_message(message, as_uint8=False):
     if not isinstance(message, (bytes, bytearray)):
         # Non-binary payload (e.g. JSON settings) is ignored by the image handler
         return None
 
-    if len(message) < 8:  # At least 8 bytes for the header
+    header = unpack_image_header(message)
+    if header is None:  # At least 8 bytes for the header
         return None
-
-    # Unpack header (2 uint32 values)
-    first, second = struct.unpack(">II", message[:8])
-    image_data = message[8:]
-
-    batch_id = (second >> 16) & 0xFFFF
-    frame_index = (second >> 8) & 0xFF
-    frame_total = second & 0xFF
+    image_data = memoryview(message)[header["header_size"]:]
     
-    # Convert image data to tensor
-    image = Image.open(io.BytesIO(image_data))
-    image_np = np.array(image).astype(np.float32) / 255.0
+    # Convert image data to tensor, reading the payload straight from the view
+    image = Image.open(_BufferReader(image_data))
+    image_np = np.array(image) if as_uint8 else None
+    if image_np is None or image_np.dtype != np.uint8:
+        image_np = _image_to_float_array(image)
     image_tensor = torch.from_numpy(image_np)[None,]
     image_tensor._metadata = {
-        "batch_id": batch_id,
-        "frame_index": frame_index,
-        "frame_total": frame_total,
-        "raw_type": first,
+        "batch_id": header["batch_id"],
+        "frame_index": header["frame_index"],
+        "frame_total": header["frame_total"],
+        "raw_type": header["raw_type"],
     }
+    if "sequence" in header:
+        image_tensor._metadata["sequence"] = header["sequence"]
+        image_tensor._metadata["send_timestamp_us"] = header["send_timestamp_us"]
     return image_tensor
 
+_MISSING = object()
+
+
 class JsonStateMerger:
+    """Merges JSON object payloads into one state dict.
+
+    ``apply`` updates ``state`` in place (O(changed keys)) and bumps ``version``
+    only when something changed. ``snapshot`` builds one read-only copy of the
+    state per version and hands the same object to every reader until the next
+    change; values of unchanged keys are frozen once and reused.
+    """
+
     def __init__(self, max_keys=JSON_STATE_MAX_KEYS, clear_key=JSON_STATE_CLEAR_KEY, debug=False):
         self.state = {}
+        self.version = 0
         self.max_keys = max_keys
         self.clear_key = clear_key
         self.debug = debug
+        self._lock = threading.Lock()
+        self._frozen_values = {}
+        self._snapshot = None
+        self._snapshot_version = 0
 
     def __call__(self, message):
+        self.apply(message)
+        return self.snapshot()
+
+    def apply(self, message, received_at=None):
+        """Merge one raw message; return True when the state changed."""
         try:
-            payload = json.loads(message)
-        except (json.JSONDecodeError, TypeError):
+            payload = json_codec.loads(message)
+        except json_codec.DECODE_ERRORS:
             if self.debug:
                 print("[JsonStateMerger] Invalid JSON payload; ignoring")
-            return dict(self.state) if self.state else None
+            return False
 
         if not isinstance(payload, dict):
             if self.debug:
                 print("[JsonStateMerger] Non-dict JSON payload ignored")
-            return dict(self.state) if self.state else None
-
-        if payload.get(self.clear_key):
-            if self.debug:
-                print(f"[JsonStateMerger] Clear key '{self.clear_key}' received; resetting state")
-            self.state = {}
+            return False
 
-        for key, value in payload.items():
-            if key == self.clear_key:
-                continue
-            if self.max_keys and self.max_keys > 0 and key not in self.state and len(self.state) >= self.max_keys:
+        with self._lock:
+            # The first valid payload publishes a state even if it is empty.
+            changed = self.version == 0
+            if payload.get(self.clear_key):
                 if self.debug:
-                    print(f"[JsonStateMerger] Max keys {self.max_keys} reached; skipping new key '{key}'")
-                continue
-            self.state[key] = value
-
-        return dict(self.state)
+                    print(f"[JsonStateMerger] Clear key '{self.clear_key}' received; resetting state")
+                if self.state:
+                    self.state = {}
+                    self._frozen_values = {}
+                    changed = True
+
+            for key, value in payload.items():
+                if key == self.clear_key:
+                    continue
+                previous = self.state.get(key, _MISSING)
+                if previous is _MISSING and self.max_keys and self.max_keys > 0 and len(self.state) >= self.max_keys:
+                    if self.debug:
+                        print(f"[JsonStateMerger] Max keys {self.max_keys} reached; skipping new key '{key}'")
+                    continue
+                if previous is not _MISSING and previous == value:
+                    continue
+                self.state[key] = value
+                self._frozen_values.pop(key, None)
+                changed = True
+
+            if changed:
+                self.version += 1
+        return changed
+
+    def snapshot(self):
+        """Return the read-only state for the current version, or None before the first payload."""
+        with self._lock:
+            if self.version == 0:
+                return None
+            if self._snapshot_version != self.version:
+                frozen = self._frozen_values
+                for key, value in self.state.items():
+                    if key not in frozen:
+                        frozen[key] = freeze(value)
+                self._snapshot = ReadOnlyDict((key, frozen[key]) for key in self.state)
+                self._snapshot_version = self.version
+            return self._snapshot
 
 def make_json_state_handler(debug=False):
     return JsonStateMerger(max_keys=JSON_STATE_MAX_KEYS, clear_key=JSON_STATE_CLEAR_KEY, debug=debug)
@@ -932,11 +1430,20 @@ def make_json_state_handler(debug=False):
 def make_midi_state_handler(debug=False):
     return MidiStateParser(debug=debug)
 
+def mic_frame_handler(message):
+    """Default handler for binary /mic frames; returns a MicFrame or None."""
+    if not is_mic_frame(message):
+        return None
+    try:
+        return decode_mic_frame(message)
+    except MicProtocolError:
+        return None
+
 def latent_data_handler(message):
     """Default handler for processing latent messages"""
     try:
         # Parse the JSON string to get latent data
-        latent_data = json.loads(message)
+        latent_data = json_codec.loads(message)
         
         # Convert back to tensor format expected by ComfyUI
         if "samples" in latent_data:
@@ -954,24 +1461,104 @@ def latent_data_handler(message):
                 latent["channels"] = int(samples_tensor.shape[1]) if samples_tensor.ndim >= 2 else None
             return latent
         return None
-    except (json.JSONDecodeError, KeyError, ValueError):
+    except (KeyError, *json_codec.DECODE_ERRORS):
         # If parsing fails, return None
         return None
 
 def audio_data_handler(message):
     """Default handler for processing audio messages"""
+    if is_audio_frame(message):
+        try:
+            header, payload = decode_audio_frame(message)
+            if header.frame_type == FRAME_CLIP:
+                return AudioClip.from_frame(header, payload)
+        except AudioProtocolError:
+            pass
+        return None
     try:
-        if isinstance(message, bytes):
+        if isinstance(message, bytes) and json_codec.BACKEND == "json":
             message = message.decode('utf-8')
-        payload = json.loads(message)
+        payload = json_codec.loads(message)
         if isinstance(payload, dict) and payload.get("type") == AUDIO_PLAYER_TRACK_MESSAGE_TYPE:
             return None
         if isinstance(payload, dict) and payload.get("base64_data"):
             return payload
         return None
-    except (json.JSONDecodeError, UnicodeDecodeError):
+    except json_codec.DECODE_ERRORS:
         return None
 
+class AudioMessageHandler:
+    """Handles /audio messages: base64 JSON tracks, binary clips and stream packets.
+
+    Stream packets accumulate in one AudioStreamBuffer, so the latest data is
+    the audio received so far for the current stream.
+    """
+
+    def __init__(self, debug=False):
+        self.debug = debug
+        self.stream = AudioStreamBuffer()
+
+    def __call__(self, message):
+        if is_audio_frame(message):
+            try:
+                header, payload = decode_audio_frame(message)
+                if header.frame_type == FRAME_STREAM:
+                    self.stream.append(header, payload)
+                    return self.stream
+            except AudioProtocolError as err:
+                if self.debug:
+                    print(f"[AudioMessageHandler] Ignoring audio frame: {err}")
+                return None
+        return audio_data_handler(message)
+
+def make_audio_handler(debug=False):
+    return AudioMessageHandler(debug=debug)
+
+_audio_stream_id_lock = threading.Lock()
+_audio_stream_id = int(time.time() * 1000) & 0xFFFFFFFF
+
+def _next_audio_stream_id():
+    global _audio_stream_id
+    with _audio_stream_id_lock:
+        _audio_stream_id = (_audio_stream_id + 1) & 0xFFFFFFFF
+        return _audio_stream_id
+
+def _stream_audio_packets(server, ch, audio, packet_ms=AUDIO_STREAM_DEFAULT_PACKET_MS):
+    """Send AUDIO as PCM16 stream packets, each as soon as it is encoded.
+
+    This is a bulk transfer, not paced to playback speed: every packet is
+    queued at once so the node does not block for the audio's duration.
+    Receivers buffer the stream and may start after the first packet.
+    """
+    waveform, sample_rate = _normalize_comfy_audio(audio)
+    channels = int(waveform.shape[0])
+    samples = int(waveform.shape[1])
+    packet_frames = max(1, int(sample_rate * int(packet_ms) / 1000))
+    stream_id = _next_audio_stream_id()
+    starts = range(0, samples, packet_frames)
+    last_seq = len(starts) - 1
+    for seq, start in enumerate(starts):
+        flags = (FLAG_STREAM_START if seq == 0 else 0) | (FLAG_STREAM_END if seq == last_seq else 0)
+        pcm = _audio_waveform_to_pcm16(waveform[:, start:start + packet_frames])
+        timestamp_us = start * 1_000_000 // sample_rate
+        server.send_to_channel(
+            "/audio", ch, encode_stream_packet(stream_id, seq, timestamp_us, sample_rate, channels, pcm, flags=flags)
+        )
+    return {
+        "type": AUDIO_STREAM_MESSAGE_TYPE,
+        "version": 1,
+        "source": AUDIO_PLAYER_TRACK_SOURCE,
+        "stream_id": stream_id,
+        "packets": len(starts),
+        "packet_ms": int(packet_ms),
+        "audio": {
+            "encoding": "pcm16",
+            "sample_rate": int(sample_rate),
+            "channels": channels,
+            "duration_ms": int(round((samples / float(sample_rate)) * 1000)),
+        },
+    }
+
 def _normalize_audio_quality(quality):
     key = str(quality or "standard").strip().lower()
     if key not in AUDIO_PLAYER_QUALITY_PRESETS_KBPS:
@@ -1015,34 +1602,90 @@ def _audio_waveform_to_pcm16(waveform):
     pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype(np.int16)
     return np.ascontiguousarray(pcm.T).tobytes()
 
+OPUS_ENCODER_CANDIDATES = ("libopus", "opus")
+_opus_encoders_lock = threading.Lock()
+_opus_encoders = None
+
+def _detect_ffmpeg_opus_encoders():
+    """List the Opus encoders this ffmpeg build provides, preferred first."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=10
+        )
+    except Exception:
+        return OPUS_ENCODER_CANDIDATES
+    names = {parts[1] for parts in (line.split() for line in result.stdout.splitlines()) if len(parts) >= 2}
+    found = tuple(codec for codec in OPUS_ENCODER_CANDIDATES if codec in names)
+    return found or OPUS_ENCODER_CANDIDATES
+
+def _ffmpeg_opus_encoders():
+    # Detected once per process; narrowed to the encoder that last succeeded.
+    global _opus_encoders
+    with _opus_encoders_lock:
+        if _opus_encoders is None:
+            _opus_encoders = _detect_ffmpeg_opus_encoders()
+        return _opus_encoders
+
+def _webm_opus_encode_stream(codec, sample_rate, channels, bitrate_kbps, duration_s):
+    # WebM muxing to a pipe cannot seek back to write the duration, so it is
+    # passed as metadata and written into the segment header up front.
+    return (
+        ffmpeg
+        .input("pipe:0", format="s16le", ar=int(sample_rate), ac=int(channels))
+        .output(
+            "pipe:1",
+            format="webm",
+            acodec=codec,
+            audio_bitrate=f"{int(bitrate_kbps)}k",
+            metadata=f"DURATION={duration_s:.6f}",
+        )
+        .global_args("-loglevel", "error")
+    )
+
 def _encode_pcm16_to_webm_opus(pcm_bytes, sample_rate, channels, bitrate_kbps):
+    global _opus_encoders
     if not pcm_bytes:
         raise ValueError("[VrchAudioWebSocketSenderNode] Empty PCM audio payload")
+    duration_s = len(pcm_bytes) / float(2 * int(channels) * int(sample_rate))
     last_error = None
-    for codec in ("libopus", "opus"):
+    for codec in _ffmpeg_opus_encoders():
         try:
-            with tempfile.TemporaryDirectory(prefix="vrch-audio-webm-") as tmpdir:
-                output_path = f"{tmpdir}/audio.webm"
-                process = (
-                    ffmpeg
-                    .input("pipe:0", format="s16le", ar=int(sample_rate), ac=int(channels))
-                    .output(output_path, format="webm", acodec=codec, audio_bitrate=f"{int(bitrate_kbps)}k")
-                    .global_args("-loglevel", "error")
-                    .overwrite_output()
-                    .run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
-                )
-                _, err = process.communicate(input=pcm_bytes)
-                if process.returncode == 0:
-                    with open(output_path, "rb") as f:
-                        output = f.read()
-                    if output:
-                        return output, codec
+            process = _webm_opus_encode_stream(codec, sample_rate, channels, bitrate_kbps, duration_s).run_async(
+                pipe_stdin=True, pipe_stdout=True, pipe_stderr=True
+            )
+            output, err = process.communicate(input=pcm_bytes)
+            if process.returncode == 0 and output:
+                with _opus_encoders_lock:
+                    _opus_encoders = (codec,)
+                return output, codec
             last_error = (err or b"").decode("utf-8", errors="replace")
         except Exception as err:
             last_error = str(err)
     raise ValueError(f"[VrchAudioWebSocketSenderNode] ffmpeg WebM/Opus encode failed: {last_error}")
 
 def _build_audio_player_track_payload(audio, title="ComfyUI Audio", quality="standard", autoplay_request=True):
+    payload, webm_bytes = _encode_audio_player_track(audio, title, quality, autoplay_request)
+    payload["audio"]["base64"] = base64.b64encode(webm_bytes).decode("ascii")
+    return payload
+
+def _send_audio_clip(server, ch, audio, title="ComfyUI Audio", quality="standard", autoplay_request=True):
+    """Send AUDIO as one binary clip frame carrying the raw WebM/Opus bytes."""
+    payload, webm_bytes = _encode_audio_player_track(audio, title, quality, autoplay_request)
+    audio_meta = payload["audio"]
+    clip_id = _next_audio_stream_id()
+    server.send_to_channel(
+        "/audio",
+        ch,
+        encode_clip_frame(
+            clip_id, audio_meta["sample_rate"], audio_meta["channels"], audio_meta["duration_ms"] * 1000, webm_bytes
+        ),
+    )
+    payload["transport"] = "clip"
+    payload["clip_id"] = clip_id
+    audio_meta["size_bytes"] = len(webm_bytes)
+    return payload
+
+def _encode_audio_player_track(audio, title, quality, autoplay_request):
     waveform, sample_rate = _normalize_comfy_audio(audio)
     channels = int(waveform.shape[0])
     samples = int(waveform.shape[1])
@@ -1070,7 +1713,6 @@ def _build_audio_player_track_payload(audio, title="ComfyUI Audio", quality="sta
             "sample_rate": int(sample_rate),
             "channels": channels,
             "duration_ms": duration_ms,
-            "base64": base64.b64encode(webm_bytes).decode("ascii"),
         },
         "playlist": {
             "display_name": display_name,
@@ -1078,14 +1720,15 @@ def _build_audio_player_track_payload(audio, title="ComfyUI Audio", quality="sta
             "autoplay_request": bool(autoplay_request),
         },
         "quality": quality_key,
-    }
+    }, webm_bytes
 
 def _strip_audio_base64_for_output(payload):
-    result = json.loads(json.dumps(payload))
-    audio = result.get("audio")
+    # Drop the base64 blob before the deep copy so it is never serialized.
+    stripped = dict(payload)
+    audio = stripped.get("audio")
     if isinstance(audio, dict):
-        audio.pop("base64", None)
-    return result
+        stripped["audio"] = {key: value for key, value in audio.items() if key != "base64"}
+    return json_codec.copy(stripped)
 
 class VrchLiveConsoleControlNode:
     PANE_CONFIG = [
@@ -1203,7 +1846,7 @@ class VrchLiveConsoleControlNode:
         }
 
         if ops:
-            ws_server.send_to_channel("/json", ch, json.dumps(payload))
+            ws_server.send_to_channel("/json", ch, json_codec.dumps(payload))
             next_state = dict(pane_state)
             next_state["__sidebar_mode"] = normalized_sidebar_mode
             self._last_state_by_target[cache_key] = next_state
@@ -1295,7 +1938,7 @@ class VrchLatentWebSocketSenderNode:
                 "shape": list(samples_tensor.shape),
                 "channels": int(samples_tensor.shape[1]) if samples_tensor.ndim >= 2 else None,
             }
-            latent_json = json.dumps(latent_data)
+            latent_json = json_codec.dumps(latent_data)
             
             # Send the latent data to WebSocket clients
             server.send_to_channel("/latent", ch, latent_json)
@@ -1321,6 +1964,10 @@ class VrchAudioWebSocketSenderNode:
                 "autoplay_request": ("BOOLEAN", {"default": True}),
                 "quality": (["compact", "standard", "high"], {"default": "standard"}),
                 "debug": ("BOOLEAN", {"default": False}),
+            },
+            "optional": {
+                "transport": (AUDIO_TRANSPORTS, {"default": "track"}),
+                "stream_packet_ms": ("INT", {"default": AUDIO_STREAM_DEFAULT_PACKET_MS, "min": 10, "max": 1000}),
             }
         }
 
@@ -1330,20 +1977,40 @@ class VrchAudioWebSocketSenderNode:
     OUTPUT_NODE = True
     CATEGORY = CATEGORY
 
-    def send_audio(self, audio, channel, server, title, autoplay_request, quality, debug):
+    def send_audio(self, audio, channel, server, title, autoplay_request, quality, debug,
+                   transport="track", stream_packet_ms=AUDIO_STREAM_DEFAULT_PACKET_MS):
         try:
             host, port = server.split(":")
         except Exception:
             raise ValueError("[VrchAudioWebSocketSenderNode] Server must be in host:port format")
         ws_server = get_global_server(host, port, path="/audio", debug=debug)
         ch = int(channel)
+        if transport == "stream":
+            output_payload = _stream_audio_packets(ws_server, ch, audio, stream_packet_ms)
+            if debug:
+                print(
+                    "[VrchAudioWebSocketSenderNode] Streamed AUDIO to "
+                    f"channel {ch} via {host}:{port} as {output_payload['packets']} pcm16 packets "
+                    f"of {output_payload['packet_ms']}ms (stream {output_payload['stream_id']})"
+                )
+            return (audio, output_payload)
+        if transport == "clip":
+            output_payload = _send_audio_clip(ws_server, ch, audio, title, quality, autoplay_request)
+            if debug:
+                audio_meta = output_payload["audio"]
+                print(
+                    "[VrchAudioWebSocketSenderNode] Sent AUDIO clip "
+                    f"{output_payload['clip_id']} to channel {ch} via {host}:{port} "
+                    f"({audio_meta['size_bytes']} bytes, duration={audio_meta['duration_ms']}ms)"
+                )
+            return (audio, output_payload)
         payload = _build_audio_player_track_payload(
             audio=audio,
             title=title,
             quality=quality,
             autoplay_request=autoplay_request,
         )
-        ws_server.send_to_channel("/audio", ch, json.dumps(payload))
+        ws_server.send_to_channel("/audio", ch, json_codec.dumps(payload))
         output_payload = _strip_audio_base64_for_output(payload)
         if debug:
             audio_meta = output_payload.get("audio", {})
@@ -1377,7 +2044,9 @@ class VrchJsonWebSocketChannelLoaderNode:
     
     def receive_json(self, channel=1, server="", debug=False, default_json_string=None):
         host, port = server.split(":")
-        client = get_websocket_client(host, port, "/json", channel, data_handler=make_json_state_handler(debug=debug), debug=debug)
+        client = get_websocket_client(
+            host, port, "/json", channel, data_handler=make_json_state_handler(debug=debug), debug=debug, incremental=True,
+        )
         
         # Get JSON data from WebSocket client
         json_data = client.get_latest_data()
@@ -1435,7 +2104,9 @@ class VrchMidiWebSocketChannelLoaderNode:
 
     def receive_midi(self, channel=1, server="", debug=False):
         host, port = server.split(":")
-        client = get_websocket_client(host, port, "/midi", channel, data_handler=make_midi_state_handler(debug=debug), debug=debug)
+        client = get_websocket_client(
+            host, port, "/midi", channel, data_handler=make_midi_state_handler(debug=debug), debug=debug, incremental=True,
+        )
         midi_data = client.get_latest_data()
         if midi_data is None:
             handler = client.data_handler if isinstance(client.data_handler, MidiStateParser) else make_midi_state_handler(debug=debug)
@@ -1589,6 +2260,9 @@ class VrchImageWebSocketChannelLoaderNode:
             },
             "optional": {
                 "default_image": ("IMAGE",),
+                "decode_on_receive": ("BOOLEAN", {"default": False}),
+                "normalize_on_device": ("BOOLEAN", {"default": False}),
+                "assemble_batches": ("BOOLEAN", {"default": False}),
             }
         }
     
@@ -1598,7 +2272,8 @@ class VrchImageWebSocketChannelLoaderNode:
     OUTPUT_NODE = True
     CATEGORY = CATEGORY
     
-    def receive_image(self, channel, server, placeholder, debug, default_image=None):
+    def receive_image(self, channel, server, placeholder, debug, default_image=None, decode_on_receive=False,
+                      normalize_on_device=False, assemble_batches=False):
         host, port = server.split(":")
         cache = getattr(self, "_last_image_by_target", None)
         if cache is None:
@@ -1608,11 +2283,18 @@ class VrchImageWebSocketChannelLoaderNode:
         if sequence_cache is None:
             sequence_cache = {}
             self._last_sequence_by_target = sequence_cache
-        cache_key = (server, str(channel))
         source_id = f"{server}|/image|{channel}"
 
         # Ensure path is set correctly for loader
-        client = get_websocket_client(host, port, "/image", channel, data_handler=image_data_handler, debug=debug, latest_only=True)
+        device = self._normalize_device() if normalize_on_device else None
+        handler = image_uint8_data_handler if device is not None else image_data_handler
+        # Cached frames are keyed by output device and decode dtype, so toggling
+        # normalize_on_device never returns a copy left on the other device.
+        cache_key = (server, str(channel), str(device or "cpu"), torch.uint8 if device is not None else torch.float32)
+        client = get_websocket_client(
+            host, port, "/image", channel, data_handler=handler, debug=debug,
+            latest_only=True, eager_decode=decode_on_receive, assemble_batches=assemble_batches,
+        )
 
         if hasattr(client, "get_latest_data_with_sequence"):
             image, source_sequence = client.get_latest_data_with_sequence()
@@ -1637,6 +2319,14 @@ class VrchImageWebSocketChannelLoaderNode:
                     return (cache[cache_key], False)
                 sequence_cache[cache_key] = source_sequence
 
+            if image.dtype == torch.uint8:
+                image = self._normalize_uint8_image(image, device or torch.device("cpu"))
+            elif device is not None and image.device != device:
+                # A frame decoded before the handler swap is already float32 on the CPU.
+                metadata = getattr(image, "_metadata", None)
+                image = image.to(device, non_blocking=True)
+                if metadata is not None:
+                    image._metadata = metadata
             cache[cache_key] = image
             if debug and hasattr(image, "_metadata"):
                 meta = getattr(image, "_metadata", {})
@@ -1651,6 +2341,12 @@ class VrchImageWebSocketChannelLoaderNode:
                     meta.get("source_sequence"),
                     ")",
                 )
+                if "sequence" in meta and hasattr(client, "get_latency_stats"):
+                    latency = client.get_latency_stats()
+                    print(
+                        f"[VrchImageWebSocketChannelLoaderNode] Latency seq={meta['sequence']} "
+                        f"receive={latency['receive']} decode={latency['decode']}"
+                    )
             return (image, False)
 
         cached_image = cache.get(cache_key)
@@ -1675,6 +2371,34 @@ class VrchImageWebSocketChannelLoaderNode:
         if debug:
             print(f"[VrchImageWebSocketChannelLoaderNode] No image data received, using {placeholder} placeholder")
         return (placeholder_img, False)
+
+    @staticmethod
+    def _normalize_device():
+        """Return ComfyUI's torch device for on-device normalization, or None when it is the CPU."""
+        try:
+            import comfy.model_management as model_management
+        except ImportError:
+            return None
+        device = None
+        for getter in ("get_torch_device", "intermediate_device"):
+            try:
+                device = torch.device(getattr(model_management, getter)())
+                break
+            except Exception:
+                continue
+        if device is None or device.type == "cpu":
+            return None
+        return device
+
+    @staticmethod
+    def _normalize_uint8_image(image, device):
+        # Upload uint8 (1/4 of the float32 bytes) and scale to [0, 1] on the device.
+        metadata = getattr(image, "_metadata", None)
+        pixels = image.to(device, non_blocking=True)
+        normalized = pixels.to(torch.float32).div_(255.0)
+        if metadata is not None:
+            normalized._metadata = metadata
+        return normalized
     
     @classmethod
     def IS_CHANGED(cls, **kwargs):
@@ -1703,19 +2427,60 @@ class VrchAudioWebSocketChannelLoaderNode:
 
     def receive_audio(self, channel=1, server="", debug=False, default_audio=None):
         host, port = server.split(":")
-        client = get_websocket_client(host, port, "/audio", channel, data_handler=audio_data_handler, debug=debug)
-        payload = client.get_latest_data()
+        cache = getattr(self, "_last_audio_by_target", None)
+        if cache is None:
+            cache = {}
+            self._last_audio_by_target = cache
+        sequence_cache = getattr(self, "_last_sequence_by_target", None)
+        if sequence_cache is None:
+            sequence_cache = {}
+            self._last_sequence_by_target = sequence_cache
+        cache_key = (server, str(channel))
 
-        if isinstance(payload, dict) and payload.get("base64_data"):
-            audio = self._decode_base64_audio(payload["base64_data"], debug=debug)
-            if audio is not None:
-                return (audio,)
+        client = get_websocket_client(host, port, "/audio", channel, data_handler=make_audio_handler(debug=debug), debug=debug)
+        payload, source_sequence = client.get_latest_data_with_sequence()
+
+        if sequence_cache.get(cache_key) == source_sequence and cache_key in cache:
+            # Nothing new since the last run: reuse the decoded result.
+            audio = cache[cache_key]
+            if debug:
+                print(
+                    f"[VrchAudioWebSocketChannelLoaderNode] No new audio data received, "
+                    f"using cached audio (source_sequence={source_sequence})"
+                )
+        else:
+            audio = self._audio_from_payload(payload, debug=debug)
+            sequence_cache[cache_key] = source_sequence
+            cache[cache_key] = audio
+
+        if audio is not None:
+            return (audio,)
 
         if default_audio is not None:
             return (default_audio,)
 
         return (self._silent_audio(),)
 
+    def _audio_from_payload(self, payload, debug=False):
+        if isinstance(payload, AudioStreamBuffer):
+            waveform = payload.to_waveform()
+            if waveform is not None:
+                if debug:
+                    print(
+                        f"[VrchAudioWebSocketChannelLoaderNode] Stream {payload.stream_id}: "
+                        f"{payload.frames} frames received ended={payload.ended}"
+                    )
+                # Same layout as decoded clips and tracks: mono is expanded to stereo.
+                return self._comfy_audio(torch.from_numpy(waveform), payload.sample_rate, debug=debug)
+
+        if isinstance(payload, AudioClip):
+            return self._decode_audio_clip(payload, debug=debug)
+
+        if isinstance(payload, dict) and payload.get("base64_data"):
+            return self._decode_base64_audio(payload["base64_data"], debug=debug)
+
+        return None
+
     @staticmethod
     def _silent_audio(duration_sec: float = 0.5, sample_rate: int = 44100):
         num_samples = max(int(sample_rate * duration_sec), 1)
@@ -1730,37 +2495,25 @@ class VrchAudioWebSocketChannelLoaderNode:
             return None
 
         try:
-            audio_bytes = base64.b64decode(base64_data)
+            waveform, sample_rate = decode_base64_audio(base64_data)
         except Exception as err:
             if debug:
-                print(f"[VrchAudioWebSocketChannelLoaderNode] Base64 decode failed: {err}")
-            return None
-
-        if not audio_bytes:
-            if debug:
-                print("[VrchAudioWebSocketChannelLoaderNode] Decoded payload empty")
+                print(f"[VrchAudioWebSocketChannelLoaderNode] Audio decode failed: {err}")
             return None
+        return VrchAudioWebSocketChannelLoaderNode._comfy_audio(waveform, sample_rate, debug=debug)
 
-        input_buffer = io.BytesIO(audio_bytes)
+    @staticmethod
+    def _decode_audio_clip(clip, debug=False):
         try:
-            process = (
-                ffmpeg
-                .input('pipe:0', format='webm')
-                .output('pipe:1', format='wav')
-                .run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
-            )
-            output, _ = process.communicate(input=input_buffer.read())
-            if not output:
-                if debug:
-                    print("[VrchAudioWebSocketChannelLoaderNode] ffmpeg produced no output")
-                return None
-            wav_buffer = io.BytesIO(output)
-            waveform, sample_rate = torchaudio.load(wav_buffer)
+            waveform, sample_rate = decode_audio_bytes(clip.data, container=clip.container)
         except Exception as err:
             if debug:
-                print(f"[VrchAudioWebSocketChannelLoaderNode] Audio decode failed: {err}")
+                print(f"[VrchAudioWebSocketChannelLoaderNode] Audio clip {clip.clip_id} decode failed: {err}")
             return None
+        return VrchAudioWebSocketChannelLoaderNode._comfy_audio(waveform, sample_rate, debug=debug)
 
+    @staticmethod
+    def _comfy_audio(waveform, sample_rate, debug=False):
         try:
             if waveform.dim() == 1:
                 waveform = waveform.unsqueeze(0)
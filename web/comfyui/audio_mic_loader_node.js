@@ -20,6 +20,9 @@ app.registerExtension({
             const enablePreviewWidget = node.widgets.find(w => w.name === "enable_preview");
             const rawDataWidget = node.widgets.find(w => w.name === "raw_data");
             const debugWidget = node.widgets.find(w => w.name === "debug");
+            const sourceWidget = node.widgets.find(w => w.name === "source");
+            const channelWidget = node.widgets.find(w => w.name === "channel");
+            const serverWidget = node.widgets.find(w => w.name === "server");
 
             // State variables
             let audioContext = null;
@@ -30,6 +33,9 @@ app.registerExtension({
             let isCapturing = false;
             let isMuted = false;
             let suppressMuteCallback = false;
+            let micSocket = null;
+            let micSocketUrl = null;
+            let micSocketRetryAt = 0;
             
             // Hide technical widgets from the UI
             if (deviceIdWidget) {
@@ -316,6 +322,66 @@ app.registerExtension({
                 volumeMeterFill.style.width = "0%";
             };
             
+            // Binary /mic frames (see nodes/mic_websocket_protocol.py): a 32-byte
+            // big-endian header followed by uint8 waveform and spectrum bytes.
+            const MIC_FRAME_HEADER_SIZE = 32;
+            const encodeMicFrame = (waveBytes, specBytes, sampleRate, volume, isActive, rms, zcr, peak) => {
+                const buffer = new ArrayBuffer(MIC_FRAME_HEADER_SIZE + waveBytes.length + specBytes.length);
+                const view = new DataView(buffer);
+                [0x56, 0x4d, 0x49, 0x43].forEach((byte, i) => view.setUint8(i, byte)); // "VMIC"
+                view.setUint8(4, 1); // version
+                view.setUint8(5, 2); // dtype: uint8
+                view.setUint8(6, isActive ? 1 : 0);
+                view.setUint32(8, sampleRate);
+                view.setUint16(12, waveBytes.length);
+                view.setUint16(14, specBytes.length);
+                view.setFloat32(16, volume);
+                view.setFloat32(20, rms);
+                view.setFloat32(24, zcr);
+                view.setFloat32(28, peak);
+                const bytes = new Uint8Array(buffer);
+                bytes.set(waveBytes, MIC_FRAME_HEADER_SIZE);
+                bytes.set(specBytes, MIC_FRAME_HEADER_SIZE + waveBytes.length);
+                return buffer;
+            };
+            
+            const closeMicSocket = () => {
+                if (micSocket) {
+                    micSocket.onclose = null;
+                    micSocket.close();
+                    micSocket = null;
+                }
+            };
+            
+            // Returns an open /mic socket when source is "websocket", reconnecting at most once per second
+            const getMicSocket = () => {
+                const useWebSocket = sourceWidget && sourceWidget.value === "websocket" && serverWidget;
+                const url = useWebSocket
+                    ? `ws://${serverWidget.value}/mic?channel=${channelWidget ? channelWidget.value : "1"}&client=comfyui-mic-loader`
+                    : null;
+                if (url !== micSocketUrl) {
+                    closeMicSocket();
+                    micSocketUrl = url;
+                    micSocketRetryAt = 0;
+                }
+                if (!url) return null;
+                if (!micSocket && performance.now() >= micSocketRetryAt) {
+                    micSocketRetryAt = performance.now() + 1000;
+                    try {
+                        const socket = new WebSocket(url);
+                        socket.binaryType = "arraybuffer";
+                        socket.onclose = () => {
+                            if (micSocket === socket) micSocket = null;
+                        };
+                        micSocket = socket;
+                    } catch (error) {
+                        console.warn("[MicLoader] WebSocket connection failed:", error);
+                        micSocket = null;
+                    }
+                }
+                return micSocket && micSocket.readyState === WebSocket.OPEN ? micSocket : null;
+            };
+            
             // Function to start the visualization loop
             const startVisualization = () => {
                 if (!analyser) return;
@@ -326,6 +392,8 @@ app.registerExtension({
                 const frameSize = parseInt(frameSizeWidget.value, 10);
                 const timeData = new Uint8Array(analyser.fftSize);
                 const frequencyData = new Uint8Array(analyser.frequencyBinCount);
+                const waveBytes = new Uint8Array(128);
+                const specBytes = new Uint8Array(128);
                 
                 const updateVisualization = () => {
                     if (!analyser || !isCapturing) return;
@@ -377,6 +445,7 @@ app.registerExtension({
                     const waveStep = Math.max(1, Math.floor(timeData.length / 128));
                     for (let i = 0; i < 128; i++) {
                         const dataIdx = Math.min(i * waveStep, timeData.length - 1);
+                        waveBytes[i] = timeData[dataIdx];
                         waveformArray[i] = (timeData[dataIdx] - 128) / 128.0; // -1.0 to 1.0
                     }
                     
@@ -384,6 +453,7 @@ app.registerExtension({
                     const specStep = Math.max(1, Math.floor(frequencyData.length / 128));
                     for (let i = 0; i < 128; i++) {
                         const dataIdx = Math.min(i * specStep, frequencyData.length - 1);
+                        specBytes[i] = frequencyData[dataIdx];
                         spectrumArray[i] = frequencyData[dataIdx] / 255.0; // 0.0 to 1.0
                     }
                     
@@ -406,7 +476,16 @@ app.registerExtension({
                     }
                     
                     // Prepare and send data to Python backend
-                    if (rawDataWidget) {
+                    const socket = getMicSocket();
+                    if (socket) {
+                        // Skip frames while the previous ones are still queued
+                        if (socket.bufferedAmount === 0) {
+                            socket.send(encodeMicFrame(
+                                waveBytes, specBytes, parseInt(sampleRateWidget.value, 10),
+                                adjustedRms, isActive, rms, zcr, peak
+                            ));
+                        }
+                    } else if (rawDataWidget && !(sourceWidget && sourceWidget.value === "websocket")) {
                         const micData = {
                             device_id: deviceIdWidget.value,
                             name: nameWidget.value,
@@ -579,6 +658,7 @@ app.registerExtension({
             const onRemoved = node.onRemoved;
             node.onRemoved = function() {
                 stopCapturing();
+                closeMicSocket();
                 if (onRemoved) {
                     onRemoved.apply(this, arguments);
                 }